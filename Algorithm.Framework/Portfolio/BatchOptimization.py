@@ -0,0 +1,98 @@
+﻿# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean Algorithmic Trading Engine v2.0. Copyright 2014 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+
+def get_windows(historicalReturns):
+    '''Gets the windows of historical returns as a single array
+    Args:
+        historicalReturns: Windows of historical returns, either an array (size: W x T x N) or a sequence of
+                           W matrices of the same securities where each column represents a security (size: T x N)
+    Returns:
+        Array of double with the windows (size: W x T x N) and the columns of the securities'''
+    columns = None
+    if len(historicalReturns) > 0 and isinstance(historicalReturns[0], pd.DataFrame):
+        columns = historicalReturns[0].columns
+        historicalReturns = [x.reindex(columns = columns).values for x in historicalReturns]
+    windows = np.asarray(historicalReturns, dtype = float)
+    if windows.ndim != 3:
+        raise ValueError(f'get_windows: historicalReturns must have a window, period and security axis, not the shape {windows.shape}')
+    return windows, pd.RangeIndex(windows.shape[2]) if columns is None else columns
+
+def get_blocks(windows):
+    '''Gets the slices of consecutive windows whose covariances take about 32 MB together'''
+    size = max(1, 2 ** 22 // max(1, windows.shape[2] ** 2))
+    return [slice(start, start + size) for start in range(0, len(windows), size)]
+
+def get_batch_mean(windows):
+    '''Computes the mean of each window of returns over its periods with a return, like pandas.DataFrame.mean
+    Returns:
+        Array of double with the means (size: W x N)'''
+    defined = ~np.isnan(windows)
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
+        return np.where(defined, windows, 0).sum(axis = 1) / defined.sum(axis = 1)
+
+def get_batch_covariance(windows):
+    '''Computes the sample covariance of each window of returns with a single product of the stacked windows,
+    like pandas.DataFrame.cov. The covariance of a window with missing returns is that of pandas, over the periods
+    where both securities of a pair have a return
+    Args:
+        windows: Array of double with the windows of returns (size: W x T x N)
+    Returns:
+        Array of double with the covariances (size: W x N x N)'''
+    centered = windows - windows.mean(axis = 1, keepdims = True)
+    covariances = np.matmul(np.swapaxes(centered, 1, 2), centered) / (windows.shape[1] - 1)
+    for i in np.flatnonzero(np.isnan(windows).any(axis = (1, 2))):
+        covariances[i] = pd.DataFrame(windows[i]).cov().values
+    return covariances
+
+def optimize_windows(optimizer, windows, columns):
+    '''Optimizes the windows in order with the same optimizer, so that an optimizer with warm starts starts
+    from the weights of the previous window. Module level so worker processes can run it
+    Returns:
+        Array of double with the weights of each window (size: W x N)'''
+    weights = np.empty((len(windows), windows.shape[2]))
+    # An optimizer with a covariance estimator estimates the covariance of each window itself
+    estimator = getattr(optimizer, 'covariance_estimator', None)
+    for block in get_blocks(windows):
+        means = get_batch_mean(windows[block])
+        covariances = None if estimator is not None else get_batch_covariance(windows[block])
+        for i, window in enumerate(windows[block]):
+            covariance = None if covariances is None else covariances[i]
+            weights[block.start + i] = optimizer.Optimize(pd.DataFrame(window, columns = columns), means[i], covariance)
+    return weights
+
+def optimize_batch(optimizer, historicalReturns, processes = 0):
+    '''Optimizes each window of historical returns, like walk-forward rebalances
+    Args:
+        optimizer: The portfolio optimizer of each window
+        historicalReturns: Windows of historical returns (size: W x T x N)
+        processes(int): Number of worker processes, each of which optimizes consecutive windows. None for the number of
+                        processors, 0 to optimize in this process, e.g. when Python is embedded and cannot start worker processes
+    Returns:
+        Array of double with the weights of each window (size: W x N)'''
+    windows, columns = get_windows(historicalReturns)
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = min(processes, len(windows))
+    if processes <= 1:
+        return optimize_windows(optimizer, windows, columns)
+
+    # A copy of the optimizer optimizes each chunk, so the warm starts are chained within the chunks
+    chunks = np.array_split(np.arange(len(windows)), processes)
+    with ProcessPoolExecutor(processes) as pool:
+        results = pool.map(optimize_windows, [optimizer] * processes, [windows[x] for x in chunks], [columns] * processes)
+        return np.vstack(list(results))
@@ -28,11 +28,11 @@ from QuantConnect.Algorithm.Framework.Alphas import InsightCollection, InsightDi
 from QuantConnect.Algorithm.Framework.Portfolio import PortfolioConstructionModel, PortfolioTarget, PortfolioBias
 from Portfolio.MaximumSharpeRatioPortfolioOptimizer import MaximumSharpeRatioPortfolioOptimizer
 from datetime import datetime, timedelta
-from itertools import groupby
+from itertools import count, groupby
+from scipy.linalg import cho_factor, cho_solve
 import pandas as pd
 import numpy as np
 from numpy import dot, transpose
-from numpy.linalg import inv
 
 ### <summary>
 ### Provides an implementation of Black-Litterman portfolio optimization. The model adjusts equilibrium market
@@ -82,6 +82,8 @@ class BlackLittermanOptimizationPortfolioConstructionModel(PortfolioConstruction
 
         self.sign = lambda x: -1 if x < 0 else (1 if x > 0 else 0)
         self.symbolDataBySymbol = {}
+        # Returns, equilibrium return and covariance of the last rebalance, keyed by the version of the returns of each symbol
+        self.prior = None
 
         # If the argument is an instance of Resolution or Timedelta
         # Redefine rebalancingFunc
@@ -102,22 +104,26 @@ class BlackLittermanOptimizationPortfolioConstructionModel(PortfolioConstruction
         # Get view vectors
         P, Q = self.get_views(lastActiveInsights)
         if P is not None:
-            returns = dict()
+            symbolDataBySymbol = dict()
             # Updates the BlackLittermanSymbolData with insights
-            # Create a dictionary keyed by the symbols in the insights with an pandas.Series as value to create a data frame
             for insight in lastActiveInsights:
                 symbol = insight.Symbol
-                symbolData = self.symbolDataBySymbol.get(symbol, self.BlackLittermanSymbolData(symbol, self.lookback, self.period))
+                symbolData = symbolDataBySymbol.get(symbol) or self.symbolDataBySymbol.get(symbol)
+                if symbolData is None:
+                    symbolData = self.BlackLittermanSymbolData(symbol, self.lookback, self.period)
                 if insight.Magnitude is None:
                     self.Algorithm.SetRunTimeError(ArgumentNullException('BlackLittermanOptimizationPortfolioConstructionModel does not accept \'None\' as Insight.Magnitude. Please make sure your Alpha Model is generating Insights with the Magnitude property set.'))
                     return targets
                 symbolData.Add(insight.GeneratedTimeUtc, insight.Magnitude)
-                returns[symbol] = symbolData.Return
+                symbolDataBySymbol[symbol] = symbolData
 
-            returns = pd.DataFrame(returns)
-
-            # Calculate prior estimate of the mean and covariance
-            Pi, Sigma = self.get_equilibrium_return(returns)
+            # Calculate prior estimate of the mean and covariance, unless the returns are those of the last rebalance
+            key = tuple((symbol, symbolData.version) for symbol, symbolData in symbolDataBySymbol.items())
+            if self.prior is None or self.prior[0] != key:
+                # Create a dictionary keyed by the symbols in the insights with an pandas.Series as value to create a data frame
+                returns = pd.DataFrame({ symbol: symbolData.Return for symbol, symbolData in symbolDataBySymbol.items() })
+                self.prior = (key, returns) + tuple(self.get_equilibrium_return(returns))
+            _, returns, Pi, Sigma = self.prior
 
             # Calculate posterior estimate of the mean and covariance
             Pi, Sigma = self.apply_blacklitterman_master_formula(Pi, Sigma, P, Q)
@@ -126,14 +132,18 @@ class BlackLittermanOptimizationPortfolioConstructionModel(PortfolioConstruction
             weights = self.optimizer.Optimize(returns, Pi, Sigma)
             weights = pd.Series(weights, index = Sigma.columns)
 
+            # The target of a symbol is set on its first insight
+            insightBySymbol = dict()
+            for insight in lastActiveInsights:
+                insightBySymbol.setdefault(str(insight.Symbol), insight)
+
             for symbol, weight in weights.items():
-                for insight in lastActiveInsights:
-                    if str(insight.Symbol) == str(symbol):
-                        # don't trust the optimizer
-                        if self.portfolioBias != PortfolioBias.LongShort and self.sign(weight) != self.portfolioBias:
-                            weight = 0
-                        targets[insight] = weight
-                        break;
+                insight = insightBySymbol.get(str(symbol))
+                if insight is not None:
+                    # don't trust the optimizer
+                    if self.portfolioBias != PortfolioBias.LongShort and self.sign(weight) != self.portfolioBias:
+                        weight = 0
+                    targets[insight] = weight
 
         return targets
 
@@ -192,21 +202,26 @@ class BlackLittermanOptimizationPortfolioConstructionModel(PortfolioConstruction
             Sigma: Prior/Posterior covariance matrix
             P: A matrix that identifies the assets involved in the views (size: K x N)
             Q: A view vector (size: K x 1)'''
-        ts = self.tau * Sigma
+        ts = self.tau * np.asarray(Sigma, dtype = float)
+        Pts = np.dot(P, ts)
+        PtsP = np.dot(Pts, P.T)
 
         # Create the diagonal Sigma matrix of error terms from the expressed views
-        omega = np.dot(np.dot(P, ts), P.T) * np.eye(Q.shape[0])
-        if np.linalg.det(omega) == 0:
+        omega = np.diag(PtsP)
+        if np.any(omega == 0):
             return Pi, Sigma
 
-        A = np.dot(np.dot(ts, P.T), inv(np.dot(np.dot(P, ts), P.T) + omega))
+        # The gain A = τΣ·Pᵀ·(P·τΣ·Pᵀ + Ω)⁻¹ is the transpose of the solution of the symmetric positive definite
+        # equations (P·τΣ·Pᵀ + Ω)·X = P·τΣ, which are solved with the Cholesky decomposition of their matrix
+        try:
+            At = cho_solve(cho_factor(PtsP + np.diag(omega)), Pts)
+        except np.linalg.LinAlgError:
+            return Pi, Sigma
 
-        Pi = np.squeeze(np.asarray((
-            np.expand_dims(Pi, axis=0).T +
-            np.dot(A, (Q - np.expand_dims(np.dot(P, Pi.T), axis=1))))
-            ))
+        Pi = np.asarray(Pi, dtype = float).ravel()
+        Pi = Pi + np.dot(At.T, np.asarray(Q, dtype = float).ravel() - np.dot(P, Pi))
 
-        M = ts - np.dot(np.dot(A, P), ts)
+        M = ts - np.dot(At.T, Pts)
         Sigma = (Sigma + M) * self.delta
 
         return Pi, Sigma
@@ -242,58 +257,51 @@ class BlackLittermanOptimizationPortfolioConstructionModel(PortfolioConstruction
         Returns
             P: A matrix that identifies the assets involved in the views (size: K x N)
             Q: A view vector (size: K x 1)'''
-        try:
-            P = {}
-            Q = {}
-            for model, group in groupby(insights, lambda x: x.SourceModel):
-                group = list(group)
-
-                up_insights_sum = 0.0
-                dn_insights_sum = 0.0
-                for insight in group:
-                    if insight.Direction == InsightDirection.Up:
-                        up_insights_sum = up_insights_sum + np.abs(insight.Magnitude)
-                    if insight.Direction == InsightDirection.Down:
-                        dn_insights_sum = dn_insights_sum + np.abs(insight.Magnitude)
-
-                q = up_insights_sum if up_insights_sum > dn_insights_sum else dn_insights_sum
-                if q == 0:
-                    continue
-
-                Q[model] = q
-
-                # generate the link matrix of views: P
-                P[model] = dict()
-                for insight in group:
-                    value = insight.Direction * np.abs(insight.Magnitude)
-                    P[model][insight.Symbol] = value / q
-                # Add zero for other symbols that are listed but active insight
-                for symbol in self.symbolDataBySymbol.keys():
-                    if symbol not in P[model]:
-                        P[model][symbol] = 0
-
-            Q = np.array([[x] for x in Q.values()])
-            if len(Q) > 0:
-                P = np.array([list(x.values()) for x in P.values()])
-                return P, Q
-        except:
-            pass
-
-        return None, None
+        magnitudes = [insight.Magnitude for insight in insights]
+        if len(insights) == 0 or any(magnitude is None for magnitude in magnitudes):
+            return None, None
+
+        # A view of each alpha model and a column for each symbol, in the order of their first insight
+        models = { model: i for i, model in enumerate(dict.fromkeys(insight.SourceModel for insight in insights)) }
+        symbols = { symbol: i for i, symbol in enumerate(dict.fromkeys(insight.Symbol for insight in insights)) }
+        rows = np.array([models[insight.SourceModel] for insight in insights])
+        columns = np.array([symbols[insight.Symbol] for insight in insights])
+        directions = np.array([insight.Direction for insight in insights], dtype = float)
+        magnitudes = np.abs(np.array(magnitudes, dtype = float))
+
+        # The view of a model is the larger sum of the magnitudes of its up or of its down insights
+        up_insights_sum = np.bincount(rows, np.where(directions > 0, magnitudes, 0), len(models))
+        dn_insights_sum = np.bincount(rows, np.where(directions < 0, magnitudes, 0), len(models))
+        Q = np.where(up_insights_sum > dn_insights_sum, up_insights_sum, dn_insights_sum)
+        views = Q != 0
+        if not np.any(views):
+            return None, None
+
+        # generate the link matrix of views: P, with zero for the symbols without insight of a model
+        P = np.zeros((len(models), len(symbols)))
+        with np.errstate(divide = 'ignore', invalid = 'ignore'):
+            P[rows, columns] = directions * magnitudes / Q[rows]
+        return P[views], Q[views, np.newaxis]
 
 
     class BlackLittermanSymbolData:
         '''Contains data specific to a symbol required by this model'''
+        # Versions of the returns of all symbols, so that the returns of different symbols never have the same version
+        versions = count()
+
         def __init__(self, symbol, lookback, period):
             self.symbol = symbol
             self.roc = RateOfChange(f'{symbol}.ROC({lookback})', lookback)
             self.roc.Updated += self.OnRateOfChangeUpdated
             self.window = RollingWindow[IndicatorDataPoint](period)
+            self.version = next(self.versions)
+            self.returns = None
 
         def Reset(self):
             self.roc.Updated -= self.OnRateOfChangeUpdated
             self.roc.Reset()
             self.window.Reset()
+            self.version = next(self.versions)
 
         def Update(self, utcTime, close):
             self.roc.Update(utcTime, close)
@@ -301,6 +309,7 @@ class BlackLittermanOptimizationPortfolioConstructionModel(PortfolioConstruction
         def OnRateOfChangeUpdated(self, roc, value):
             if roc.IsReady:
                 self.window.Add(value)
+                self.version = next(self.versions)
 
         def Add(self, time, value):
             if self.window.Samples > 0 and self.window[0].EndTime == time:
@@ -308,12 +317,16 @@ class BlackLittermanOptimizationPortfolioConstructionModel(PortfolioConstruction
 
             item = IndicatorDataPoint(self.symbol, time, value)
             self.window.Add(item)
+            self.version = next(self.versions)
 
         @property
         def Return(self):
-            return pd.Series(
-                data = [x.Value for x in self.window],
-                index = [x.EndTime for x in self.window])
+            # The series is created again only when the window was updated
+            if self.returns is None or self.returns[0] != self.version:
+                self.returns = (self.version, pd.Series(
+                    data = [x.Value for x in self.window],
+                    index = [x.EndTime for x in self.window]))
+            return self.returns[1]
 
         @property
         def IsReady(self):
@@ -0,0 +1,179 @@
+﻿# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean Algorithmic Trading Engine v2.0. Copyright 2014 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pandas as pd
+
+def get_centered_returns(historicalReturns, weights = None):
+    '''Gets the returns less their (weighted) mean, where a missing return is its mean
+    Args:
+        historicalReturns: Matrix of historical returns where each column represents a security (size: T x N)
+        weights: Weights of the periods that sum to unity, equal weights if None (size: T x 1)
+    Returns:
+        Array of double with the centered returns (size: T x N)'''
+    returns = np.asarray(historicalReturns, dtype = float)
+    defined = np.isfinite(returns)
+    if weights is None:
+        weights = np.full(len(returns), 1. / len(returns))
+    weights = weights[:, None] * defined
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
+        mean = np.sum(np.where(defined, returns, 0) * weights, axis = 0) / weights.sum(axis = 0)
+    return np.where(defined, returns - mean, 0)
+
+def to_frame(covariance, historicalReturns):
+    '''Labels a covariance matrix with the securities of the historical returns'''
+    columns = historicalReturns.columns if isinstance(historicalReturns, pd.DataFrame) else None
+    return pd.DataFrame(covariance, index = columns, columns = columns)
+
+### <summary>
+### Provides the Ledoit-Wolf estimator of the covariance, which shrinks the sample covariance towards a multiple
+### of the identity matrix with the intensity that minimizes the expected quadratic loss. Unlike the sample covariance
+### it is well-conditioned and invertible with fewer periods than securities.
+### </summary>
+class LedoitWolfCovarianceEstimator:
+    '''Provides the Ledoit-Wolf estimator of the covariance, which shrinks the sample covariance towards a multiple
+    of the identity matrix with the intensity that minimizes the expected quadratic loss. Unlike the sample covariance
+    it is well-conditioned and invertible with fewer periods than securities.'''
+    # Solve solves the linear equations of the estimated covariance
+    solves_without_covariance = False
+
+    def __init__(self, shrinkage = None):
+        '''Initialize the LedoitWolfCovarianceEstimator
+        Args:
+            shrinkage(float): The shrinkage intensity between 0 and 1, estimated from the returns if None'''
+        self.shrinkage = shrinkage
+
+    def Estimate(self, historicalReturns):
+        '''
+        Estimates the covariance of the historical returns
+        args:
+            historicalReturns: Matrix of historical returns where each column represents a security and each row returns for the given date/time (size: T x N).
+        Returns:
+            pandas.DataFrame of the covariance (size: N x N)
+        '''
+        returns = get_centered_returns(historicalReturns)
+        periods, size = returns.shape
+        sample = returns.T.dot(returns) / periods
+        target = np.trace(sample) / size
+
+        shrinkage = self.shrinkage
+        if shrinkage is None:
+            # Ledoit and Wolf (2004), A well-conditioned estimator for large-dimensional covariance matrices
+            distance = np.sum(sample ** 2) - 2 * target * np.trace(sample) + size * target ** 2
+            squares = returns ** 2
+            variance = (np.sum(squares.T.dot(squares)) / periods - np.sum(sample ** 2)) / periods
+            shrinkage = 0 if distance <= 0 else min(max(variance, 0), distance) / distance
+
+        covariance = (1 - shrinkage) * sample
+        covariance.flat[::size + 1] += shrinkage * target
+        return to_frame(covariance, historicalReturns)
+
+    def Solve(self, historicalReturns, values):
+        '''Solves the linear equations of the estimated covariance for the values (size: N or N x M)'''
+        return np.linalg.solve(self.Estimate(historicalReturns).values, values)
+
+### <summary>
+### Provides the exponentially weighted estimator of the covariance, which weights each period less than the following
+### period by a constant factor, so that the covariance adapts to changes of the volatility and correlations.
+### </summary>
+class ExponentiallyWeightedCovarianceEstimator:
+    '''Provides the exponentially weighted estimator of the covariance, which weights each period less than the following
+    period by a constant factor, so that the covariance adapts to changes of the volatility and correlations.'''
+    # Solve solves the linear equations of the estimated covariance
+    solves_without_covariance = False
+
+    def __init__(self, half_life = 21):
+        '''Initialize the ExponentiallyWeightedCovarianceEstimator
+        Args:
+            half_life(float): Number of periods after which the weight of a period halves'''
+        if half_life <= 0:
+            raise ValueError(f'ExponentiallyWeightedCovarianceEstimator: half_life must be positive, not {half_life}')
+        self.half_life = half_life
+
+    def Estimate(self, historicalReturns):
+        '''
+        Estimates the covariance of the historical returns
+        args:
+            historicalReturns: Matrix of historical returns where each column represents a security and each row returns for the given date/time (size: T x N).
+        Returns:
+            pandas.DataFrame of the covariance (size: N x N)
+        '''
+        periods = len(historicalReturns)
+        weights = 0.5 ** (np.arange(periods)[::-1] / self.half_life)
+        weights /= weights.sum()
+        returns = get_centered_returns(historicalReturns, weights)
+        # The covariance is unbiased for the weights like the sample covariance
+        covariance = (returns * weights[:, None]).T.dot(returns) / (1 - np.sum(weights ** 2))
+        return to_frame(covariance, historicalReturns)
+
+    def Solve(self, historicalReturns, values):
+        '''Solves the linear equations of the estimated covariance for the values (size: N or N x M)'''
+        return np.linalg.solve(self.Estimate(historicalReturns).values, values)
+
+### <summary>
+### Provides the estimator of the covariance of a statistical factor model, where the returns are explained by their
+### principal components and by the specific variance of each security. The covariance B·Bᵀ + D of the loadings B
+### of K factors and of the diagonal specific variances D is inverted with the Woodbury identity in O(N·K²).
+### </summary>
+class FactorCovarianceEstimator:
+    '''Provides the estimator of the covariance of a statistical factor model, where the returns are explained by their
+    principal components and by the specific variance of each security. The covariance B·Bᵀ + D of the loadings B
+    of K factors and of the diagonal specific variances D is inverted with the Woodbury identity in O(N·K²).'''
+    # Solve solves the linear equations of the covariance of the factor model without computing the covariance
+    solves_without_covariance = True
+
+    def __init__(self, factors = 3, minimum_specific_variance = 1e-3):
+        '''Initialize the FactorCovarianceEstimator
+        Args:
+            factors(int): Number of principal components used as factors
+            minimum_specific_variance(float): Minimum specific variance of a security, relative to the mean variance of the securities'''
+        self.factors = factors
+        self.minimum_specific_variance = minimum_specific_variance
+
+    def Estimate(self, historicalReturns):
+        '''
+        Estimates the covariance of the historical returns
+        args:
+            historicalReturns: Matrix of historical returns where each column represents a security and each row returns for the given date/time (size: T x N).
+        Returns:
+            pandas.DataFrame of the covariance (size: N x N)
+        '''
+        loadings, specific = self.get_factor_model(historicalReturns)
+        covariance = loadings.dot(loadings.T)
+        covariance.flat[::len(specific) + 1] += specific
+        return to_frame(covariance, historicalReturns)
+
+    def Solve(self, historicalReturns, values):
+        '''Solves the linear equations of the estimated covariance for the values (size: N or N x M)
+        with the Woodbury identity: (B·Bᵀ + D)⁻¹ = D⁻¹ - D⁻¹·B·(I + Bᵀ·D⁻¹·B)⁻¹·Bᵀ·D⁻¹'''
+        loadings, specific = self.get_factor_model(historicalReturns)
+        values = np.asarray(values, dtype = float)
+        scaled = values / specific if values.ndim == 1 else values / specific[:, None]
+        weighted = loadings / specific[:, None]
+        capacitance = np.eye(loadings.shape[1]) + loadings.T.dot(weighted)
+        return scaled - weighted.dot(np.linalg.solve(capacitance, loadings.T.dot(scaled)))
+
+    def get_factor_model(self, historicalReturns):
+        '''Gets the loadings of the factors (size: N x K) and the specific variances (size: N x 1) of the securities'''
+        returns = get_centered_returns(historicalReturns)
+        periods = len(returns)
+        variance = np.sum(returns ** 2, axis = 0) / (periods - 1)
+
+        # The principal components of the returns are the factors, with unit variance
+        _, singular_values, components = np.linalg.svd(returns, full_matrices = False)
+        factors = min(self.factors, len(singular_values))
+        loadings = components[:factors].T * singular_values[:factors] / np.sqrt(periods - 1)
+
+        minimum = self.minimum_specific_variance * max(variance.mean(), np.finfo(float).tiny)
+        specific = np.maximum(variance - np.sum(loadings ** 2, axis = 1), minimum)
+        return loadings, specific
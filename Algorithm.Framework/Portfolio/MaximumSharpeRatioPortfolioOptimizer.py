@@ -13,7 +13,9 @@
 
 import numpy as np
 import pandas as pd
+import warnings
 from scipy.optimize import minimize
+from BatchOptimization import optimize_batch
 
 ### <summary>
 ### Provides an implementation of a portfolio optimizer that maximizes the portfolio Sharpe Ratio.
@@ -27,16 +29,25 @@ class MaximumSharpeRatioPortfolioOptimizer:
     def __init__(self, 
                  minimum_weight = -1, 
                  maximum_weight = 1,
-                 risk_free_rate = 0):
+                 risk_free_rate = 0,
+                 covariance_estimator = None,
+                 warm_start = False):
         '''Initialize the MaximumSharpeRatioPortfolioOptimizer
         Args:
             minimum_weight(float): The lower bounds on portfolio weights
             maximum_weight(float): The upper bounds on portfolio weights
-            risk_free_rate(float): The risk free rate'''
+            risk_free_rate(float): The risk free rate
+            covariance_estimator: Estimator of the covariance of the historical returns, like LedoitWolfCovarianceEstimator,
+                                  used instead of the sample covariance when no covariance is given
+            warm_start(bool): Whether SLSQP starts from the weights of the previous optimization instead of equal weights,
+                              which makes the weights depend on the previous optimizations'''
         self.minimum_weight = minimum_weight
         self.maximum_weight = maximum_weight
         self.risk_free_rate = risk_free_rate
+        self.covariance_estimator = covariance_estimator
+        self.warm_start = warm_start
         self.expected_returns = []
+        self.previous_weights = None
 
     def Optimize(self, historicalReturns, expectedReturns = None, covariance = None):
         '''
@@ -49,12 +60,13 @@ class MaximumSharpeRatioPortfolioOptimizer:
             Array of double with the portfolio weights (size: K x 1)
         '''
         if covariance is None:
-            covariance = historicalReturns.cov()
+            covariance = historicalReturns.cov() if self.covariance_estimator is None else self.covariance_estimator.Estimate(historicalReturns)
         if expectedReturns is None:
             expectedReturns = historicalReturns.mean()
-        expectedReturns = expectedReturns - self.risk_free_rate
+        expectedReturns = np.asarray(expectedReturns, dtype = float).ravel() - self.risk_free_rate
+        covariance = np.asarray(covariance, dtype = float)
 
-        size = covariance.columns.size   # K x 1
+        size = len(covariance)   # K x 1
         x0 = np.array(size * [1. / size])
         k = expectedReturns.dot(x0)
 
@@ -69,13 +81,37 @@ class MaximumSharpeRatioPortfolioOptimizer:
             {'type': 'eq', 'fun': lambda weights: self.get_budget_constraint(weights)})
 
         opt = minimize(lambda weights: self.portfolio_variance(weights, covariance),   # Objective function
-                       x0,                                                        # Initial guess
+                       self.get_initial_weights(historicalReturns.columns, x0),   # Initial guess
                        bounds = self.get_boundary_conditions(size),               # Bounds for variables: lw ≤ w ≤ up
                        constraints = constraints,                                 # Constraints definition
                        method='SLSQP')        # Optimization method:  Sequential Least SQuares Programming
-        sharpe_ratio = expectedReturns.dot(opt['x']) / opt.fun
 
-        return opt['x'] if opt['success'] else x0
+        if not opt['success']:
+            warnings.warn(f'MaximumSharpeRatioPortfolioOptimizer.Optimize: {opt["message"]}. Using equal weights')
+            return x0
+
+        self.previous_weights = pd.Series(opt['x'], index = historicalReturns.columns)
+        return opt['x']
+
+    def OptimizeBatch(self, historicalReturns, processes = 0):
+        '''
+        Perform portfolio optimization for each window of a stack of windows of historical returns, like the rebalances of a walk-forward analysis.
+        The covariances of the windows are computed together and, with warm starts, each optimization starts from the weights of the previous window
+        args:
+            historicalReturns: Windows of annualized historical returns (size: W x T x N), an array or a sequence of matrices of the same securities.
+            processes(int): Number of worker processes optimizing consecutive windows, None for the number of processors, 0 to optimize in this process.
+        Returns:
+            Array of double with the portfolio weights of each window (size: W x N)
+        '''
+        return optimize_batch(self, historicalReturns, processes)
+
+    def get_initial_weights(self, columns, x0):
+        '''Gets the weights of the previous optimization for the columns, with no weight for new columns, within bounds'''
+        if not self.warm_start or self.previous_weights is None:
+            return x0
+        weights = self.previous_weights.reindex(columns).fillna(0).values
+        weights = np.clip(weights, self.minimum_weight, self.maximum_weight)
+        return weights if np.any(weights) else x0
 
     def portfolio_variance(self, weights, covariance):
         '''Computes the portfolio variance
@@ -25,7 +25,9 @@ from QuantConnect.Algorithm import *
 from QuantConnect.Algorithm.Framework import *
 from QuantConnect.Algorithm.Framework.Portfolio import *
 from Portfolio.MinimumVariancePortfolioOptimizer import MinimumVariancePortfolioOptimizer
+from Portfolio.ReturnsMatrix import ReturnsMatrix
 from datetime import timedelta
+from inspect import Parameter, signature
 import numpy as np
 import pandas as pd
 
@@ -53,7 +55,9 @@ class MeanVarianceOptimizationPortfolioConstructionModel(PortfolioConstructionMo
             lookback(int): Historical return lookback period
             period(int): The time interval of history price to calculate the weight
             resolution: The resolution of the history price
-            optimizer(class): Method used to compute the portfolio weights"""
+            optimizer(class): Method used to compute the portfolio weights. Its Optimize method is given the covariance of the
+                              returns as the covariance keyword argument if it declares it, e.g. Optimize(self, historicalReturns,
+                              expectedReturns = None, covariance = None), or accepts any keyword argument"""
         self.lookback = lookback
         self.period = period
         self.resolution = resolution
@@ -63,8 +67,11 @@ class MeanVarianceOptimizationPortfolioConstructionModel(PortfolioConstructionMo
         lower = 0 if portfolioBias == PortfolioBias.Long else -1
         upper = 0 if portfolioBias == PortfolioBias.Short else 1
         self.optimizer = MinimumVariancePortfolioOptimizer(lower, upper, targetReturn) if optimizer is None else optimizer
+        self.optimizerAcceptsCovariance = self.AcceptsCovariance(self.optimizer)
 
         self.symbolDataBySymbol = {}
+        # Annualized returns of every symbol, updated as their rate of change is computed
+        self.returnsMatrix = ReturnsMatrix(period)
 
         # If the argument is an instance of Resolution or Timedelta
         # Redefine rebalancingFunc
@@ -97,12 +104,16 @@ class MeanVarianceOptimizationPortfolioConstructionModel(PortfolioConstructionMo
         targets = {}
         symbols = [insight.Symbol for insight in activeInsights]
 
-        # Create a dictionary keyed by the symbols in the insights with an pandas.Series as value to create a data frame
-        returns = { str(symbol) : data.Return for symbol, data in self.symbolDataBySymbol.items() if symbol in symbols }
-        returns = pd.DataFrame(returns)
-
+        # The returns and their covariance are read from the shared returns matrix, whose running sums
+        # give the covariance without computing it again from every return. An optimizer with a covariance
+        # estimator estimates the covariance from the returns instead
+        symbols = [symbol for symbol in self.symbolDataBySymbol if symbol in symbols]
+        returns = self.returnsMatrix.Returns(symbols)
         # The portfolio optimizer finds the optional weights for the given data
-        weights = self.optimizer.Optimize(returns)
+        if self.optimizerAcceptsCovariance and getattr(self.optimizer, 'covariance_estimator', None) is None:
+            weights = self.optimizer.Optimize(returns, covariance = self.returnsMatrix.Covariance(symbols))
+        else:
+            weights = self.optimizer.Optimize(returns)
         weights = pd.Series(weights, index = returns.columns)
 
         # Create portfolio targets from the specified insights
@@ -116,6 +127,19 @@ class MeanVarianceOptimizationPortfolioConstructionModel(PortfolioConstructionMo
 
         return targets
 
+    @staticmethod
+    def AcceptsCovariance(optimizer):
+        '''True if the Optimize method of the optimizer takes the covariance keyword argument
+        Args:
+            optimizer: The portfolio optimizer
+        Returns:
+            False for optimizers declared as Optimize(self, historicalReturns), or whose signature is unknown'''
+        try:
+            parameters = signature(optimizer.Optimize).parameters.values()
+        except (TypeError, ValueError):
+            return False
+        return any(x.name == 'covariance' or x.kind == Parameter.VAR_KEYWORD for x in parameters)
+
     def OnSecuritiesChanged(self, algorithm, changes):
         '''Event fired each time the we add/remove securities from the data feed
         Args:
@@ -126,7 +150,8 @@ class MeanVarianceOptimizationPortfolioConstructionModel(PortfolioConstructionMo
         super().OnSecuritiesChanged(algorithm, changes)
         for removed in changes.RemovedSecurities:
             symbolData = self.symbolDataBySymbol.pop(removed.Symbol, None)
-            symbolData.Reset()
+            if symbolData is not None:
+                symbolData.Reset()
 
         # initialize data for added securities
         symbols = [ x.Symbol for x in changes.AddedSecurities ]
@@ -138,22 +163,24 @@ class MeanVarianceOptimizationPortfolioConstructionModel(PortfolioConstructionMo
             symbol = SymbolCache.GetSymbol(ticker)
 
             if symbol not in self.symbolDataBySymbol:
-                symbolData = self.MeanVarianceSymbolData(symbol, self.lookback, self.period)
+                symbolData = self.MeanVarianceSymbolData(symbol, self.lookback, self.period, self.returnsMatrix)
                 symbolData.WarmUpIndicators(history.loc[ticker])
                 self.symbolDataBySymbol[symbol] = symbolData
 
     class MeanVarianceSymbolData:
         '''Contains data specific to a symbol required by this model'''
-        def __init__(self, symbol, lookback, period):
+        def __init__(self, symbol, lookback, period, returnsMatrix = None):
             self.symbol = symbol
+            self.period = period
             self.roc = RateOfChange(f'{symbol}.ROC({lookback})', lookback)
             self.roc.Updated += self.OnRateOfChangeUpdated
-            self.window = RollingWindow[IndicatorDataPoint](period)
+            self.returnsMatrix = ReturnsMatrix(period) if returnsMatrix is None else returnsMatrix
+            self.returnsMatrix.AddSymbol(symbol)
 
         def Reset(self):
             self.roc.Updated -= self.OnRateOfChangeUpdated
             self.roc.Reset()
-            self.window.Reset()
+            self.returnsMatrix.RemoveSymbol(self.symbol)
 
         def WarmUpIndicators(self, history):
             for tuple in history.itertuples():
@@ -161,21 +188,18 @@ class MeanVarianceOptimizationPortfolioConstructionModel(PortfolioConstructionMo
 
         def OnRateOfChangeUpdated(self, roc, value):
             if roc.IsReady:
-                self.window.Add(value)
+                self.returnsMatrix.Add(self.symbol, value.EndTime, value.Value)
 
         def Add(self, time, value):
-            item = IndicatorDataPoint(self.symbol, time, value)
-            self.window.Add(item)
+            self.returnsMatrix.Add(self.symbol, time, value)
 
         @property
         def Return(self):
-            return pd.Series(
-                data = [(1 + float(x.Value))**252 - 1 for x in self.window],
-                index = [x.EndTime for x in self.window])
+            return self.returnsMatrix.Returns([self.symbol]).iloc[:, 0]
 
         @property
         def IsReady(self):
-            return self.window.IsReady
+            return self.returnsMatrix.Count(self.symbol) >= self.period
 
         def __str__(self, **kwargs):
-            return '{}: {:.2%}'.format(self.roc.Name, (1 + self.window[0])**252 - 1)
\ No newline at end of file
+            return '{}: {:.2%}'.format(self.roc.Name, self.returnsMatrix.Latest(self.symbol))
@@ -13,7 +13,9 @@
 
 import numpy as np
 import pandas as pd
+import warnings
 from scipy.optimize import minimize
+from BatchOptimization import optimize_batch
 
 ### <summary>
 ### Provides an implementation of a portfolio optimizer that calculate the optimal weights 
@@ -25,15 +27,36 @@ class MinimumVariancePortfolioOptimizer:
     def __init__(self, 
                  minimum_weight = -1, 
                  maximum_weight = 1,
-                 target_return = 0.02):
+                 target_return = 0.02,
+                 solver = 'SLSQP',
+                 warm_start = False,
+                 covariance_estimator = None,
+                 precise = False):
         '''Initialize the MinimumVariancePortfolioOptimizer
         Args:
             minimum_weight(float): The lower bounds on portfolio weights
             maximum_weight(float): The upper bounds on portfolio weights
-            target_return(float): The target portfolio return'''
+            target_return(float): The target portfolio return
+            solver(str): The solver used when the weights of the closed form solution are out of bounds, or without the closed form solution:
+                         'SLSQP' for SciPy Sequential Least SQuares Programming, or 'cvxopt' for the quadratic programming solver of cvxopt
+            warm_start(bool): Whether SLSQP starts from the weights of the previous optimization instead of equal weights,
+                              which makes the weights depend on the previous optimizations.
+                              The interior point method of cvxopt does not start from given weights
+            covariance_estimator: Estimator of the covariance of the historical returns, like LedoitWolfCovarianceEstimator,
+                                  used instead of the sample covariance when no covariance is given
+            precise(bool): Whether the weights are the closed form solution when it is within bounds, and otherwise solved by SLSQP
+                           with analytic gradients and a precision goal relative to the variance. By default SLSQP estimates the gradients
+                           and stops within an absolute precision goal of the variance, which can leave it at equal weights for returns of small magnitude'''
+        if solver not in ('SLSQP', 'cvxopt'):
+            raise ValueError(f'MinimumVariancePortfolioOptimizer: solver must be \'SLSQP\' or \'cvxopt\', not \'{solver}\'')
         self.minimum_weight = minimum_weight
         self.maximum_weight = maximum_weight
         self.target_return = target_return
+        self.solver = solver
+        self.warm_start = warm_start
+        self.covariance_estimator = covariance_estimator
+        self.precise = precise
+        self.previous_weights = None
 
     def Optimize(self, historicalReturns, expectedReturns = None, covariance = None):
         '''
@@ -45,26 +68,149 @@ class MinimumVariancePortfolioOptimizer:
         Returns:
             Array of double with the portfolio weights (size: K x 1)
         '''
-        if covariance is None:
+        estimator = self.covariance_estimator
+        if covariance is None and estimator is None:
             covariance = historicalReturns.cov()
+        elif covariance is None and not (self.precise and getattr(estimator, 'solves_without_covariance', False)):
+            # The covariance is estimated once, for the closed form solution and for the solver
+            covariance = estimator.Estimate(historicalReturns)
         if expectedReturns is None:
             expectedReturns = historicalReturns.mean()
 
         size = historicalReturns.columns.size   # K x 1
         x0 = np.array(size * [1. / size])
+        expectedReturns = np.asarray(expectedReturns, dtype = float).ravel()
+        if covariance is None:
+            # An estimator like the factor model solves the linear equations of its covariance without computing the covariance,
+            # which is estimated only when a solver handles the bounds
+            solve = lambda values: estimator.Solve(historicalReturns, values)
+        else:
+            covariance = np.asarray(covariance, dtype = float)
+            solve = lambda values: np.linalg.solve(covariance, values)
+
+        # The weights that minimize the variance under the budget and target constraints solve linear equations,
+        # they are the solution when they are within bounds. Otherwise a solver finds the solution with the bounds
+        weights = self.get_closed_form_weights(solve, expectedReturns) if self.precise else None
+        if weights is None:
+            if covariance is None:
+                covariance = np.asarray(estimator.Estimate(historicalReturns), dtype = float)
+            initial_weights = self.get_initial_weights(historicalReturns.columns, x0)
+            if self.solver == 'cvxopt':
+                weights = self.solve_quadratic_program(covariance, expectedReturns, initial_weights)
+            else:
+                weights = self.solve_least_squares(covariance, expectedReturns, initial_weights)
 
+        if weights is None:
+            return x0
+
+        self.previous_weights = pd.Series(weights, index = historicalReturns.columns)
+        return weights
+
+    def OptimizeBatch(self, historicalReturns, processes = 0):
+        '''
+        Perform portfolio optimization for each window of a stack of windows of historical returns, like the rebalances of a walk-forward analysis.
+        The covariances of the windows are computed together and, with warm starts, each optimization starts from the weights of the previous window
+        args:
+            historicalReturns: Windows of annualized historical returns (size: W x T x N), an array or a sequence of matrices of the same securities.
+            processes(int): Number of worker processes optimizing consecutive windows, None for the number of processors, 0 to optimize in this process.
+        Returns:
+            Array of double with the portfolio weights of each window (size: W x N)
+        '''
+        return optimize_batch(self, historicalReturns, processes)
+
+    def get_closed_form_weights(self, solve, expectedReturns):
+        '''Solves the Karush-Kuhn-Tucker conditions of the minimum variance under the budget and target constraints A·w = b:
+        w = Σ⁻¹·Aᵀ·(A·Σ⁻¹·Aᵀ)⁻¹·b
+        Args:
+            solve: Function solving the linear equations of the covariance Σ for the given values
+            expectedReturns: Array of double with the portfolio expected returns
+        Returns:
+            The weights, or None if they are out of bounds or the covariance is singular'''
+        size = len(expectedReturns)
+        constraints = np.vstack([np.ones(size), expectedReturns])
+        values = np.array([1, self.target_return])
+        try:
+            solutions = solve(constraints.T)
+            weights = solutions.dot(np.linalg.solve(constraints.dot(solutions), values))
+        except np.linalg.LinAlgError:
+            return None
+
+        tolerance = 1e-9
+        if not np.all(np.isfinite(weights)) or np.any(weights < self.minimum_weight - tolerance) or \
+           np.any(weights > self.maximum_weight + tolerance) or \
+           np.abs(constraints.dot(weights) - values).max() > 1e-6:
+            return None
+        return np.clip(weights, self.minimum_weight, self.maximum_weight)
+
+    def get_initial_weights(self, columns, x0):
+        '''Gets the weights of the previous optimization for the columns, with no weight for new columns, within bounds'''
+        if not self.warm_start or self.previous_weights is None:
+            return x0
+        weights = self.previous_weights.reindex(columns).fillna(0).values
+        weights = np.clip(weights, self.minimum_weight, self.maximum_weight)
+        return weights if np.any(weights) else x0
+
+    def solve_least_squares(self, covariance, expectedReturns, x0):
+        '''Minimizes the portfolio variance with SLSQP, with the analytic gradients of the objective and constraints if precise
+        Returns:
+            The weights, or None with a warning if the optimization failed, like for a target return out of reach within the bounds'''
+        size = len(expectedReturns)
         constraints = [
             {'type': 'eq', 'fun': lambda weights: self.get_budget_constraint(weights)},
             {'type': 'eq', 'fun': lambda weights: self.get_target_constraint(weights, expectedReturns)}]
+        scale, jac, maxiter = 1, None, 100
 
-        opt = minimize(lambda weights: self.portfolio_variance(weights, covariance),     # Objective function
+        if self.precise:
+            ones = np.ones(size)
+            constraints[0]['jac'] = lambda weights: ones
+            constraints[1]['jac'] = lambda weights: expectedReturns
+            # The variance is relative to the variance of the initial weights, so that the precision goal is relative
+            # to the variance instead of being larger than the variance of returns of small magnitude
+            scale = x0.dot(covariance).dot(x0)
+            scale = scale if np.isfinite(scale) and scale > 0 else 1
+            jac = lambda weights: 2 * covariance.dot(weights) / scale
+            # The bounds that become active can take an iteration each
+            maxiter = max(100, 2 * size)
+
+        opt = minimize(lambda weights: self.portfolio_variance(weights, covariance) / scale,     # Objective function
                        x0,                                                        # Initial guess
+                       jac = jac,                                                 # Gradient of the objective function
                        bounds = self.get_boundary_conditions(size),               # Bounds for variables
                        constraints = constraints,                                 # Constraints definition
                        method='SLSQP',        # Optimization method:  Sequential Least SQuares Programming
-                       options={'ftol': 1e-04}) # Precision goal for the value of f in the stopping criterion.
+                       options={'ftol': 1e-04, 'maxiter': maxiter}) # Precision goal for the value of f in the stopping criterion.
+
+        if not opt['success']:
+            warnings.warn(f'MinimumVariancePortfolioOptimizer.solve_least_squares: {opt["message"]}. Using equal weights')
+            return None
+        return opt['x']
+
+    def solve_quadratic_program(self, covariance, expectedReturns, x0):
+        '''Minimizes the portfolio variance with the quadratic programming solver of cvxopt,
+        whose variance is scaled by the variance of the initial weights
+        Returns:
+            The weights, or None with a warning if the optimization failed'''
+        from cvxopt import matrix, solvers
+
+        size = len(expectedReturns)
+        identity = np.eye(size)
+        bounds = np.concatenate([np.full(size, float(self.maximum_weight)), np.full(size, -float(self.minimum_weight))])
+        # The tolerances of cvxopt are absolute, so the variance is relative to the variance of the initial weights like for SLSQP
+        scale = x0.dot(covariance).dot(x0)
+        scale = scale if np.isfinite(scale) and scale > 0 else 1
+        try:
+            solution = solvers.qp(matrix(2 * covariance / scale), matrix(np.zeros(size)),
+                                  matrix(np.vstack([identity, -identity])), matrix(bounds),
+                                  matrix(np.vstack([np.ones(size), expectedReturns])), matrix([1., float(self.target_return)]),
+                                  options = {'show_progress': False})
+        except (ArithmeticError, ValueError) as e:
+            warnings.warn(f'MinimumVariancePortfolioOptimizer.solve_quadratic_program: {e}. Using equal weights')
+            return None
 
-        return opt['x'] if opt['success'] else x0
+        if solution['status'] != 'optimal':
+            warnings.warn(f'MinimumVariancePortfolioOptimizer.solve_quadratic_program: {solution["status"]}. Using equal weights')
+            return None
+        return np.clip(np.array(solution['x']).ravel(), self.minimum_weight, self.maximum_weight)
 
     def portfolio_variance(self, weights, covariance):
         '''Computes the portfolio variance
@@ -87,4 +233,4 @@ class MinimumVariancePortfolioOptimizer:
 
     def get_target_constraint(self, weights, expectedReturns):
         '''Ensure that the portfolio return target a given return'''
-        return np.dot(np.matrix(expectedReturns), np.matrix(weights).T).item() - self.target_return
\ No newline at end of file
+        return np.dot(expectedReturns, weights) - self.target_return
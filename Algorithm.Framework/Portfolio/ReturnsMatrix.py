@@ -0,0 +1,251 @@
+﻿# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean Algorithmic Trading Engine v2.0. Copyright 2014 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pandas as pd
+
+### <summary>
+### Provides a matrix of the annualized returns of many symbols over their last periods, shared by their symbol data.
+### Each row is a time and each column a symbol, which keeps its last returns in a ring of rows like a rolling window.
+### A return is written in place when it is computed, and the running pairwise sums of the returns are updated with it,
+### so that the covariance is read in O(N²) instead of being computed again from every return.
+### </summary>
+class ReturnsMatrix:
+    '''Provides a matrix of the annualized returns of many symbols over their last periods, shared by their symbol data.
+    Each row is a time and each column a symbol, which keeps its last returns in a ring of rows like a rolling window.
+    A return is written in place when it is computed, and the running pairwise sums of the returns are updated with it,
+    so that the covariance is read in O(N²) instead of being computed again from every return.'''
+    def __init__(self, period, annualization = 252):
+        '''Initialize the ReturnsMatrix
+        Args:
+            period(int): Number of periods of returns kept for each symbol
+            annualization(int): Number of periods in a year, the returns are compounded over a year'''
+        self.period = period
+        self.annualization = annualization
+        self.columnBySymbol = {}
+        self.rowByTime = {}
+        self.freeColumns = []
+        self.freeRows = []
+        self.evictions = 0
+        self.__allocate(0)
+        self.__allocate_rows(0)
+
+    def AddSymbol(self, symbol):
+        '''Adds a column for the returns of a symbol
+        Args:
+            symbol: The symbol of the returns
+        Returns:
+            The column of the symbol'''
+        column = self.columnBySymbol.get(symbol)
+        if column is not None:
+            return column
+
+        if not self.freeColumns:
+            self.__allocate(self.returns.shape[1])
+        column = self.freeColumns.pop()
+        self.columnBySymbol[symbol] = column
+        return column
+
+    def RemoveSymbol(self, symbol):
+        '''Removes the column of a symbol and its returns from the running sums
+        Args:
+            symbol: The symbol of the returns'''
+        column = self.columnBySymbol.pop(symbol, None)
+        if column is None:
+            return
+
+        for row in np.flatnonzero(self.written[:, column]):
+            self.__release(row)
+        self.returns[:, column] = np.nan
+        self.written[:, column] = False
+        self.ring[:, column] = -1
+        self.ringIndex[column] = 0
+        self.ringCount[column] = 0
+        for sums in (self.counts, self.sums, self.products):
+            sums[column, :] = 0
+            sums[:, column] = 0
+        self.freeColumns.append(column)
+
+    def Add(self, symbol, time, value):
+        '''Writes the return of a symbol for a period, unless the symbol already has a return for the time,
+        like the fill forward bars of a history request. Once the symbol has the returns of all its periods,
+        the return it wrote first is removed, like the oldest item of a rolling window.
+        Args:
+            symbol: The symbol of the return
+            time: The end time of the period
+            value(float): The return of the period, which is annualized
+        Returns:
+            True if the return was written, False otherwise'''
+        column = self.columnBySymbol.get(symbol)
+        if column is None:
+            return False
+
+        row = self.rowByTime.get(time)
+        if row is not None and self.written[row, column]:
+            return False
+
+        index = self.ringIndex[column]
+        if self.ringCount[column] == self.period:
+            self.__evict(self.ring[index, column], column)
+        if row is None:
+            row = self.__add_row(time)
+
+        self.returns[row, column] = (1 + float(value)) ** self.annualization - 1
+        self.written[row, column] = True
+        self.uses[row] += 1
+        self.ring[index, column] = row
+        self.ringIndex[column] = (index + 1) % self.period
+        self.ringCount[column] = min(self.ringCount[column] + 1, self.period)
+        if np.isfinite(self.returns[row, column]):
+            self.__add(row, column)
+        return True
+
+    def Count(self, symbol):
+        '''Number of returns of a symbol in the matrix'''
+        column = self.columnBySymbol.get(symbol)
+        return 0 if column is None else int(self.ringCount[column])
+
+    def Latest(self, symbol):
+        '''Return a symbol wrote last, or NaN if there is none'''
+        column = self.columnBySymbol.get(symbol)
+        if column is None or self.ringCount[column] == 0:
+            return np.nan
+        return self.returns[self.ring[self.ringIndex[column] - 1, column], column]
+
+    def Returns(self, symbols):
+        '''Annualized returns of symbols in time order, without the periods where none of them has a return
+        Args:
+            symbols: The symbols of the returns
+        Returns:
+            pandas.DataFrame of the returns with a column for each symbol named after it'''
+        columns = [self.columnBySymbol[symbol] for symbol in symbols]
+        times = sorted(self.rowByTime)
+        rows = [self.rowByTime[time] for time in times]
+        returns = self.returns[np.ix_(rows, columns)]
+        defined = np.isfinite(returns).any(axis = 1)
+        return pd.DataFrame(returns[defined],
+                            index = [time for time, x in zip(times, defined) if x],
+                            columns = [str(symbol) for symbol in symbols])
+
+    def Covariance(self, symbols):
+        '''Sample covariance of the annualized returns of symbols, over the periods where both symbols of a pair
+        have a return like pandas.DataFrame.cov, computed from the running sums
+        Args:
+            symbols: The symbols of the returns
+        Returns:
+            pandas.DataFrame of the covariance with a row and a column for each symbol named after it'''
+        columns = np.array([self.columnBySymbol[symbol] for symbol in symbols], dtype = int)
+        pairs = np.ix_(columns, columns)
+        counts = self.counts[pairs]
+        sums = self.sums[pairs]
+        with np.errstate(divide = 'ignore', invalid = 'ignore'):
+            covariance = (self.products[pairs] - sums * sums.T / counts) / (counts - 1)
+        covariance[counts < 2] = np.nan
+        names = [str(symbol) for symbol in symbols]
+        return pd.DataFrame(covariance, index = names, columns = names)
+
+    def __add_row(self, time):
+        '''Gets a free row for a new time, growing the matrix when every row holds returns'''
+        if not self.freeRows:
+            self.__allocate_rows(self.returns.shape[0])
+        row = self.freeRows.pop()
+        self.rowByTime[time] = row
+        self.timeByRow[row] = time
+        return row
+
+    def __release(self, row):
+        '''Frees a row once none of the symbols has a return for its time'''
+        self.uses[row] -= 1
+        if self.uses[row] == 0:
+            del self.rowByTime[self.timeByRow[row]]
+            self.timeByRow[row] = None
+            self.freeRows.append(row)
+
+    def __evict(self, row, column):
+        '''Removes the return of a cell from the matrix and from the running sums'''
+        if np.isfinite(self.returns[row, column]):
+            self.__add(row, column, -1)
+        self.returns[row, column] = np.nan
+        self.written[row, column] = False
+        self.__release(row)
+        self.evictions += 1
+
+        # Removing the returns accumulates rounding errors in the sums, so they are computed again from the returns
+        # of the matrix once as many returns as the matrix holds were removed, which is O(N) per return on average
+        if self.evictions >= self.period * len(self.columnBySymbol):
+            self.evictions = 0
+            self.__resum()
+
+    def __resum(self):
+        '''Computes the running sums from the returns of the matrix'''
+        defined = np.isfinite(self.returns).astype(float)
+        values = np.where(defined > 0, self.returns, 0)
+        self.counts = defined.T.dot(defined)
+        self.sums = values.T.dot(defined)
+        self.products = values.T.dot(values)
+
+    def __add(self, row, column, sign = 1):
+        '''Adds the return of a cell to the running sums of its column and of the pairs it forms
+        with the other returns of its row, or removes it with a negative sign'''
+        values = self.returns[row].copy()
+        value = values[column]
+        defined = np.isfinite(values)
+        values[~defined] = 0
+        defined = sign * defined.astype(float)
+
+        # The row and the column of the pairs count the cell itself twice
+        self.counts[column] += defined
+        self.counts[:, column] += defined
+        self.counts[column, column] -= sign
+        self.sums[column] += value * defined
+        self.sums[:, column] += sign * values
+        self.sums[column, column] -= sign * value
+        self.products[column] += sign * value * values
+        self.products[:, column] += sign * value * values
+        self.products[column, column] -= sign * value * value
+
+    def __allocate(self, size):
+        '''Grows the matrix and its running sums to hold twice as many symbols, or at least 8'''
+        capacity = max(2 * size, 8)
+        rows = self.returns.shape[0] if size > 0 else self.period
+        returns = np.full((rows, capacity), np.nan)
+        written = np.zeros((rows, capacity), dtype = bool)
+        ring = np.full((self.period, capacity), -1, dtype = int)
+        ringIndex, ringCount = np.zeros(capacity, dtype = int), np.zeros(capacity, dtype = int)
+        counts, sums, products = (np.zeros((capacity, capacity)) for _ in range(3))
+        if size > 0:
+            returns[:, :size] = self.returns
+            written[:, :size] = self.written
+            ring[:, :size] = self.ring
+            ringIndex[:size] = self.ringIndex
+            ringCount[:size] = self.ringCount
+            counts[:size, :size] = self.counts
+            sums[:size, :size] = self.sums
+            products[:size, :size] = self.products
+        self.returns, self.written, self.counts, self.sums, self.products = returns, written, counts, sums, products
+        self.ring, self.ringIndex, self.ringCount = ring, ringIndex, ringCount
+        self.freeColumns.extend(reversed(range(size, capacity)))
+
+    def __allocate_rows(self, size):
+        '''Grows the matrix to hold twice as many times, or the number of periods'''
+        capacity = max(2 * size, self.period)
+        returns = np.full((capacity, self.returns.shape[1]), np.nan)
+        written = np.zeros((capacity, self.returns.shape[1]), dtype = bool)
+        uses = np.zeros(capacity, dtype = int)
+        returns[:size] = self.returns[:size]
+        written[:size] = self.written[:size]
+        if size > 0:
+            uses[:size] = self.uses
+        self.returns, self.written, self.uses = returns, written, uses
+        self.timeByRow = (self.timeByRow if size > 0 else []) + [None] * (capacity - size)
+        self.freeRows.extend(reversed(range(size, capacity)))
@@ -11,14 +11,21 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from numpy import dot
-from numpy.linalg import inv
+import numpy as np
+from BatchOptimization import get_batch_covariance, get_batch_mean, get_blocks, get_windows, optimize_batch
 
 ### <summary>
 ### Provides an implementation of a portfolio optimizer with unconstrained mean variance.'''
 ### </summary>
 class UnconstrainedMeanVariancePortfolioOptimizer:
     '''Provides an implementation of a portfolio optimizer with unconstrained mean variance.'''
+    def __init__(self, covariance_estimator = None):
+        '''Initialize the UnconstrainedMeanVariancePortfolioOptimizer
+        Args:
+            covariance_estimator: Estimator of the covariance of the historical returns, like FactorCovarianceEstimator,
+                                  used instead of the sample covariance when no covariance is given'''
+        self.covariance_estimator = covariance_estimator
+
     def Optimize(self, historicalReturns, expectedReturns = None, covariance = None):
         '''
         Perform portfolio optimization for a provided matrix of historical returns and an array of expected returns
@@ -31,7 +38,34 @@ class UnconstrainedMeanVariancePortfolioOptimizer:
         '''
         if expectedReturns is None:
             expectedReturns = historicalReturns.mean()
+        expectedReturns = np.asarray(expectedReturns, dtype = float).ravel()
+
+        # The covariance is symmetric, so the weights μᵀ·Σ⁻¹ solve the linear equations Σ·w = μ,
+        # which an estimator can solve without computing the covariance
+        if covariance is None and self.covariance_estimator is not None:
+            return self.covariance_estimator.Solve(historicalReturns, expectedReturns)
         if covariance is None:
             covariance = historicalReturns.cov()
 
-        return expectedReturns.dot(inv(covariance))
\ No newline at end of file
+        return np.linalg.solve(covariance, expectedReturns)
+
+    def OptimizeBatch(self, historicalReturns, processes = 0):
+        '''
+        Perform portfolio optimization for each window of a stack of windows of historical returns, like the rebalances of a walk-forward analysis.
+        Without a covariance estimator, the weights of the windows solve stacked linear equations Σ·w = μ at once
+        args:
+            historicalReturns: Windows of annualized historical returns (size: W x T x N), an array or a sequence of matrices of the same securities.
+            processes(int): Number of worker processes optimizing consecutive windows with a covariance estimator,
+                            None for the number of processors, 0 to optimize in this process.
+        Returns:
+            Array of double with the portfolio weights of each window (size: W x N)
+        '''
+        if self.covariance_estimator is not None:
+            return optimize_batch(self, historicalReturns, processes)
+
+        windows, _ = get_windows(historicalReturns)
+        weights = np.empty((len(windows), windows.shape[2]))
+        for block in get_blocks(windows):
+            expectedReturns = get_batch_mean(windows[block])[..., np.newaxis]
+            weights[block] = np.linalg.solve(get_batch_covariance(windows[block]), expectedReturns)[..., 0]
+        return weights
\ No newline at end of file
@@ -37,7 +37,10 @@ namespace QuantConnect.Configuration
                 new CommandLineOption("strategy-description", CommandOptionType.SingleValue, "Strategy description"),
                 new CommandLineOption("live-data-source-file", CommandOptionType.SingleValue, "Live source data json file"),
                 new CommandLineOption("backtest-data-source-file", CommandOptionType.SingleValue, "Backtest source data json file"),
-                new CommandLineOption("report-destination", CommandOptionType.SingleValue, "Destination of processed report file")
+                new CommandLineOption("report-destination", CommandOptionType.SingleValue, "Destination of processed report file"),
+                new CommandLineOption("report-batch-source", CommandOptionType.SingleValue, "Folder of backtest source data json files, or backtest source data json files separated by commas, to generate many reports at once"),
+                new CommandLineOption("report-batch-destination", CommandOptionType.SingleValue, "Destination folder of the batch report files"),
+                new CommandLineOption("report-batch-workers", CommandOptionType.SingleValue, "Number of batch reports generated concurrently")
             };
 
         /// <summary>
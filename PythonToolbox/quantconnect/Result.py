@@ -11,12 +11,20 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import numpy as np
+import os
 import pandas as pd
-from math import isnan
-from datetime import datetime
+from array import array
+from json import dumps, loads
+from urllib.parse import quote
+from quantconnect.order import ORDER_DIRECTIONS, ORDER_STATUSES, ORDER_TYPES
+from quantconnect.stream import ANY, ChunkedTable, read_feather, stream_json, write_feather
+from quantconnect.symbol import SECURITY_TYPES
 
 class Result:
-    '''Result represents the live or backtest result of a successfully executed algorithm'''
+    '''Result represents the live or backtest result of a successfully executed algorithm
+
+    The Orders, ClosedTrades, Charts, ProfitLoss and RollingWindow tables are created the first time they are read'''
 
     def __init__(self, json):
         '''Creates a new instance of Result'''
@@ -33,71 +41,246 @@ class Result:
         self.Statistics = Information(result.pop('Statistics', {}))
         self.AlphaRuntimeStatistics  = Information(result.pop('AlphaRuntimeStatistics', {}))
         self.RuntimeStatistics = Information(result.pop('RuntimeStatistics', {}))
-        self.ClosedTrades = self.__create_closed_trades_table(result)
-        self.Charts = self.__create_charts_table(result)
-        self.ProfitLoss = self.__create_profit_loss_table(result)
-        self.Orders = self.__create_order_table(result)
-        self.RollingWindow = self.__create_rolling_window_table(result)
+
+        # Keep the source of the tables out of the Information
+        self.__tables = dict()
+        self.__loaders = dict()
+        self.__sources = { key: result.pop(key, None) for key in ['Orders', 'Charts', 'ProfitLoss', 'RollingWindow'] }
+        if 'TotalPerformance' in result:
+            self.__sources['TotalPerformance'] = result['TotalPerformance']
         self.Information = Information(json)
 
+    @property
+    def Orders(self):
+        '''DataFrame with the orders information'''
+        return self.__get_table('Orders', self.__create_order_table)
+
+    @property
+    def ClosedTrades(self):
+        '''DataFrame with the closed trades information'''
+        return self.__get_table('ClosedTrades', self.__create_closed_trades_table)
+
+    @property
+    def Charts(self):
+        '''Dictionary of DataFrames with the charts information keyed by chart name'''
+        return self.__get_table('Charts', self.__create_charts_table)
+
+    @property
+    def ProfitLoss(self):
+        '''DataFrame with the algorithm P&L'''
+        return self.__get_table('ProfitLoss', self.__create_profit_loss_table)
+
+    @property
+    def RollingWindow(self):
+        '''DataFrame with the rolling statistics information'''
+        return self.__get_table('RollingWindow', self.__create_rolling_window_table)
+
+    @classmethod
+    def from_stream(cls, fp, folder = None, chunk_size = 10000):
+        '''Creates a new instance of Result by incrementally parsing a json document, building the Orders,
+        ClosedTrades, ProfitLoss and Charts tables chunk by chunk so the whole document is never held in memory.
+        Requires the ijson package, and pyarrow to spill the tables to disk.
+
+        Args:
+            fp: File-like object with the json document, e.g. a file or a streamed response body
+            folder(str): Folder where the tables are written as Feather files and read from when accessed.
+                         None to keep the tables in memory
+            chunk_size(int): Number of rows converted to a DataFrame at once
+        Returns:
+            Result object'''
+        def path(name):
+            return None if folder is None else os.path.join(folder, f'{name}.feather')
+
+        if folder is not None:
+            os.makedirs(folder, exist_ok = True)
+
+        live = [False]
+        orders = ChunkedTable(lambda rows: cls.__create_order_frame(rows, live[0]), chunk_size, path('Orders'))
+        trades = ChunkedTable(cls.__create_closed_trades_frame, chunk_size, path('ClosedTrades'))
+        profitLoss = ChunkedTable(cls.__create_profit_loss_frame, chunk_size, path('ProfitLoss'))
+        points = dict()
+
+        def add_order(route, key, value):
+            live[0] = route[0] == 'LiveResults'
+            orders.append(value)
+
+        def add_point(route, key, value):
+            chart, series = route[-4], route[-2]
+            x, y = points.setdefault(chart, dict()).setdefault(series, (array('d'), array('d')))
+            x.append(value['x'])
+            y.append(value['y'])
+
+        routes = dict()
+        for root in [('result',), ('LiveResults', 'results')]:
+            routes.update({
+                root + ('Orders',): add_order,
+                root + ('TotalPerformance', 'ClosedTrades'): lambda route, key, value: trades.append(value),
+                root + ('ProfitLoss',): lambda route, key, value: profitLoss.append((key, value)),
+                root + ('Charts', ANY, 'Series', ANY, 'Values'): add_point })
+
+        json = stream_json(fp, routes)
+        result = cls(json)
+        sources = result.__sources
+        tables = { 'Orders': orders, 'ClosedTrades': trades, 'ProfitLoss': profitLoss }
+        finalize = {
+            'Orders': lambda df: df.dropna(how='all', axis=1),
+            'ClosedTrades': lambda df: df,
+            'ProfitLoss': lambda df: df.sort_index() }
+        performance = sources.get('TotalPerformance', None)
+
+        for name, table in tables.items():
+            source = performance if name == 'ClosedTrades' else sources
+            if source is None or source.get(name, None) is None:
+                result.__tables[name] = None
+                continue
+            frame = table.close()
+            if folder is None:
+                result.__tables[name] = finalize[name](frame)
+            else:
+                result.__loaders[name] = lambda path = frame, finalize = finalize[name]: finalize(read_feather(path))
+            sources.pop(name, None)
+
+        if sources.get('Charts', None) is not None:
+            charts = dict()
+            for name, chart in sources.pop('Charts').items():
+                if name == 'Meta': continue
+                series = points.pop(name, dict())
+                columns = [cls.__create_series_frame(column, *series.get(column, ([], []))) for column in chart['Series']]
+                df = cls.__merge_series_frames(columns)
+                if df is None: continue
+                if folder is None:
+                    charts[name] = df
+                else:
+                    charts[name] = os.path.join(folder, 'Charts', f'{quote(name, safe = "")}.feather')
+                    write_feather(df, charts[name])
+            if folder is None:
+                result.__tables['Charts'] = charts
+            else:
+                result.__loaders['Charts'] = lambda: { name: read_feather(x) for name, x in charts.items() }
+
+        return result
+
+    def save(self, path, compression = 'lz4'):
+        '''Saves the result to a folder: the tables as compact Feather (Arrow IPC) files and the statistics and
+        information as json. Requires the pyarrow package.
+
+        Args:
+            path(str): Folder where the result is saved
+            compression(str): Compression of the Feather files: 'lz4', 'zstd' or 'uncompressed'.
+                              Uncompressed files are memory mapped without copying when loaded
+        '''
+        os.makedirs(path, exist_ok = True)
+        information = {
+            'LiveMode': self.LiveMode,
+            'Statistics': self.Statistics,
+            'AlphaRuntimeStatistics': self.AlphaRuntimeStatistics,
+            'RuntimeStatistics': self.RuntimeStatistics,
+            'Information': self.Information,
+            'Tables': [],
+            'Charts': [] }
+
+        for name in ['Orders', 'ClosedTrades', 'ProfitLoss', 'RollingWindow']:
+            table = getattr(self, name)
+            if table is None: continue
+            write_feather(to_compact(table), os.path.join(path, f'{name}.feather'), compression)
+            information['Tables'].append(name)
+
+        if self.Charts is not None:
+            for name, chart in self.Charts.items():
+                write_feather(to_compact(chart), os.path.join(path, 'Charts', f'{quote(name, safe = "")}.feather'), compression)
+                information['Charts'].append(name)
+            information['Tables'].append('Charts')
+
+        with open(os.path.join(path, 'information.json'), 'w') as fp:
+            fp.write(dumps(information))
+
+    @classmethod
+    def load(cls, path):
+        '''Loads a result saved with Result.save. Only the statistics and information are read: the tables are
+        memory mapped the first time they are accessed. Requires the pyarrow package.
+
+        Args:
+            path(str): Folder where the result was saved
+        Returns:
+            Result object'''
+        with open(os.path.join(path, 'information.json')) as fp:
+            information = loads(fp.read())
+
+        results = { key: information[key] for key in ['Statistics', 'AlphaRuntimeStatistics', 'RuntimeStatistics'] }
+        if information['LiveMode']:
+            json = { 'LiveResults': dict(information['Information'], results = results) }
+        else:
+            json = dict(information['Information'], result = results)
+        result = cls(json)
+
+        for name in ['Orders', 'ClosedTrades', 'ProfitLoss', 'RollingWindow']:
+            if name in information['Tables']:
+                result.__loaders[name] = lambda file = os.path.join(path, f'{name}.feather'): read_feather(file)
+            else:
+                result.__tables[name] = None
+
+        if 'Charts' in information['Tables']:
+            charts = { x: os.path.join(path, 'Charts', f'{quote(x, safe = "")}.feather') for x in information['Charts'] }
+            result.__loaders['Charts'] = lambda: { name: read_feather(x) for name, x in charts.items() }
+        else:
+            result.__tables['Charts'] = None
+
+        return result
+
+    def __get_table(self, name, create):
+        '''Gets the table with the given name, creating it on first access'''
+        if name not in self.__tables:
+            loader = self.__loaders.pop(name, None)
+            self.__tables[name] = create(self.__sources) if loader is None else loader()
+            # Release the source once all the tables that depend on it are created
+            self.__sources.pop(name, None)
+            if 'ClosedTrades' in self.__tables and 'RollingWindow' in self.__tables:
+                self.__sources.pop('TotalPerformance', None)
+        return self.__tables[name]
+
     def __create_order_table(self, json):
         '''Creates a dataframe with the orders information'''
-        orders = json.pop('Orders', None)
+        orders = json.get('Orders', None)
         if orders is None: return None
 
         # In Live results, orders is a list, so convert to dict keyed by Id.
         if isinstance(orders, list):
             orders = {x['Id']: x for x in orders}
 
-        def __status_int_to_str(value):
-            if value is None: return None
-            values = [ 'New', 'Submitted', 'PartiallyFilled', 'Filled', 'Canceled', 'None', 'Invalid', 'CancelPending' ]
-            return str(values) if value >= len(values) else values[value]
-
-        def __security_type_int_to_str(value):
-            if value is None: return None
-            values = [ 'Base', 'Equity', 'Option', 'Commodity', 'Forex', 'Future', 'Cfd', 'Crypto' ]
-            return str(values) if value >= len(values) else values[value]
-
-        def __type_int_to_str(value):
-            if value is None:   return None
-            values = [ 'Market', 'Limit', 'StopMarket', 'StopLimit', 'MarketOnOpen', 'MarketOnClose', 'OptionExercise' ]
-            return str(values) if value >= len(values) else values[value]
+        return self.__create_order_frame(list(orders.values()), self.LiveMode).dropna(how='all', axis=1)
 
+    @staticmethod
+    def __create_order_frame(orders, live):
+        '''Creates a dataframe from a list of orders'''
         columns = [
             'Id', 'Time', 'SecurityType', 'Symbol', 'PriceCurrency',
             'Quantity', 'Direction', 'Price', 'Type', 'Status', 'Tag',
             'LastFillTime', 'LastUpdateTime', 'CanceledTime' ]
         
-        if self.LiveMode:
+        if live:
             columns += ['DeployId']
 
-        drop_columns = [
-            'BrokerId', 'ContingentId', 'CreatedTime', 'IsMarketable', 'Value',
-            'AbsoluteQuantity', 'OrderSubmissionData', 'Properties', 'TimeInForce'] 
-
-        df = pd.DataFrame([v for k, v in orders.items()], columns = columns + drop_columns)
-        df = df.set_index('Id').drop(drop_columns, axis=1)
-        df['Time'] = df['Time'].apply(self.__str_to_datetime)
-        df['CanceledTime'] = df['CanceledTime'].apply(self.__str_to_datetime)
-        df['LastFillTime'] = df['LastFillTime'].apply(self.__str_to_datetime)
-        df['LastUpdateTime'] = df['LastUpdateTime'].apply(self.__str_to_datetime)
-        df['Symbol'] = df['Symbol'].apply(lambda x: x['ID'])
-        df['Type'] = df['Type'].apply(__type_int_to_str)
-        df['Direction'] = df['Direction'].apply(self.__direction_int_to_str)
-        df['Status'] = df['Status'].apply(__status_int_to_str)
-
-        df['SecurityType'] = df['SecurityType'].apply(__security_type_int_to_str)
-        return df.dropna(how='all', axis=1)
+        df = pd.DataFrame(orders, columns = columns).set_index('Id')
+        for column in ['Time', 'CanceledTime', 'LastFillTime', 'LastUpdateTime']:
+            df[column] = to_datetime(df[column])
+        df['Symbol'] = [x['ID'] if isinstance(x, dict) else x for x in df['Symbol']]
+        df['Type'] = to_category(df['Type'], ORDER_TYPES)
+        df['Direction'] = to_category(df['Direction'], ORDER_DIRECTIONS)
+        df['Status'] = to_category(df['Status'], ORDER_STATUSES)
+        df['SecurityType'] = to_category(df['SecurityType'], SECURITY_TYPES)
+        return df
 
     def __create_profit_loss_table(self, json):
         '''Creates a dataframe with the algorithm P&L'''
-        profitLoss = json.pop('ProfitLoss', None)
+        profitLoss = json.get('ProfitLoss', None)
         if profitLoss is None: return None
+        return self.__create_profit_loss_frame(list(profitLoss.items())).sort_index()
 
-        df = pd.DataFrame({'profit_loss' : profitLoss})
+    @staticmethod
+    def __create_profit_loss_frame(items):
+        '''Creates a dataframe from a list of (time, profit loss) pairs'''
+        df = pd.DataFrame({'profit_loss' : [x[1] for x in items]}, index = to_datetime([x[0] for x in items]))
         df.index.name = 'time'
-        df.index = df.index.map(self.__str_to_datetime)
         return df
 
     def __create_closed_trades_table(self, json):
@@ -106,23 +289,27 @@ class Result:
         if total is None: return None
         trades = total.get('ClosedTrades', None)
         if trades is None: return None
+        return self.__create_closed_trades_frame(trades)
 
+    @staticmethod
+    def __create_closed_trades_frame(trades):
+        '''Creates a dataframe from a list of closed trades'''
         df = pd.DataFrame(trades, columns = [
             'Symbol', 'Quantity', 'Direction', 'EntryTime', 'EntryPrice',
             'ExitPrice', 'ExitTime', 'Duration', 'EndTradeDrawdown', 
             'MAE', 'MFE', 'ProfitLoss', 'TotalFees'
             ])
-        df['Symbol'] = df['Symbol'].apply(lambda x: x['ID'])
-        df['Direction'] = df['Direction'].apply(self.__direction_int_to_str)
-        df['EntryTime'] = df['EntryTime'].apply(self.__str_to_datetime)
-        df['ExitTime'] = df['ExitTime'].apply(self.__str_to_datetime)
+        df['Symbol'] = [x['ID'] if isinstance(x, dict) else x for x in df['Symbol']]
+        df['Direction'] = to_category(df['Direction'], ORDER_DIRECTIONS)
+        df['EntryTime'] = to_datetime(df['EntryTime'])
+        df['ExitTime'] = to_datetime(df['ExitTime'])
         df['Duration'] = df['ExitTime'] - df['EntryTime']
         return df.set_index('EntryTime')
 
     def __create_charts_table(self, json):
         '''Creates a dataframe with the charts information. 
         By converting the json into a dataframe, it makes data visualization easier'''
-        charts = json.pop('Charts', None)
+        charts = json.get('Charts', None)
         if charts is None: return None
 
         df_charts = dict()
@@ -131,47 +318,105 @@ class Result:
             if name == 'Meta': continue
             columns = list()
             for column, series in chart['Series'].items():
-                df = pd.DataFrame(series['Values'])
-                df['x'] = pd.to_datetime(df['x'], unit='s')
-                df = df.rename(index=str, columns={"x": "time", "y": column})
-                columns.append(df.set_index('time'))
-            if len(columns) > 1:
-                df = pd.concat(columns, axis = 1, sort = True)
-            df = df.fillna(method = 'ffill')
-            df = df.fillna(method = 'bfill')
-            df_charts[name] = df
+                values = series['Values']
+                columns.append(self.__create_series_frame(column, [x['x'] for x in values], [x['y'] for x in values]))
+            df = self.__merge_series_frames(columns)
+            if df is not None:
+                df_charts[name] = df
         return df_charts
 
+    @staticmethod
+    def __create_series_frame(name, x, y):
+        '''Creates a dataframe of a chart series from its x (unix time) and y values'''
+        df = pd.DataFrame({name: y}, index = pd.to_datetime(x, unit='s'))
+        df.index.name = 'time'
+        return df
+
+    @staticmethod
+    def __merge_series_frames(columns):
+        '''Merges the dataframes of the series of a chart'''
+        if len(columns) == 0: return None
+        df = pd.concat(columns, axis = 1, sort = True) if len(columns) > 1 else columns[0]
+        return df.ffill().bfill()
+
     def __create_rolling_window_table(self, json):
         '''Creates a dataframe with the rolling statistics information.
         By converting the json into a dataframe, it makes data visualization easier'''
-        rollingWindow = json.pop('RollingWindow', None)
+        rollingWindow = json.get('RollingWindow', None)
         if rollingWindow is None: return None
 
         series = dict()
         if 'TotalPerformance' in json:
             window = json['TotalPerformance']
             if window is None: window = dict()
-            stats = window.get('PortfolioStatistics', dict())
+            stats = dict(window.get('PortfolioStatistics', dict()))
             stats.update(window.get('TradeStatistics', dict()))
             series = {'TotalPerformance': pd.Series(stats)}
 
         for row, window in rollingWindow.items():
-            stats = window.get('PortfolioStatistics', dict())
+            stats = dict(window.get('PortfolioStatistics', dict()))
             stats.update(window.get('TradeStatistics', dict()))
             series.update({row: pd.Series(stats)})
 
         return pd.DataFrame(series).transpose()
 
-    def __direction_int_to_str(self, value):
-        if value is None: return None
-        return [ 'Buy', 'Sell', 'Hold' ][value]
 
-    def __str_to_datetime(self, value):
-        if value is None: return None
-        if isinstance(value, float) and isnan(value): return None
-        fmt = '%Y-%m-%dT%H:%M:%SZ' if len(value) == 20 else '%Y-%m-%dT%H:%M:%S.%fZ'
-        return datetime.strptime(value, fmt)
+def to_datetime(values):
+    '''Parses ISO 8601 UTC timestamps, e.g. 2019-01-02T14:30:00Z or 2019-01-02T14:30:00.123Z, in a single vectorized pass
+
+    Args:
+        values: Series, list or array of strings. None and NaN values are parsed as NaT
+    Returns:
+        Naive (UTC) datetime64 Series or DatetimeIndex'''
+    try:
+        parsed = pd.to_datetime(values, utc = True, format = 'ISO8601')
+    except ValueError:
+        # pandas < 2.0 does not know the ISO8601 format but already infers mixed ISO 8601 formats
+        parsed = pd.to_datetime(values, utc = True)
+    if isinstance(parsed, pd.Series):
+        return parsed.dt.tz_localize(None)
+    return parsed.tz_localize(None)
+
+def to_category(values, categories):
+    '''Maps the integer values of a C# enum to a categorical of their names
+
+    Args:
+        values: Series of integers
+        categories: List of the enum names indexed by their value
+    Returns:
+        Categorical Series. Values out of range are mapped to NaN'''
+    names = [x for x in categories if x is not None]
+    return values.map(dict(enumerate(categories))).astype(pd.CategoricalDtype(names))
+
+
+def to_compact(frame):
+    '''Converts the columns of a DataFrame to compact types without losing information: float64 columns whose values
+    are exactly representable as float32 to float32, and string columns with repeated values to categoricals
+
+    Args:
+        frame: DataFrame
+    Returns:
+        DataFrame with compact column types'''
+    frame = frame.copy()
+    for column in frame.columns:
+        values = frame[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            continue
+        if values.dtype == np.float64:
+            with np.errstate(over = 'ignore'):
+                compact = values.values.astype(np.float32)
+            restored = compact.astype(np.float64)
+            if ((restored == values.values) | (np.isnan(restored) & np.isnan(values.values))).all():
+                frame[column] = compact
+        elif values.dtype == object or pd.api.types.is_string_dtype(values.dtype):
+            strings = values.dropna()
+            if all(isinstance(x, str) for x in strings):
+                if strings.nunique() <= len(strings) // 2:
+                    frame[column] = values.astype('category')
+            elif len(set(map(type, strings))) > 1:
+                # Arrow columns have a single type
+                frame[column] = values.map(lambda x: x if x is None else str(x))
+    return frame
 
 
 class Information(dict):
@@ -11,15 +11,77 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+import os
+import re
 from base64 import b64encode
-from datetime import datetime as dt
+from calendar import timegm
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime as dt, timezone
+from functools import partial
 from hashlib import sha256
 from json import dumps, loads
-from requests import get, post
-from time import mktime, time
+from requests import Session
+from requests.adapters import HTTPAdapter
+from time import perf_counter, sleep, time
+from urllib3.util.retry import Retry
+from zipfile import BadZipFile, ZipFile
+from quantconnect.cache import READ_ONLY_POSTS, ResponseCache
+from quantconnect.compare import compare_backtests, compare_equity, summarize_backtest
+from quantconnect.leandata import generate_relative_zip_file_path, get_trading_dates, is_hour_or_daily
+from quantconnect.live import LiveResultDelta
 from quantconnect.Result import Result
 
+API_URL = 'https://www.quantconnect.com/api/v2/'
 DOWNLOAD_CHUNK_SIZE = 256 * 1024
+MIN_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+MAX_DOWNLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+DOWNLOAD_CHUNK_SECONDS = 0.25   # Chunk sizes adapt so reading a chunk takes about this long
+DEFAULT_POOL_SIZE = 10
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+LOG_TIME = re.compile(r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}')   # Logs start with their time, which sorts as text
+
+def create_session(pool_size = DEFAULT_POOL_SIZE, max_retries = 3, backoff_factor = 0.5):
+    '''Creates a requests.Session that keeps connections alive and retries failed idempotent requests
+
+    Args:
+        pool_size(int): Maximum number of connections kept alive per host
+        max_retries(int): Number of times a failed GET request is retried
+        backoff_factor(float): Factor of the exponential sleep between retries (backoff_factor * 2 ** (retry - 1) seconds)
+    Returns:
+        requests.Session with a pooled HTTP adapter mounted for http and https'''
+    retry = Retry(total = max_retries,
+                  backoff_factor = backoff_factor,
+                  status_forcelist = RETRY_STATUS_CODES,
+                  raise_on_status = False)
+    adapter = HTTPAdapter(pool_connections = pool_size, pool_maxsize = pool_size, max_retries = retry)
+    session = Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+def adapt_chunk_size(size, read, seconds):
+    '''Chunk size of the next read of a download so a read takes about DOWNLOAD_CHUNK_SECONDS
+
+    Args:
+        size(int): Size of the last read
+        read(int): Bytes returned by the last read
+        seconds(float): Duration of the last read
+    Returns:
+        Size of the next read between MIN_DOWNLOAD_CHUNK_SIZE and MAX_DOWNLOAD_CHUNK_SIZE'''
+    if read == size and seconds < DOWNLOAD_CHUNK_SECONDS / 2:
+        size *= 2
+    elif seconds > DOWNLOAD_CHUNK_SECONDS * 2:
+        size //= 2
+    return max(MIN_DOWNLOAD_CHUNK_SIZE, min(MAX_DOWNLOAD_CHUNK_SIZE, size))
+
+def is_valid_zip(path):
+    '''True if the file is a zip archive whose members match their CRC'''
+    try:
+        with ZipFile(path) as zip:
+            return zip.testzip() is None
+    except (BadZipFile, OSError):
+        return False
 
 class Api:
     '''QuantConnect.com Interaction Via API.
@@ -27,14 +89,38 @@ class Api:
     Args:
         userId(int/str): User Id number found at www.quantconnect.com/account.
         token(str): Access token found at www.quantconnect.com/account.
-        debug(boolean): True to enable debugging messages'''
-
-    def __init__(self, userId, token, debug = False):
+        debug(boolean): True to enable debugging messages
+        pool_size(int): Maximum number of connections kept alive to the API
+        max_retries(int): Number of times a failed GET request is retried
+        backoff_factor(float): Factor of the exponential sleep between retries
+        timeout(float): Seconds to wait for the server before giving up, None to wait forever
+        url(str): Base url of the QuantConnect API
+        cache(ResponseCache/str): Cache of the responses of read-only endpoints, or the path of its database.
+                                  None to disable caching'''
+
+    def __init__(self, userId, token, debug = False, pool_size = DEFAULT_POOL_SIZE,
+                 max_retries = 3, backoff_factor = 0.5, timeout = None, url = API_URL, cache = None):
         '''Creates a new instance of Api'''
-        self.__url = 'https://www.quantconnect.com/api/v2/'
+        self.__url = url
         self.__userId =  userId
         self.__token = token
         self.__debug = debug
+        self.__timeout = timeout
+        self.__session = create_session(pool_size, max_retries, backoff_factor)
+        self.cache = ResponseCache(cache) if isinstance(cache, str) else cache
+        self.__owns_cache = isinstance(cache, str)
+
+    def close(self):
+        '''Closes the pooled connections of this instance, and the cache it created'''
+        self.__session.close()
+        if self.__owns_cache:
+            self.cache.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
 
     def Execute(self, endpoint, data = None, is_post = False, headers = {}):
         '''Execute an authenticated request to the QuantConnect API
@@ -43,26 +129,19 @@ class Api:
             data(dict): Request values
             is_post(boolean): True if POST request, GET request otherwise
             headers(dict): Additional headers'''
-        url = self.__url + endpoint
+        cached = self.cache is not None and (not is_post or endpoint in READ_ONLY_POSTS)
+        if cached:
+            result = self.cache.get(self.__userId, endpoint, data)
+            if result is not None:
+                return result
 
-        # Create authenticated timestamped token.
-        timestamp = str(int(time()))
-
-        # Attach timestamp to token for increasing token randomness
-        timeStampedToken = f'{self.__token}:{timestamp}'
-
-        # Hash token for transport
-        apiToken = sha256(timeStampedToken.encode('utf-8')).hexdigest()
-
-        # Attach in headers for basic authentication.
-        authentication = f'{self.__userId}:{apiToken}'
-        basic = b64encode(authentication.encode('utf-8')).decode('ascii')
-        headers.update({ 'Authorization': f'Basic {basic}', 'Timestamp': timestamp })
+        url = self.__url + endpoint
+        headers = self.__authenticate(headers)
 
         if is_post:
-            response = post(url = url, data = data, headers = headers)
+            response = self.__session.post(url = url, data = data, headers = headers, timeout = self.__timeout)
         else:   # Encode the request in parameters of URL.
-            response = get(url = url, params = data, headers = headers)
+            response = self.__session.get(url = url, params = data, headers = headers, timeout = self.__timeout)
 
         if self.__debug:
             print(url)
@@ -80,16 +159,96 @@ class Api:
                 ]}
 
         if not result['success']:
-            message = ''
-            for name, value in result.items():
-                if isinstance(value, str):
-                    message += f'{name}: {value} '
-                if isinstance(value, list):
-                    message += f'{name}: {", ".join(value)} '
-            print(f'There was an exception processing your request: {message}')
+            self.__print_error(result)
+        elif cached:
+            self.cache.put(self.__userId, endpoint, data, result)
+
+        # Whether it succeeded or not, the request may have changed the project or files lists that are cached
+        if self.cache is not None and not cached:
+            self.cache.invalidate(endpoint)
 
         return result
 
+    def __authenticate(self, headers):
+        '''Adds the basic authentication and timestamp headers of the QuantConnect API to the given headers'''
+        # Create authenticated timestamped token.
+        timestamp = str(int(time()))
+
+        # Attach timestamp to token for increasing token randomness
+        timeStampedToken = f'{self.__token}:{timestamp}'
+
+        # Hash token for transport
+        apiToken = sha256(timeStampedToken.encode('utf-8')).hexdigest()
+
+        # Attach in headers for basic authentication.
+        authentication = f'{self.__userId}:{apiToken}'
+        basic = b64encode(authentication.encode('utf-8')).decode('ascii')
+        return dict(headers, **{ 'Authorization': f'Basic {basic}', 'Timestamp': timestamp })
+
+    def __print_error(self, result):
+        '''Prints the messages of an unsuccessful request'''
+        message = ''
+        for name, value in result.items():
+            if isinstance(value, str):
+                message += f'{name}: {value} '
+            if isinstance(value, list):
+                message += f'{name}: {", ".join(value)} '
+        print(f'There was an exception processing your request: {message}')
+
+    def __read_content(self, endpoint, data):
+        '''Executes an authenticated GET request and returns the response body without parsing it
+
+        Args:
+            endpoint(str): Request end point.
+            data(dict): Request values
+        Returns:
+            Bytes of the response body, or None if the request failed'''
+        url = self.__url + endpoint
+        response = self.__session.get(url = url, params = data, headers = self.__authenticate({}), timeout = self.__timeout)
+
+        if self.__debug:
+            print(url)
+            print(f'{response.status_code} {response.reason}')
+
+        if not response.ok:
+            self.__print_error({
+                'success': False,
+                'messages': [f'API returned {response.status_code} {response.reason}', response.text] })
+            return None
+        return response.content
+
+    def __stream_result(self, endpoint, data, folder):
+        '''Executes an authenticated GET request and incrementally parses the response body into a Result
+
+        Args:
+            endpoint(str): Request end point.
+            data(dict): Request values
+            folder(str): Folder where the tables of the result are written, None to keep them in memory
+        Returns:
+            Result object, or the dictionary with the error messages if the request failed'''
+        url = self.__url + endpoint
+        headers = self.__authenticate({})
+
+        with self.__session.get(url = url, params = data, headers = headers, stream = True, timeout = self.__timeout) as response:
+            if self.__debug:
+                print(url)
+                print(f'{response.status_code} {response.reason}')
+
+            if not response.ok:
+                result = {
+                    'success': False,
+                    'messages': [f'API returned {response.status_code} {response.reason}', response.text] }
+                self.__print_error(result)
+                return result
+
+            # Let urllib3 decompress the body while it is parsed
+            response.raw.decode_content = True
+            result = Result.from_stream(response.raw, folder)
+
+        if not result.Information.get('success', True):
+            self.__print_error(dict(result.Information))
+        return result
+
     def connected(self):
         '''Check whether Api is successfully connected with correct credentials'''
         return self.Execute('authenticate')['success']
@@ -279,24 +438,74 @@ class Api:
                 'backtestName': backtestName
             }, True)
 
-    def read_backtest(self, projectId, backtestId, json_format = True):
+    def read_backtest(self, projectId, backtestId, json_format = True, stream = False, folder = None):
         '''Read out the full result of a specific backtest.
 
         Args:
             projectId(int): Project id for the backtest we'd like to read
             backtestId(str): Backtest id for the backtest we'd like to read
             parsed(boolean): True if parse the results as pandas.DataFrame
+            stream(boolean): True to parse the response while it is downloaded, see Result.from_stream
+            folder(str): Folder where a streamed result writes its tables, None to keep them in memory
         Returns:
             dictionary that includes the backtest information or Result object
         '''
-        json =  self.Execute('backtests/read',
-            {
-                'projectId' : projectId,
-                'backtestId': backtestId
-            })
+        data = {
+            'projectId' : projectId,
+            'backtestId': backtestId
+        }
+        if stream:
+            return self.__stream_result('backtests/read', data, folder)
+
+        json =  self.Execute('backtests/read', data)
 
         return json if json_format else Result(json)
 
+    def read_backtests(self, projectId, backtestIds, max_workers = 8, processes = None):
+        '''Reads the results of many backtests concurrently to compare their statistics and their equity curves.
+        Responses are downloaded in a thread pool and parsed in a process pool as they arrive, each backtest once.
+
+        Args:
+            projectId(int): Project id of the backtests we'd like to read
+            backtestIds(list): Backtest ids of the backtests we'd like to read
+            max_workers(int): Maximum number of concurrent downloads
+            processes(int): Number of processes parsing the responses, None for the number of processors,
+                            0 to parse them in the download threads
+        Returns:
+            Tuple of the DataFrame of the statistics indexed by backtestId, see quantconnect.compare.compare_backtests,
+            and of the DataFrame of the equity curves with a column per backtest, see quantconnect.compare.compare_equity.
+            Backtests that could not be read are left out
+        '''
+        summaries = self.__read_summaries(projectId, backtestIds, max_workers, processes)
+        return compare_backtests(summaries), compare_equity(summaries)
+
+    def __read_summaries(self, projectId, backtestIds, max_workers, processes):
+        '''Downloads the results of many backtests and summarizes them, see read_backtests'''
+        def read(backtestId):
+            content = self.__read_content('backtests/read', { 'projectId': projectId, 'backtestId': backtestId })
+            if content is None or processes != 0:
+                return content
+            return summarize_backtest(content)
+
+        with ThreadPoolExecutor(max_workers) as threads:
+            futures = { threads.submit(read, x): x for x in backtestIds }
+            if processes == 0:
+                summaries = { futures[x]: x.result() for x in futures }
+            else:
+                with ProcessPoolExecutor(processes) as pool:
+                    parsing = dict()
+                    for future in as_completed(futures):
+                        content = future.result()
+                        if content is not None:
+                            parsing[futures[future]] = pool.submit(summarize_backtest, content)
+                    summaries = { k: v.result() for k, v in parsing.items() }
+
+        summaries = { x: summaries.get(x, None) for x in backtestIds }
+        missing = [k for k, v in summaries.items() if v is None]
+        if missing:
+            print(f'The following backtests could not be read: {", ".join(missing)}')
+        return summaries
+
     def read_backtest_report(self, projectId, backtestId, save=False):
         '''Read out the report of a backtest in the project id specified.
 
@@ -375,13 +584,13 @@ class Api:
                 "The Api only supports Algorithm Statuses of Running, Stopped, RuntimeError and Liquidated")
 
         if endTime == None:
-            endTime = dt.utcnow()
+            endTime = dt.now(timezone.utc)
 
         return self.Execute('live/read',
             {
                 'status': str(status),
-                'end': mktime(endTime.timetuple()),
-                'start': 0 if startTime == None else mktime(startTime.timetuple())
+                'end': timegm(endTime.utctimetuple()),
+                'start': 0 if startTime == None else timegm(startTime.utctimetuple())
             })
 
     def create_live_algorithm(self, projectId, compileId, serverType, baseLiveAlgorithmSettings, versionId="-1"):
@@ -409,23 +618,46 @@ class Api:
             True,
             headers = {"Accept": "application/json"})
 
-    def read_live_algorithm(self, projectId, deployId = None, json_format = True):
+    def read_live_algorithm(self, projectId, deployId = None, json_format = True, stream = False, folder = None):
         '''Read out a live algorithm in the project id specified.
 
         Args:
             projectId(int): Project id to read
             deployId: Specific instance id to read
+            stream(boolean): True to parse the response while it is downloaded, see Result.from_stream
+            folder(str): Folder where a streamed result writes its tables, None to keep them in memory
         Returns:
             Dictionary that contains information regarding the live algorithm or Result object
         '''
-        json = self.Execute('live/read',
-            {
-                'projectId': projectId,
-                'deployId': deployId
-            })
+        data = {
+            'projectId': projectId,
+            'deployId': deployId
+        }
+        if stream:
+            return self.__stream_result('live/read', data, folder)
+
+        json = self.Execute('live/read', data)
 
         return json if json_format else Result(json)
 
+    def tail_live_algorithm(self, projectId, deployId = None, interval = 60):
+        '''Follows a live algorithm, reading its result every interval seconds.
+
+        Args:
+            projectId(int): Project id to read
+            deployId: Specific instance id to read
+            interval(float): Seconds between reads
+        Returns:
+            Generator of Result objects with the orders, profit and loss entries and chart points that are new or
+            updated since the previous read. The first Result has the whole result. Failed reads are skipped
+        '''
+        delta = LiveResultDelta()
+        while True:
+            json = self.read_live_algorithm(projectId, deployId)
+            if json['success'] and 'LiveResults' in json:
+                yield Result(delta.update(json))
+            sleep(interval)
+
     def liquidate_live_algorithm(self, projectId):
         '''Liquidate a live algorithm from the specified project.
 
@@ -459,15 +691,15 @@ class Api:
             List of strings that represent the logs of the algorithm
         '''
         if endTime == None:
-            endTime = dt.utcnow()
+            endTime = dt.now(timezone.utc)
 
         json = self.Execute('live/read/log',
             {
                 'format': 'json',
                 'projectId': projectId,
                 'algorithmId': algorithmId,
-                'end': mktime(endTime.timetuple()),
-                'start': 0 if startTime == None else mktime(startTime.timetuple())
+                'end': timegm(endTime.utctimetuple()),
+                'start': 0 if startTime == None else timegm(startTime.utctimetuple())
             })
 
         if save and json['success']:
@@ -477,6 +709,45 @@ class Api:
 
         return json
 
+    def tail_live_logs(self, projectId, algorithmId, startTime=None, interval=60, save=False):
+        '''Follows the logs of a specific live algorithm, reading the new logs every interval seconds.
+
+        Args:
+            projectId(int): Project Id of the live running algorithm
+            algorithmId(str): Algorithm Id of the live running algorithm
+            startTime(datetime): No logs will be returned before this time. Should be in UTC
+            interval(float): Seconds between reads
+            save(boolean): True if the new logs should be appended to the log file on disk
+        Returns:
+            Generator of lists of strings with the logs that are new since the previous read
+        '''
+        # Logs at the boundary of two reads may be returned again, so only the logs after the last emitted one
+        # are new: the ones with a later time, or with the same time and not emitted yet
+        lastTime, emitted = '', set()
+        while True:
+            endTime = dt.now(timezone.utc)
+            json = self.read_live_logs(projectId, algorithmId, startTime, endTime)
+
+            if json['success']:
+                logs = []
+                for log in json['LiveLogs']:
+                    logTime = LOG_TIME.match(log)
+                    logTime = lastTime if logTime is None else logTime.group()
+                    if logTime < lastTime or (logTime == lastTime and log in emitted):
+                        continue
+                    if logTime > lastTime:
+                        lastTime, emitted = logTime, set()
+                    emitted.add(log)
+                    logs.append(log)
+                startTime = endTime
+
+                if save and logs:
+                    with open(algorithmId + '.txt', "a") as fp:
+                        fp.write('\n'.join(logs) + '\n')
+                yield logs
+
+            sleep(interval)
+
     def read_data_link(self, symbol, securityType, market, resolution, date):
         '''Gets the link to the downloadable data.
 
@@ -499,9 +770,12 @@ class Api:
                 'date': date.strftime("%Y%m%d")
             })
 
-    def download_data(self, symbol, securityType, market, resolution, date, fileName):
+    def download_data(self, symbol, securityType, market, resolution, date, fileName, progress = None):
         '''Method to download and save the data purchased through QuantConnect
 
+        The data is written to a ".part" file which is verified and renamed once complete, so an interrupted
+        download resumes where it stopped when called again.
+
         Args:
             symbol(str): Symbol of security of which data will be requested.
             securityType(str): Type of underlying asset
@@ -509,6 +783,8 @@ class Api:
             resolution(str): Resolution of data requested.
             date(datetime): Date of the data requested.
             fileName(str): file name of data download
+            progress(callable): Function called after each chunk with the path, bytes downloaded, total bytes
+                                (None if unknown) and throughput in bytes per second
         Returns:
             Boolean indicating whether the data was successfully downloaded or not
         '''
@@ -521,13 +797,109 @@ class Api:
             return False
 
         # download and save the data
-        with open(fileName + '.zip', "wb") as code:
-            request = get(link['link'], stream=True)
-            for chunk in request.iter_content(DOWNLOAD_CHUNK_SIZE):
-                code.write(chunk)
+        return self.__download_file(link['link'], fileName + '.zip', progress)
+
+    def download_data_range(self, symbols, securityType, market, resolution, start, end, dataFolder = 'data', max_workers = 8, progress = None):
+        '''Downloads the data of many symbols and dates concurrently into the LEAN data folder structure
+
+        Valid zip files already present in the data folder are skipped without contacting the API.
+        Downloads are written to a ".part" file which is renamed once complete, so an interrupted run
+        resumes the partial files where they stopped.
+
+        Args:
+            symbols(list): Symbols of the securities of which data will be requested
+            securityType(str): Type of underlying asset
+            market(str): e.g. CBOE, CBOT, FXCM, GDAX etc.
+            resolution(str): Resolution of data requested
+            start(datetime): First date of the data requested
+            end(datetime): Last date of the data requested (inclusive)
+            dataFolder(str): Root of the LEAN data folder
+            max_workers(int): Maximum number of concurrent downloads
+            progress(callable): Function called after each chunk with the path, bytes downloaded, total bytes
+                                (None if unknown) and throughput in bytes per second. Called from the download threads
+        Returns:
+            Dictionary keyed by the file path with a boolean indicating whether the file is available on disk
+        '''
+        # Hour and daily data of a symbol is stored in a single file
+        dates = [end] if is_hour_or_daily(resolution) else get_trading_dates(securityType, start, end)
+
+        files = {}
+        for symbol in symbols:
+            for date in dates:
+                path = os.path.join(dataFolder, generate_relative_zip_file_path(symbol, securityType, market, date, resolution))
+                files[path] = (symbol, date)
+
+        def download(path):
+            if os.path.isfile(path) and is_valid_zip(path):
+                return True
+            symbol, date = files[path]
+            link = self.read_data_link(symbol, securityType, market, resolution, date)
+            return link['success'] and self.__download_file(link['link'], path, progress)
+
+        with ThreadPoolExecutor(max_workers) as executor:
+            return dict(zip(files, executor.map(download, files)))
+
+    def __download_file(self, url, path, progress = None):
+        '''Streams the file at the url to the path, resuming a previous partial download if any.
+        Zip files are verified before they are renamed: a corrupt resumed file is downloaded again from the start'''
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok = True)
+
+        part_path = path + '.part'
+        position = os.path.getsize(part_path) if os.path.isfile(part_path) else 0
+        if not self.__download_part(url, part_path, position, progress):
+            return False
+
+        if path.endswith('.zip') and not is_valid_zip(part_path):
+            os.remove(part_path)
+            if position == 0 or not self.__download_part(url, part_path, 0, progress) or not is_valid_zip(part_path):
+                if os.path.isfile(part_path):
+                    os.remove(part_path)
+                return False
 
+        os.replace(part_path, path)
         return True
 
+    def __download_part(self, url, part_path, position, progress):
+        '''Appends the bytes of the file at the url from the position to the part file'''
+        # Ranges of an encoded response are ranges of the encoded bytes, so resumed files are not encoded
+        headers = { 'Range': f'bytes={position}-', 'Accept-Encoding': 'identity' } if position > 0 else {}
+
+        with self.__session.get(url, stream = True, headers = headers, timeout = self.__timeout) as response:
+            if response.status_code == 416:
+                # The part file is already complete
+                return True
+            if not response.ok:
+                return False
+
+            # Restart unless the server resumes from the position
+            resumed = response.status_code == 206 and \
+                response.headers.get('Content-Range', '').startswith(f'bytes {position}-')
+            if not resumed:
+                position = 0
+
+            length = response.headers.get('Content-Length', None)
+            total = position + int(length) if length is not None else None
+            response.raw.decode_content = True
+
+            # Content-Length counts the bytes sent, which are compressed if the response is encoded
+            downloaded, size, start = position, DOWNLOAD_CHUNK_SIZE, perf_counter()
+            with open(part_path, 'ab' if resumed else 'wb') as fp:
+                while True:
+                    read = perf_counter()
+                    chunk = response.raw.read(size)
+                    if not chunk: break
+                    fp.write(chunk)
+                    downloaded = position + response.raw.tell()
+                    size = adapt_chunk_size(size, len(chunk), perf_counter() - read)
+                    if progress is not None:
+                        elapsed = perf_counter() - start
+                        progress(part_path[:-len('.part')], downloaded, total, (downloaded - position) / elapsed if elapsed > 0 else 0)
+            downloaded = position + response.raw.tell()
+
+        return total is None or downloaded == total
+
     def __pretty_print(self, result):
         '''Print out a nice formatted version of the request'''
         print ('')
@@ -540,4 +912,53 @@ class Api:
             print (result.text)
             print ('')
             print (err)
-        print ('')
\ No newline at end of file
+        print ('')
+
+class AsyncApi:
+    '''Asynchronous QuantConnect.com Interaction Via API.
+
+    Exposes the same endpoints as Api as coroutines so many requests can be awaited at once.
+    Requests are executed on a bounded thread pool that shares the pooled keep-alive connections of one Api instance.
+
+    Example:
+        >>> async with AsyncApi(userId, token) as api:
+        >>>     results = await asyncio.gather(*[api.read_backtest(projectId, x) for x in backtestIds])
+
+    Args:
+        userId(int/str): User Id number found at www.quantconnect.com/account.
+        token(str): Access token found at www.quantconnect.com/account.
+        max_workers(int): Maximum number of concurrent requests. Defaults to the connection pool size
+        kwargs: Additional arguments of Api, e.g. pool_size, max_retries, backoff_factor, timeout'''
+
+    def __init__(self, userId, token, max_workers = None, **kwargs):
+        '''Creates a new instance of AsyncApi'''
+        self.__api = Api(userId, token, **kwargs)
+        self.__executor = ThreadPoolExecutor(max_workers or kwargs.get('pool_size', DEFAULT_POOL_SIZE))
+
+    def __getattr__(self, name):
+        '''Wraps the endpoint of Api with the given name into a coroutine function'''
+        if name.startswith('_'):
+            raise AttributeError(name)
+        method = getattr(self.__api, name)
+        if not callable(method):
+            raise AttributeError(name)
+
+        async def endpoint(*args, **kwargs):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.__executor, partial(method, *args, **kwargs))
+
+        endpoint.__name__ = name
+        endpoint.__doc__ = method.__doc__
+        return endpoint
+
+    def close(self):
+        '''Waits for the pending requests and closes the pooled connections'''
+        self.__executor.shutdown(wait = True)
+        self.__api.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        # Waiting for the pending requests blocks, so it runs on the default executor instead of the event loop
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
@@ -0,0 +1,203 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean Algorithmic Trading Engine v2.0. Copyright 2014 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import sqlite3
+import zlib
+from hashlib import sha256
+from json import dumps, loads
+from threading import Lock
+from time import time
+
+# Time to live of the cached responses: None caches forever, 0 never caches
+FOREVER = None
+NEVER = 0
+
+# Seconds a list of projects, files or backtests is cached, since it changes when they are created or updated
+LIST_TTL = 60
+
+DEFAULT_MAX_SIZE = 1024 ** 3
+
+def is_completed(result):
+    '''True if the response describes a completed backtest'''
+    backtest = result.get('backtest', result)
+    if not isinstance(backtest, dict): return False
+    if 'completed' in backtest:
+        return bool(backtest['completed'])
+    return backtest.get('progress', 0) >= 1
+
+def backtest_ttl(params, result):
+    '''Completed backtests never change, running backtests and lists of backtests do'''
+    if 'backtestId' not in params:
+        return LIST_TTL
+    return FOREVER if is_completed(result) else NEVER
+
+# Time to live of the responses of each endpoint, either seconds or a function of the request parameters and
+# the response. Endpoints not listed, e.g. live algorithms, are never cached
+DEFAULT_RULES = {
+    'backtests/read': backtest_ttl,
+    'backtests/read/report': FOREVER,
+    'files/read': LIST_TTL,
+    'projects/read': LIST_TTL
+}
+
+# Endpoints read with POST requests that do not change anything, so their responses may be cached like GET requests
+READ_ONLY_POSTS = { 'backtests/read/report' }
+
+# Cached endpoints whose responses are made stale by each endpoint changing projects or files
+INVALIDATED_ENDPOINTS = {
+    'files/create': ['files/read', 'projects/read'],
+    'files/update': ['files/read', 'projects/read'],
+    'files/delete': ['files/read', 'projects/read'],
+    'projects/create': ['projects/read'],
+    'projects/delete': ['files/read', 'projects/read']
+}
+
+class ResponseCache:
+    '''Size bounded cache of the responses of read-only QuantConnect API endpoints, stored in a SQLite database.
+    When the cache is full, the least recently used responses are evicted.
+
+    Args:
+        path(str): Path of the SQLite database file
+        max_size(int): Maximum size in bytes of the stored (compressed) responses
+        rules(dict): Time to live of the responses of each endpoint, see DEFAULT_RULES'''
+
+    def __init__(self, path, max_size = DEFAULT_MAX_SIZE, rules = DEFAULT_RULES):
+        '''Creates a new instance of ResponseCache'''
+        path = os.path.expanduser(path)
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok = True)
+
+        self.path = path
+        self.max_size = max_size
+        self.rules = dict(rules)
+        self.hits = 0
+        self.misses = 0
+        self.__lock = Lock()
+        self.__connection = sqlite3.connect(path, check_same_thread = False)
+        self.__connection.execute('''CREATE TABLE IF NOT EXISTS responses (
+            key TEXT PRIMARY KEY, endpoint TEXT, body BLOB, size INTEGER, expires REAL, accessed REAL)''')
+        self.__connection.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)')
+        self.__connection.commit()
+
+    def close(self):
+        '''Closes the database'''
+        with self.__lock:
+            self.__connection.close()
+
+    def is_cached(self, endpoint):
+        '''True if the responses of the endpoint may be cached'''
+        return self.rules.get(endpoint, NEVER) != NEVER
+
+    def get(self, key, endpoint, params):
+        '''Gets the cached response of a request
+
+        Args:
+            key(str): Key of the user of the request
+            endpoint(str): Request end point
+            params(dict): Request values
+        Returns:
+            The cached response dictionary, or None if the response is not cached or expired'''
+        if not self.is_cached(endpoint): return None
+
+        key = self.__key(key, endpoint, params)
+        now = time()
+        with self.__lock:
+            row = self.__connection.execute('SELECT body, expires FROM responses WHERE key = ?', (key,)).fetchone()
+            if row is None or (row[1] is not None and row[1] <= now):
+                self.misses += 1
+                return None
+            self.__connection.execute('UPDATE responses SET accessed = ? WHERE key = ?', (now, key))
+            self.__connection.commit()
+            self.hits += 1
+        return loads(zlib.decompress(row[0]).decode('utf-8'))
+
+    def put(self, key, endpoint, params, result):
+        '''Stores the response of a request if the rules of the endpoint allow it
+
+        Args:
+            key(str): Key of the user of the request
+            endpoint(str): Request end point
+            params(dict): Request values
+            result(dict): Response
+        Returns:
+            True if the response was stored'''
+        ttl = self.rules.get(endpoint, NEVER)
+        if callable(ttl):
+            ttl = ttl(self.__params(params), result)
+        if ttl == NEVER or not result.get('success', False):
+            return False
+
+        body = zlib.compress(dumps(result).encode('utf-8'))
+        if len(body) > self.max_size:
+            return False
+
+        now = time()
+        expires = None if ttl is FOREVER else now + ttl
+        with self.__lock:
+            self.__connection.execute('INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)',
+                (self.__key(key, endpoint, params), endpoint, body, len(body), expires, now))
+            self.__evict(now)
+            self.__connection.commit()
+        return True
+
+    def invalidate(self, endpoint):
+        '''Removes the cached responses made stale by a request changing projects or files, see INVALIDATED_ENDPOINTS
+
+        Args:
+            endpoint(str): Request end point
+        Returns:
+            Number of removed responses'''
+        endpoints = INVALIDATED_ENDPOINTS.get(endpoint, [])
+        if not endpoints: return 0
+
+        with self.__lock:
+            removed = self.__connection.executemany('DELETE FROM responses WHERE endpoint = ?',
+                [(x,) for x in endpoints]).rowcount
+            self.__connection.commit()
+        return removed
+
+    def clear(self):
+        '''Removes all the cached responses and resets the counters'''
+        with self.__lock:
+            self.__connection.execute('DELETE FROM responses')
+            self.__connection.commit()
+            self.hits, self.misses = 0, 0
+
+    def info(self):
+        '''Dictionary with the hits, misses, number of entries and size in bytes of the cache'''
+        with self.__lock:
+            entries, size = self.__connection.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses').fetchone()
+        return { 'hits': self.hits, 'misses': self.misses, 'entries': entries, 'size': size }
+
+    def __evict(self, now):
+        '''Removes the expired responses, then the least recently used ones until the cache fits in max_size'''
+        self.__connection.execute('DELETE FROM responses WHERE expires IS NOT NULL AND expires <= ?', (now,))
+        size = self.__connection.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if size <= self.max_size: return
+
+        evicted = []
+        for key, length in self.__connection.execute('SELECT key, size FROM responses ORDER BY accessed'):
+            if size <= self.max_size: break
+            evicted.append((key,))
+            size -= length
+        self.__connection.executemany('DELETE FROM responses WHERE key = ?', evicted)
+
+    def __params(self, params):
+        '''Request values without the ones that are not sent'''
+        return { k: v for k, v in (params or {}).items() if v is not None }
+
+    def __key(self, key, endpoint, params):
+        '''Key of a request in the database'''
+        request = dumps([str(key), endpoint, self.__params(params)], sort_keys = True, default = str)
+        return sha256(request.encode('utf-8')).hexdigest()
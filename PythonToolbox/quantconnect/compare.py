@@ -0,0 +1,105 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean Algorithmic Trading Engine v2.0. Copyright 2014 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pandas as pd
+from json import loads
+
+EQUITY_CHART = 'Strategy Equity'
+EQUITY_SERIES = 'Equity'
+
+def parse_statistic(value):
+    '''Parses a statistic formatted by LEAN, e.g. "1.2", "5.3%" or "$100,000.00", into a float.
+    Percentages keep their displayed value, e.g. "5.3%" is 5.3
+
+    Args:
+        value(str): Formatted statistic
+    Returns:
+        Float, or the value itself if it is not a number'''
+    if not isinstance(value, str):
+        return value
+    try:
+        return float(value.replace('%', '').replace('$', '').replace(',', ''))
+    except ValueError:
+        return value
+
+def summarize_backtest(content):
+    '''Extracts the statistics and equity curve of a backtest result.
+    Module level so it can run in a process pool with the raw response body.
+
+    Args:
+        content(bytes/dict): Body or json of the backtests/read response
+    Returns:
+        Dictionary with the name, statistics (floats where possible) and equity curve (x unix times and y arrays)
+        of the backtest, or None if the response is unsuccessful'''
+    json = loads(content) if isinstance(content, (bytes, str)) else content
+    if not json.get('success', False):
+        return None
+
+    result = json.get('result', None) or json.get('backtest', None) or dict()
+    statistics = { k: parse_statistic(v) for k, v in (result.get('Statistics', None) or dict()).items() }
+
+    values = []
+    chart = (result.get('Charts', None) or dict()).get(EQUITY_CHART, None)
+    if chart is not None:
+        values = chart['Series'].get(EQUITY_SERIES, dict()).get('Values', [])
+
+    return {
+        'name': json.get('name', None),
+        'statistics': statistics,
+        'x': np.array([x['x'] for x in values], dtype = np.int64),
+        'y': np.array([x['y'] for x in values], dtype = np.float64) }
+
+def compare_backtests(summaries):
+    '''Combines the statistics of many backtests into a comparison table
+
+    Args:
+        summaries(dict): Output of summarize_backtest keyed by backtest id
+    Returns:
+        DataFrame with one row per backtest indexed by backtestId, with the name of the backtest, float columns
+        for numeric statistics and categorical columns otherwise'''
+    summaries = { k: v for k, v in summaries.items() if v is not None }
+
+    index = pd.Index(list(summaries), name = 'backtestId')
+    statistics = pd.DataFrame([v['statistics'] for v in summaries.values()], index = index)
+    for column in statistics.columns:
+        numeric = pd.to_numeric(statistics[column], errors = 'coerce')
+        if numeric.notnull().sum() == statistics[column].notnull().sum():
+            statistics[column] = numeric.astype(np.float64)
+        else:
+            statistics[column] = statistics[column].astype('category')
+    statistics.insert(0, 'name', [v['name'] for v in summaries.values()])
+
+    return statistics
+
+def compare_equity(summaries):
+    '''Combines the equity curves of many backtests into a comparison table
+
+    Args:
+        summaries(dict): Output of summarize_backtest keyed by backtest id
+    Returns:
+        DataFrame of the equity curves aligned on the union of their times (forward filled) as float columns
+        keyed by backtest id'''
+    curves = []
+    for backtestId, summary in summaries.items():
+        if summary is None: continue
+        x, y = np.unique(summary['x'], return_index = True)
+        curves.append(pd.Series(summary['y'][y], index = pd.to_datetime(x, unit = 's'), name = backtestId))
+    if curves:
+        equity = pd.concat(curves, axis = 1, sort = True).ffill()
+    else:
+        equity = pd.DataFrame(dtype = np.float64)
+    equity.index.name = 'time'
+    equity.columns.name = 'backtestId'
+
+    return equity
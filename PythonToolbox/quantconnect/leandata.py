@@ -0,0 +1,66 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean Algorithmic Trading Engine v2.0. Copyright 2014 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+from datetime import timedelta
+
+# Security types that only trade on weekdays
+WEEKDAY_SECURITY_TYPES = ['equity', 'option']
+
+def is_hour_or_daily(resolution):
+    '''True if the resolution stores all the dates of a ticker in a single file'''
+    return resolution.lower() in ['hour', 'daily']
+
+def generate_zip_file_name(symbol, securityType, date, resolution, tickType = None):
+    '''Generates the zip file name for the specified date of data, mirrors LeanData.GenerateZipFileName
+
+    Args:
+        symbol(str): Ticker of the security
+        securityType(str): Type of underlying asset
+        date(datetime): Date of the data
+        resolution(str): Resolution of the data
+        tickType(str): Trade or Quote. Defaults to Quote for Forex and Cfd, Trade otherwise
+    Returns:
+        The zip file name, e.g. 20131007_trade.zip or spy.zip'''
+    if is_hour_or_daily(resolution):
+        return f'{symbol.lower()}.zip'
+
+    if tickType is None:
+        tickType = 'quote' if securityType.lower() in ['forex', 'cfd'] else 'trade'
+
+    return f'{date:%Y%m%d}_{tickType.lower()}.zip'
+
+def generate_relative_zip_file_path(symbol, securityType, market, date, resolution, tickType = None):
+    '''Generates the zip file path relative to the data folder, mirrors LeanData.GenerateRelativeZipFilePath
+
+    Returns:
+        The relative path, e.g. equity/usa/minute/spy/20131007_trade.zip'''
+    directory = os.path.join(securityType.lower(), market.lower(), resolution.lower())
+    if not is_hour_or_daily(resolution):
+        directory = os.path.join(directory, symbol.lower())
+
+    return os.path.join(directory, generate_zip_file_name(symbol, securityType, date, resolution, tickType))
+
+def get_trading_dates(securityType, start, end):
+    '''Gets the dates between start and end (inclusive) which can have data for the security type
+
+    Args:
+        securityType(str): Type of underlying asset
+        start(datetime): First date
+        end(datetime): Last date
+    Returns:
+        List of dates. Weekends are excluded for equities and options'''
+    weekdays_only = securityType.lower() in WEEKDAY_SECURITY_TYPES
+    days = (end - start).days + 1
+    dates = [start + timedelta(days = i) for i in range(days)]
+    return [x for x in dates if not weekdays_only or x.weekday() < 5]
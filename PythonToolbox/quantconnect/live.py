@@ -0,0 +1,86 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean Algorithmic Trading Engine v2.0. Copyright 2014 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from json import dumps
+
+class LiveResultDelta:
+    '''Tracks successive snapshots of a live algorithm result to extract what changed since the previous one:
+    new or updated orders, new profit and loss entries and new chart points.
+    Statistics and the other information are kept as in the snapshot.'''
+
+    def __init__(self):
+        '''Creates a new instance of LiveResultDelta'''
+        self.orders = dict()        # Json of the orders keyed by Id
+        self.profit_loss = set()    # Times of the profit and loss entries
+        self.points = dict()        # Time of the last point keyed by (chart, series)
+
+    def update(self, json):
+        '''Gets the delta of a live result snapshot, as returned by the live/read endpoint
+
+        Args:
+            json(dict): Live result snapshot
+        Returns:
+            Live result json with only the orders, profit and loss entries and chart points that are new
+            since the previous snapshot, or the snapshot itself if it does not have results'''
+        live = json.get('LiveResults', None)
+        results = None if live is None else live.get('results', None)
+        if results is None:
+            return json
+
+        delta = dict(results)
+        delta['Orders'] = self.__new_orders(results.get('Orders', None))
+        delta['ProfitLoss'] = self.__new_profit_loss(results.get('ProfitLoss', None))
+        delta['Charts'] = self.__new_points(results.get('Charts', None))
+        return dict(json, LiveResults = dict(live, results = delta))
+
+    def __new_orders(self, orders):
+        '''Orders that are new or changed since the previous snapshot'''
+        if orders is None: return None
+        if isinstance(orders, dict):
+            orders = list(orders.values())
+
+        new = []
+        for order in orders:
+            text = dumps(order, sort_keys = True)
+            if self.orders.get(order['Id'], None) != text:
+                self.orders[order['Id']] = text
+                new.append(order)
+        return new
+
+    def __new_profit_loss(self, profitLoss):
+        '''Profit and loss entries that are new since the previous snapshot'''
+        if profitLoss is None: return None
+        new = { time: value for time, value in profitLoss.items() if time not in self.profit_loss }
+        self.profit_loss.update(new)
+        return new
+
+    def __new_points(self, charts):
+        '''Chart series with only the points that are new since the previous snapshot. Charts without new points are dropped'''
+        if charts is None: return None
+
+        new = dict()
+        for name, chart in charts.items():
+            if name == 'Meta': continue
+            series = dict()
+            for column, values in chart.get('Series', dict()).items():
+                key = (name, column)
+                last = self.points.get(key, None)
+                points = values.get('Values', [])
+                if last is not None:
+                    points = [x for x in points if x['x'] > last]
+                if points:
+                    self.points[key] = max(x['x'] for x in points)
+                    series[column] = dict(values, Values = points)
+            if series:
+                new[name] = dict(chart, Series = series)
+        return new
@@ -0,0 +1,160 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean Algorithmic Trading Engine v2.0. Copyright 2014 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import pandas as pd
+
+# Matches any key of a map in the paths of stream_json routes
+ANY = None
+
+def stream_json(fp, routes):
+    '''Incrementally parses a json document, handing the children of the routed containers to callbacks
+    instead of keeping them in memory. Requires the ijson package.
+
+    Args:
+        fp: File-like object with the json document
+        routes: Dictionary keyed by the path of a container, e.g. ('result', 'Orders') or
+                ('result', 'Charts', ANY, 'Series', ANY, 'Values'), with a callback(path, key, value)
+                which is called with each child of the container. key is None for array items.
+    Returns:
+        The json document where the routed containers are empty'''
+    try:
+        import ijson
+    except ImportError:
+        raise ImportError('Streaming json requires the ijson package: pip install ijson')
+
+    document = ijson.ObjectBuilder()
+    path, kinds = [], []    # Keys and kinds (map or array) of the containers enclosing the current event
+    key = None              # Key of the next value in the current map
+    routed = None           # Path of the routed container being streamed
+    callback = None
+    child, depth = None, 0  # Builder and nesting depth of the current child of the routed container
+
+    for _, event, value in ijson.parse(fp, use_float = True):
+        # Inside a child of a routed container
+        if child is not None:
+            child.event(event, value)
+            if event in ('start_map', 'start_array'):
+                depth += 1
+            elif event in ('end_map', 'end_array'):
+                depth -= 1
+            if depth == 0:
+                callback(routed, key, child.value)
+                child = None
+            continue
+
+        # Directly inside a routed container
+        if routed is not None:
+            if event == 'map_key':
+                key = value
+            elif event in ('start_map', 'start_array'):
+                child, depth = ijson.ObjectBuilder(), 1
+                child.event(event, value)
+            elif event in ('end_map', 'end_array'):
+                document.event(event, value)
+                routed, key = None, None
+                path.pop()
+                kinds.pop()
+            else:
+                callback(routed, key, value)
+            continue
+
+        document.event(event, value)
+        if event == 'map_key':
+            key = value
+        elif event in ('start_map', 'start_array'):
+            path.append(key if kinds and kinds[-1] == 'map' else None)
+            kinds.append('map' if event == 'start_map' else 'array')
+            key = None
+            for route, function in routes.items():
+                if len(route) == len(path) - 1 and all(x is ANY or x == y for x, y in zip(route, path[1:])):
+                    routed, callback = tuple(path[1:]), function
+                    break
+        elif event in ('end_map', 'end_array'):
+            path.pop()
+            kinds.pop()
+            key = None
+
+    return document.value
+
+
+class ChunkedTable:
+    '''Builds a DataFrame from rows received one at a time, converting them in chunks to bound the memory usage.
+    Chunks are concatenated in memory or, if a path is given, appended to a Feather (Arrow IPC) file.
+
+    Args:
+        create: Function that creates the DataFrame of a list of rows
+        chunk_size(int): Number of rows converted at once
+        path(str): Path of the Feather file, None to keep the table in memory'''
+    def __init__(self, create, chunk_size = 10000, path = None):
+        self.create = create
+        self.chunk_size = chunk_size
+        self.path = path
+        self.rows = []
+        self.frames = []
+        self.writer = None
+        self.schema = None
+
+    def append(self, row):
+        '''Appends a row, converting the pending rows once they fill a chunk'''
+        self.rows.append(row)
+        if len(self.rows) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        '''Converts the pending rows into a DataFrame'''
+        frame = self.create(self.rows)
+        self.rows = []
+        if self.path is None:
+            self.frames.append(frame)
+            return
+
+        import pyarrow as pa
+        if self.writer is None:
+            schema = pa.Schema.from_pandas(frame, preserve_index = True)
+            # Columns without values in the first chunk are stored as strings
+            self.schema = pa.schema([x.with_type(pa.string()) if x.type == pa.null() else x for x in schema],
+                                    metadata = schema.metadata)
+            self.writer = pa.ipc.new_file(self.path, self.schema)
+        self.writer.write_table(pa.Table.from_pandas(frame, schema = self.schema, preserve_index = True))
+
+    def close(self):
+        '''Converts the pending rows and returns the DataFrame, or the path of the Feather file'''
+        if self.rows or (self.writer is None and not self.frames):
+            self.flush()
+        if self.path is None:
+            frame = pd.concat(self.frames) if len(self.frames) > 1 else self.frames[0]
+            self.frames = []
+            return frame
+        self.writer.close()
+        return self.path
+
+
+def read_feather(path):
+    '''Reads a Feather (Arrow IPC) file into a DataFrame, memory mapping the file'''
+    import pyarrow.feather as feather
+    return feather.read_table(path, memory_map = True).to_pandas()
+
+def write_feather(frame, path, compression = None):
+    '''Writes a DataFrame to a Feather (Arrow IPC) file, keeping its index
+
+    Args:
+        frame: DataFrame
+        path(str): Path of the Feather file
+        compression(str): 'lz4', 'zstd' or 'uncompressed'. None for the pyarrow default'''
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok = True)
+    feather.write_feather(pa.Table.from_pandas(frame, preserve_index = True), path, compression = compression)
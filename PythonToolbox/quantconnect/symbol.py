@@ -12,6 +12,9 @@
 # limitations under the License.
 
 from datetime import datetime, timedelta
+from functools import lru_cache
+import numpy as np
+import pandas as pd
 
 MARKETS = ['empty', 'USA', 'FXCM', 'Oanda', 'Dukascopy', 'Bitfinex', 'Globex', 'NYMEX', 'CBOT', 'ICE', 'CBOE', 'NSE',
            'GDAX', 'Kraken', 'Bittrex', 'Bithumb', 'Binance', 'Poloniex', 'Coinone', 'HitBTC', 'OkCoin', 'Bitstamp']
@@ -22,8 +25,52 @@ OPTION_STYLES = ['American', 'European']
 
 OPTION_RIGHTS = ['Call', 'Put']
 
+# Security types with a date in their SecurityIdentifier
+DATED_SECURITY_TYPES = ['Equity', 'Option', 'Future']
+
+# Widths and offsets of the properties packed in the decoded SecurityIdentifier, see LEAN's SecurityIdentifier
+SECURITY_TYPE_WIDTH = 100
+SECURITY_TYPE_OFFSET = 1
+
+MARKET_WIDTH = 1000
+MARKET_OFFSET = SECURITY_TYPE_OFFSET * SECURITY_TYPE_WIDTH
+
+STRIKE_DEFAULT_SCALE = 4
+STRIKE_DEFAULT_SCALE_EXPANDED = 10 ** STRIKE_DEFAULT_SCALE
+STRIKE_SCALE_WIDTH = 100
+STRIKE_SCALE_OFFSET = MARKET_OFFSET * MARKET_WIDTH
+
+STRIKE_WIDTH = 1000000
+STRIKE_OFFSET = STRIKE_SCALE_OFFSET * STRIKE_SCALE_WIDTH
+
+OPTION_STYLE_WIDTH = 10
+OPTION_STYLE_OFFSET = STRIKE_OFFSET * STRIKE_WIDTH
+
+DAYS_WIDTH = 100000
+DAYS_OFFSET = OPTION_STYLE_OFFSET * OPTION_STYLE_WIDTH
+
+PUT_CALL_OFFSET = DAYS_OFFSET * DAYS_WIDTH
+PUT_CALL_WIDTH = 10
+
+# Origin of the days of the SecurityIdentifier date (OLE Automation date)
+DAYS_ORIGIN = datetime(1899, 12, 30, 0, 0, 0)
+
+# Maximum number of distinct SecurityIdentifier codes whose decoded value is cached
+CACHE_SIZE = 65536
+
 
 class Symbol:
+    __slots__ = ['ID', 'Symbol', 'SecurityType', 'Market', 'Date', 'Underlying', 'OptionRight', 'OptionStyle', 'StrikePrice']
+
+    strike_default_scale = STRIKE_DEFAULT_SCALE
+    strike_default_scaleExpanded = STRIKE_DEFAULT_SCALE_EXPANDED
+    strike_scale_width = STRIKE_SCALE_WIDTH
+    strike_scale_offset = STRIKE_SCALE_OFFSET
+    strike_width = STRIKE_WIDTH
+    strike_offset = STRIKE_OFFSET
+    days_width = DAYS_WIDTH
+    days_offset = DAYS_OFFSET
+
     def __init__(self, security_id):
         """
         Parses a Lean's SecurityIdentifier and decode its properties.
@@ -46,29 +93,8 @@ class Symbol:
         For securities with underlying, it can receive a pair of ticker-sid separated by an "|", the first represent
         the security itself, the second is its underlying's SecurityIdentifier.
 
+        To decode many SecurityIdentifiers at once, use decode_symbols.
         """
-        security_type_width = 100
-        security_type_offset = 1
-        market_width = 1000
-        market_offset = security_type_offset * security_type_width
-
-        self.strike_default_scale = 4
-        self.strike_default_scaleExpanded = 10 ** self.strike_default_scale
-        self.strike_scale_width = 100
-        self.strike_scale_offset = market_offset * market_width
-
-        self.strike_width = 1000000
-        self.strike_offset = self.strike_scale_offset * self.strike_scale_width
-
-        option_style_width = 10
-        option_style_offset = self.strike_offset * self.strike_width
-
-        self.days_width = 100000
-        self.days_offset = option_style_offset * option_style_width
-
-        put_call_offset = self.days_offset * self.days_width
-        put_call_width = 10
-
         self.ID = security_id
         is_option = False
 
@@ -81,24 +107,24 @@ class Symbol:
         symbol, properties = self.parse_security_id(security_id)
         self.Symbol = symbol
         self.SecurityType = SECURITY_TYPES[self.extract_from_properties(properties,
-                                                                        security_type_offset,
-                                                                        security_type_width)]
+                                                                        SECURITY_TYPE_OFFSET,
+                                                                        SECURITY_TYPE_WIDTH)]
         self.Market = MARKETS[self.extract_from_properties(properties,
-                                                           market_offset,
-                                                           market_width)]
+                                                           MARKET_OFFSET,
+                                                           MARKET_WIDTH)]
 
-        if self.SecurityType == 'Equity' or self.SecurityType == 'Option' or self.SecurityType == 'Future':
+        if self.SecurityType in DATED_SECURITY_TYPES:
             self.Date = self.extract_date_from_properties(properties)
         else:
             self.Date = None
 
         if is_option:
             self.OptionRight = OPTION_RIGHTS[self.extract_from_properties(properties,
-                                                                          put_call_offset,
-                                                                          put_call_width)]
+                                                                          PUT_CALL_OFFSET,
+                                                                          PUT_CALL_WIDTH)]
             self.OptionStyle = OPTION_STYLES[self.extract_from_properties(properties,
-                                                                          option_style_offset,
-                                                                          option_style_width)]
+                                                                          OPTION_STYLE_OFFSET,
+                                                                          OPTION_STYLE_WIDTH)]
             self.StrikePrice = self.extract_strike_price_from_properties(properties)
 
     @staticmethod
@@ -115,16 +141,7 @@ class Symbol:
         :param code: string to decode
         :return: an integer representing the decoded sid.
         """
-        base = 1
-        result = 0
-        ord_zero = ord('0')
-        ord_a = ord('A')
-        for char in code[::-1]:
-            ord_char = ord(char)
-            value = ord_char - ord_zero if ord_char <= 57 else ord_char - ord_a + 10
-            result += base * value
-            base *= 36
-        return result
+        return decode_base_36(code)
 
     def extract_date_from_properties(self, properties):
         """
@@ -133,8 +150,8 @@ class Symbol:
         :param properties: an integer representing the decoded sid.
         :return: a datetime object with the specific security Date.
         """
-        days = (properties // self.days_offset) % self.days_width
-        return datetime(1899, 12, 30, 0, 0, 0) + timedelta(days=float(days))
+        days = (properties // DAYS_OFFSET) % DAYS_WIDTH
+        return DAYS_ORIGIN + timedelta(days=float(days))
 
     def extract_strike_price_from_properties(self, properties):
         """
@@ -143,8 +160,8 @@ class Symbol:
         :param properties: an integer representing the decoded sid.
         :return: a float with the specific strike price.
         """
-        scale = int((properties // self.strike_scale_offset) % self.strike_scale_width) - self.strike_default_scale
-        unscaled_price = (properties // self.strike_offset) % self.strike_width
+        scale = int((properties // STRIKE_SCALE_OFFSET) % STRIKE_SCALE_WIDTH) - STRIKE_DEFAULT_SCALE
+        unscaled_price = (properties // STRIKE_OFFSET) % STRIKE_WIDTH
         return unscaled_price * 10 ** scale
 
     def parse_security_id(self, security_id):
@@ -160,3 +177,77 @@ class Symbol:
 
     def __eq__(self, other):
         return self.ID == other.ID
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def decode_base_36(code):
+    """
+    Decode a string in base 36, caching the most recently decoded codes.
+    :param code: string to decode
+    :return: an integer representing the decoded sid.
+    """
+    return int(code, 36)
+
+
+def decode_symbols(security_ids):
+    """
+    Decodes many Lean's SecurityIdentifiers at once, e.g. the Symbol column of the Result Orders table.
+
+    Each distinct SecurityIdentifier is decoded once and its properties are extracted with vectorized
+    integer arithmetic, which is much faster than creating a Symbol per row.
+
+    :param security_ids: Series, list or array of SecurityIdentifier strings as accepted by Symbol.
+    None and NaN values produce a row of missing values.
+    :return: a DataFrame with the same index as security_ids (when a Series) and the columns
+    Symbol, SecurityType, Market, Date, StrikePrice, OptionRight, OptionStyle and Underlying
+    (the SecurityIdentifier of the underlying). Properties that do not apply to a security are missing.
+    """
+    index = security_ids.index if isinstance(security_ids, pd.Series) else None
+    codes, uniques = pd.factorize(pd.Series(security_ids, dtype=object).values)
+
+    tickers, underlyings, high, low = [], [], [], []
+    for security_id in uniques:
+        security_id, _, underlying = security_id.partition('|')
+        ticker, code = security_id.split(' ')
+        # The decoded sid does not fit in 64 bits: split it at the days offset
+        days, properties = divmod(decode_base_36(code), DAYS_OFFSET)
+        tickers.append(ticker)
+        underlyings.append(underlying or None)
+        high.append(days)
+        low.append(properties)
+
+    high = np.array(high, dtype=np.int64)
+    low = np.array(low, dtype=np.int64)
+    has_underlying = np.array([x is not None for x in underlyings], dtype=bool)
+
+    security_type = (low // SECURITY_TYPE_OFFSET) % SECURITY_TYPE_WIDTH
+    market = (low // MARKET_OFFSET) % MARKET_WIDTH
+    days = (high % DAYS_WIDTH).astype('timedelta64[D]')
+    is_dated = np.isin(security_type, [SECURITY_TYPES.index(x) for x in DATED_SECURITY_TYPES])
+
+    scale = (low // STRIKE_SCALE_OFFSET) % STRIKE_SCALE_WIDTH - STRIKE_DEFAULT_SCALE
+    strike = ((low // STRIKE_OFFSET) % STRIKE_WIDTH) * np.power(10.0, scale)
+    option_style = (low // OPTION_STYLE_OFFSET) % OPTION_STYLE_WIDTH
+    option_right = (high // (PUT_CALL_OFFSET // DAYS_OFFSET)) % PUT_CALL_WIDTH
+
+    def column(values, categories=None, mask=None):
+        # Maps the values of the distinct ids to the rows, missing ids (code -1) are mapped to NaN
+        values = np.asarray(values)
+        if categories is not None:
+            values = pd.Categorical.from_codes(np.where(values < len(categories), values, -1), categories)
+        values = pd.Series(values).reindex(codes).reset_index(drop=True)
+        return values if mask is None else values.where(np.append(mask, False)[codes])
+
+    decoded = pd.DataFrame({
+        'Symbol': column(tickers),
+        'SecurityType': column(security_type, SECURITY_TYPES),
+        'Market': column(market, MARKETS),
+        'Date': column((np.datetime64(DAYS_ORIGIN, 'D') + days).astype('datetime64[ns]'), mask=is_dated),
+        'StrikePrice': column(strike, mask=has_underlying),
+        'OptionRight': column(np.where(has_underlying, option_right, -1), OPTION_RIGHTS),
+        'OptionStyle': column(np.where(has_underlying, option_style, -1), OPTION_STYLES),
+        'Underlying': column(underlyings)})
+
+    if index is not None:
+        decoded.index = index
+    return decoded
@@ -31,5 +31,6 @@ setup(
      url='https://www.quantconnect.com/',
      license=license,
      packages = find_packages(exclude=('tests', 'docs')),
-     install_requires=['matplotlib', 'pandas', 'requests']
+     install_requires=['matplotlib', 'numpy', 'pandas', 'requests'],
+     extras_require={'stream': ['ijson>=3.1', 'pyarrow']}
      )
\ No newline at end of file
@@ -0,0 +1,62 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean Algorithmic Trading Engine v2.0. Copyright 2014 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Benchmark of quantconnect.Result on a large synthetic backtest result.
+# Run from the PythonToolbox folder:
+# $ python -m tests.benchmark_result
+
+import gc
+import pandas as pd
+from copy import deepcopy
+from datetime import datetime
+from time import perf_counter
+from quantconnect.Result import Result, to_datetime
+from tests.synthetic_result import synthetic_backtest
+
+def timeit(function, setup = lambda: None, repeat = 3):
+    '''Best wall time of the function called with the output of setup in seconds'''
+    best = float('inf')
+    for _ in range(repeat):
+        args = setup()
+        gc.collect()
+        start = perf_counter()
+        function(args)
+        best = min(best, perf_counter() - start)
+    return best
+
+def str_to_datetime(value):
+    '''Per-row parsing used by Result before the vectorized parsing'''
+    if value is None: return None
+    fmt = '%Y-%m-%dT%H:%M:%SZ' if len(value) == 20 else '%Y-%m-%dT%H:%M:%S.%fZ'
+    return datetime.strptime(value, fmt)
+
+def all_tables(json):
+    result = Result(json)
+    return result.Orders, result.ClosedTrades, result.Charts, result.ProfitLoss, result.RollingWindow
+
+if __name__ == '__main__':
+    orders = 100000
+    json = synthetic_backtest(orders = orders, points = 100000)
+    times = pd.Series([x['Time'] for x in json['result']['Orders'].values()])
+
+    copy = lambda: deepcopy(json)
+    statistics = timeit(lambda x: Result(x).Statistics, copy)
+    tables = timeit(all_tables, copy)
+    per_row = timeit(lambda x: times.apply(str_to_datetime))
+    vectorized = timeit(lambda x: to_datetime(times))
+
+    print(f'Synthetic backtest with {orders} orders, {orders // 2} closed trades and 100000 chart points')
+    print(f'Result(json).Statistics:        {statistics:8.3f} s')
+    print(f'Result(json) with all tables:   {tables:8.3f} s')
+    print(f'Order times, per-row strptime:  {per_row:8.3f} s')
+    print(f'Order times, vectorized:        {vectorized:8.3f} s ({per_row / vectorized:.0f}x faster)')
@@ -0,0 +1,83 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean Algorithmic Trading Engine v2.0. Copyright 2014 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from json import dumps
+from socketserver import ThreadingMixIn
+from threading import Lock, Thread
+from urllib.parse import parse_qs, urlparse
+
+class LocalServer(ThreadingMixIn, HTTPServer):
+    '''Stand-in for the QuantConnect API used to test the Api transport without network access.
+
+    Routes map an endpoint (e.g. 'backtests/read') to a function that receives the request parameters
+    and returns either a dictionary (sent as JSON) or a tuple of (status code, body bytes, headers)'''
+    daemon_threads = True
+
+    def __init__(self, routes = None):
+        super().__init__(('127.0.0.1', 0), LocalRequestHandler)
+        self.routes = routes if routes is not None else {}
+        self.requests = []
+        self.connections = set()
+        self.lock = Lock()
+        self.thread = Thread(target = self.serve_forever, daemon = True)
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server_address[1]}/'
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+        self.server_close()
+
+
+class LocalRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        self.__respond(url.path, parse_qs(url.query))
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        self.__respond(urlparse(self.path).path, parse_qs(self.rfile.read(length).decode('utf-8')))
+
+    def __respond(self, path, params):
+        params = {k: v[0] for k, v in params.items()}
+        with self.server.lock:
+            self.server.requests.append((self.command, path, params, dict(self.headers)))
+            self.server.connections.add(self.client_address)
+
+        route = self.server.routes.get(path.strip('/'))
+        if route is None:
+            status, body, headers = 404, b'', {}
+        else:
+            result = route(params, self.headers)
+            if isinstance(result, tuple):
+                status, body, headers = result
+            else:
+                status, body, headers = 200, dumps(result).encode('utf-8'), {'Content-Type': 'application/json'}
+
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
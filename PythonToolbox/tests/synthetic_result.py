@@ -0,0 +1,73 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean Algorithmic Trading Engine v2.0. Copyright 2014 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from datetime import datetime, timedelta
+from random import Random
+
+SIDS = ['SPY R735QTJ8XC9X', 'AAPL R735QTJ8XC9X', 'EURUSD 5O', 'BTCUSD XJ', 'SPY 3033WWUF8MUH2|SPY R735QTJ8XC9X']
+
+def iso(time):
+    '''Formats a datetime like the LEAN json serializer does'''
+    if time.microsecond:
+        return time.strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+    return time.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+def synthetic_backtest(orders = 1000, points = 1000, trades = None, seed = 0):
+    '''Creates the json of a backtest result with the given number of orders and chart points'''
+    random = Random(seed)
+    start = datetime(2015, 1, 2, 14, 31)
+    trades = orders // 2 if trades is None else trades
+
+    def order(id):
+        time = start + timedelta(minutes = id * 7, microseconds = 0 if id % 3 else 123000)
+        symbol = SIDS[id % len(SIDS)]
+        return {
+            'Id': id, 'ContingentId': 0, 'BrokerId': [str(id)], 'Symbol': {'Value': symbol.split(' ')[0], 'ID': symbol},
+            'Price': round(random.uniform(10, 300), 2), 'PriceCurrency': 'USD', 'Time': iso(time), 'CreatedTime': iso(time),
+            'LastFillTime': iso(time + timedelta(seconds = 1)), 'LastUpdateTime': None,
+            'CanceledTime': iso(time) if id % 50 == 0 else None,
+            'Quantity': random.choice([-100, 100, 10]), 'Type': id % 7, 'Status': 5 if id % 50 == 0 else 3, 'Tag': '',
+            'Properties': {'TimeInForce': {}}, 'SecurityType': 1, 'Direction': id % 2,
+            'Value': 100.0, 'OrderSubmissionData': None, 'IsMarketable': False }
+
+    def trade(id):
+        entry = start + timedelta(hours = id)
+        return {
+            'Symbol': {'Value': 'SPY', 'ID': SIDS[id % len(SIDS)]}, 'EntryTime': iso(entry), 'EntryPrice': 100.0,
+            'Direction': id % 2, 'Quantity': 10.0, 'ExitTime': iso(entry + timedelta(minutes = 30)), 'ExitPrice': 101.0,
+            'ProfitLoss': 10.0, 'TotalFees': 1.0, 'MAE': -2.0, 'MFE': 3.0, 'Duration': '00:30:00', 'EndTradeDrawdown': -1.0 }
+
+    equity = [{'x': 1420209000 + i * 60, 'y': 100000 + random.uniform(-1000, 1000)} for i in range(points)]
+    benchmark = [{'x': 1420209000 + i * 120, 'y': 200 + random.uniform(-10, 10)} for i in range(points // 2)]
+    statistics = {'Total Trades': str(orders), 'Sharpe Ratio': '1.2', 'Drawdown': '5.3%'}
+    performance = {'PortfolioStatistics': {'SharpeRatio': 1.2}, 'TradeStatistics': {'TotalNumberOfTrades': trades}}
+
+    return {
+        'success': True,
+        'progress': 1,
+        'name': 'Synthetic',
+        'result': {
+            'Statistics': statistics,
+            'RuntimeStatistics': {'Equity': '$100,000.00'},
+            'AlphaRuntimeStatistics': None,
+            'Orders': {str(i): order(i) for i in range(1, orders + 1)},
+            'ProfitLoss': {iso(start + timedelta(minutes = i * 30)): 1.5 * i for i in range(trades)},
+            'Charts': {
+                'Strategy Equity': {'Name': 'Strategy Equity', 'Series': {
+                    'Equity': {'Name': 'Equity', 'Values': equity},
+                    'Daily Performance': {'Name': 'Daily Performance', 'Values': equity[::10]}}},
+                'Benchmark': {'Name': 'Benchmark', 'Series': {'Benchmark': {'Name': 'Benchmark', 'Values': benchmark}}}},
+            'RollingWindow': {f'M1_2015{m:02}28': performance for m in range(1, 13)},
+            'TotalPerformance': dict(performance, ClosedTrades = [trade(i) for i in range(trades)])
+        }
+    }
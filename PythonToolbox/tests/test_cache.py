@@ -0,0 +1,123 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean Algorithmic Trading Engine v2.0. Copyright 2014 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import quantconnect.cache
+from quantconnect.api import Api
+from quantconnect.cache import ResponseCache
+from tests.local_server import LocalServer
+
+def read_backtest(params, headers):
+    if 'backtestId' not in params:
+        return {'success': True, 'backtests': []}
+    return {'success': True, 'backtestId': params['backtestId'], 'progress': float(params['backtestId'] != 'running')}
+
+def test_completed_backtests_are_read_once(tmp_path):
+    cache = ResponseCache(str(tmp_path / 'cache.db'))
+    with LocalServer({'backtests/read': read_backtest}) as server:
+        with Api(0, 'token', url = server.url, cache = cache) as api:
+            for _ in range(3):
+                assert api.read_backtest(1, 'done')['backtestId'] == 'done'
+                assert api.read_backtest(1, 'running')['backtestId'] == 'running'
+
+        # A new session reads the same database
+        with Api(0, 'token', url = server.url, cache = str(tmp_path / 'cache.db')) as api:
+            assert api.read_backtest(1, 'done')['progress'] == 1
+
+        assert [params['backtestId'] for _, _, params, _ in server.requests] == ['done'] + ['running'] * 3
+    assert cache.info() == {'hits': 2, 'misses': 4, 'entries': 1, 'size': cache.info()['size']}
+
+def test_live_and_post_endpoints_are_not_cached(tmp_path):
+    routes = {
+        'live/read': lambda params, headers: {'success': True, 'status': 'Running'},
+        'projects/create': lambda params, headers: {'success': True, 'projects': []} }
+    with LocalServer(routes) as server:
+        with Api(0, 'token', url = server.url, cache = str(tmp_path / 'cache.db')) as api:
+            for _ in range(2):
+                api.read_live_algorithm(1, 'L-1')
+                api.create_project('name', 'Py')
+            assert api.cache.info()['entries'] == 0
+
+        assert len(server.requests) == 4
+
+def test_file_and_project_changes_invalidate_the_cached_lists(tmp_path):
+    files = ['main.py']
+    def create(params, headers):
+        files.append(params['name'])
+        return {'success': True, 'files': []}
+    routes = {
+        'files/read': lambda params, headers: {'success': True, 'files': [{'name': x} for x in files]},
+        'files/create': create,
+        'projects/read': lambda params, headers: {'success': True, 'projects': [{'projectId': 1}]} }
+    with LocalServer(routes) as server:
+        with Api(0, 'token', url = server.url, cache = str(tmp_path / 'cache.db')) as api:
+            api.list_projects()
+            for _ in range(2):
+                assert [x['name'] for x in api.read_project_files(1)['files']] == ['main.py']
+            api.add_project_file(1, 'alpha.py', '')
+            assert api.cache.info()['entries'] == 0
+            assert [x['name'] for x in api.read_project_files(1)['files']] == ['main.py', 'alpha.py']
+
+        assert [endpoint for _, endpoint, _, _ in server.requests] == \
+            ['/projects/read', '/files/read', '/files/create', '/files/read']
+
+def test_backtest_reports_are_read_once(tmp_path):
+    report = lambda params, headers: {'success': True, 'report': f'<html>{params["backtestId"]}</html>'}
+    with LocalServer({'backtests/read/report': report}) as server:
+        with Api(0, 'token', url = server.url, cache = str(tmp_path / 'cache.db')) as api:
+            for _ in range(2):
+                assert api.read_backtest_report(1, 'first')['report'] == '<html>first</html>'
+            assert api.read_backtest_report(1, 'second')['report'] == '<html>second</html>'
+            assert api.cache.info()['entries'] == 2
+
+        assert [params['backtestId'] for _, _, params, _ in server.requests] == ['first', 'second']
+
+def test_failed_requests_are_not_cached(tmp_path):
+    responses = iter([{'success': False, 'errors': ['Backtest not found']}, {'success': True, 'report': '<html/>'}])
+    with LocalServer({'backtests/read/report': lambda params, headers: next(responses)}) as server:
+        with Api(0, 'token', url = server.url, cache = str(tmp_path / 'cache.db')) as api:
+            assert not api.read_backtest_report(1, 'id')['success']
+            assert api.cache.info()['entries'] == 0
+            assert api.read_backtest_report(1, 'id')['report'] == '<html/>'
+            assert api.read_backtest_report(1, 'id')['report'] == '<html/>'
+        assert len(server.requests) == 2
+
+def test_responses_expire(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(quantconnect.cache, 'time', lambda: now[0])
+    cache = ResponseCache(str(tmp_path / 'cache.db'), rules = {'backtests/read': 60})
+
+    assert cache.put(0, 'backtests/read', {'projectId': 1}, {'success': True, 'backtests': []})
+    assert cache.get(0, 'backtests/read', {'projectId': 1, 'other': None}) == {'success': True, 'backtests': []}
+    assert cache.get(1, 'backtests/read', {'projectId': 1}) is None
+    now[0] += 60
+    assert cache.get(0, 'backtests/read', {'projectId': 1}) is None
+
+def test_least_recently_used_responses_are_evicted(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(quantconnect.cache, 'time', lambda: now[0])
+    cache = ResponseCache(str(tmp_path / 'cache.db'), rules = {'files/read': None})
+    response = lambda i: {'success': True, 'files': [{'name': f'file{i}.py'}]}
+    size = cache.put(0, 'files/read', {'projectId': 0}, response(0)) and cache.info()['size']
+    cache.max_size = 3 * size
+
+    for i in range(1, 3):
+        now[0] += 1
+        cache.put(0, 'files/read', {'projectId': i}, response(i))
+    now[0] += 1
+    assert cache.get(0, 'files/read', {'projectId': 0}) == response(0)
+    now[0] += 1
+    cache.put(0, 'files/read', {'projectId': 3}, response(3))
+
+    assert cache.info()['entries'] == 3
+    assert cache.get(0, 'files/read', {'projectId': 1}) is None
+    assert cache.get(0, 'files/read', {'projectId': 0}) == response(0)
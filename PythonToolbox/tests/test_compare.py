@@ -0,0 +1,78 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean Algorithmic Trading Engine v2.0. Copyright 2014 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+from pandas.testing import assert_frame_equal
+from quantconnect.api import Api
+from quantconnect.compare import compare_backtests, compare_equity, parse_statistic, summarize_backtest
+from tests.local_server import LocalServer
+from tests.synthetic_result import synthetic_backtest
+
+def read_backtest(params, headers):
+    if params['backtestId'] == 'missing':
+        return 404, b'', {}
+    i = int(params['backtestId'][2:])
+    json = synthetic_backtest(orders = 10 * i, points = 100 * i, seed = i)
+    json['name'] = f'Sweep {i}'
+    json['result']['Statistics']['Broker'] = 'IB' if i % 2 else 'GDAX'
+    return json
+
+def test_parse_statistic():
+    assert parse_statistic('1.2') == 1.2
+    assert parse_statistic('-5.3%') == -5.3
+    assert parse_statistic('$100,000.00') == 100000
+    assert parse_statistic('IB') == 'IB'
+    assert parse_statistic(None) is None
+
+def test_compare_backtests():
+    summaries = { f'id{i}': summarize_backtest(read_backtest({'backtestId': f'id{i}'}, {})) for i in range(1, 4) }
+    summaries['failed'] = summarize_backtest({'success': False})
+    statistics = compare_backtests(summaries)
+
+    assert statistics.index.name == 'backtestId'
+    assert statistics.index.tolist() == ['id1', 'id2', 'id3']
+    assert statistics['name'].tolist() == ['Sweep 1', 'Sweep 2', 'Sweep 3']
+    assert statistics['Total Trades'].tolist() == [10, 20, 30]
+    assert statistics['Drawdown'].dtype == np.float64
+    assert statistics['Broker'].dtype == 'category'
+    assert statistics.loc['id2', 'Drawdown'] == parse_statistic(read_backtest({'backtestId': 'id2'}, {})['result']['Statistics']['Drawdown'])
+
+def test_compare_equity():
+    summaries = { f'id{i}': summarize_backtest(read_backtest({'backtestId': f'id{i}'}, {})) for i in range(1, 4) }
+    summaries['failed'] = summarize_backtest({'success': False})
+    equity = compare_equity(summaries)
+
+    assert equity.columns.tolist() == ['id1', 'id2', 'id3']
+    assert (equity.dtypes == np.float64).all()
+    assert len(equity) == 300
+    assert equity['id1'].isnull().sum() == 0
+    assert equity['id1'].iloc[-1] == equity['id1'].iloc[99]
+    assert equity['id1'].iloc[99] == summaries['id1']['y'][-1]
+
+@pytest.mark.parametrize('processes', [0, 2])
+def test_read_backtests(processes):
+    ids = ['id1', 'missing', 'id2', 'id3']
+    requests = []
+    def handler(params, headers):
+        requests.append(params['backtestId'])
+        return read_backtest(params, headers)
+
+    with LocalServer({'backtests/read': handler}) as server:
+        with Api(0, 'token', url = server.url) as api:
+            statistics, equity = api.read_backtests(1, ids, max_workers = 4, processes = processes)
+
+    summaries = { x: summarize_backtest(read_backtest({'backtestId': x}, {})) for x in ['id1', 'id2', 'id3'] }
+    assert_frame_equal(statistics, compare_backtests(summaries))
+    assert_frame_equal(equity, compare_equity(summaries))
+    assert sorted(requests) == sorted(ids)
@@ -0,0 +1,158 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean Algorithmic Trading Engine v2.0. Copyright 2014 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gzip
+import os
+import pytest
+from datetime import datetime
+from io import BytesIO
+from zipfile import ZipFile, ZipInfo
+from quantconnect.api import Api, adapt_chunk_size, DOWNLOAD_CHUNK_SIZE, MAX_DOWNLOAD_CHUNK_SIZE, MIN_DOWNLOAD_CHUNK_SIZE
+from tests.local_server import LocalServer
+
+def make_zip(name):
+    buffer = BytesIO()
+    with ZipFile(buffer, 'w') as zip:
+        zip.writestr(ZipInfo(f'{name}.csv', (2020, 1, 1, 0, 0, 0)), '\n'.join(f'{i},1,2,3,4,100' for i in range(1000)))
+    return buffer.getvalue()
+
+class DataServer(LocalServer):
+    '''Serves data links and zip files, honoring range requests'''
+    def __init__(self):
+        super().__init__({'data/read': self.read_data_link, 'files': self.read_file})
+        self.files = {}
+        self.encoded = set()
+
+    def read_data_link(self, params, headers):
+        name = f"{params['ticker']}_{params['date']}"
+        if params['date'] == '20200103':
+            return {'success': False, 'errors': ['No data']}
+        self.files[name] = make_zip(name)
+        return {'success': True, 'link': f'{self.url}files?name={name}'}
+
+    def read_file(self, params, headers):
+        content = self.files[params['name']]
+        range = headers.get('Range')
+        if range is None:
+            if params['name'] in self.encoded:
+                return 200, gzip.compress(content), {'Content-Encoding': 'gzip'}
+            return 200, content, {}
+        start = int(range[len('bytes='):-1])
+        return 206, content[start:], {'Content-Range': f'bytes {start}-{len(content) - 1}/{len(content)}'}
+
+@pytest.fixture
+def server():
+    with DataServer() as server:
+        yield server
+
+def test_downloads_into_lean_data_folder(server, tmp_path):
+    with Api(0, 'token', url = server.url) as api:
+        result = api.download_data_range(['SPY', 'AAPL'], 'Equity', 'USA', 'Minute',
+                                         datetime(2020, 1, 1), datetime(2020, 1, 6), str(tmp_path))
+
+    # 2020-01-04 and 2020-01-05 are a weekend
+    assert len(result) == 8
+    path = tmp_path / 'equity' / 'usa' / 'minute' / 'spy' / '20200102_trade.zip'
+    assert result[str(path)]
+    assert path.read_bytes() == server.files['spy_20200102']
+    assert not result[str(tmp_path / 'equity' / 'usa' / 'minute' / 'aapl' / '20200103_trade.zip')]
+
+def test_daily_data_is_downloaded_once_per_symbol(server, tmp_path):
+    with Api(0, 'token', url = server.url) as api:
+        result = api.download_data_range(['SPY'], 'Equity', 'USA', 'Daily',
+                                         datetime(2019, 1, 1), datetime(2020, 1, 6), str(tmp_path))
+
+    assert list(result) == [str(tmp_path / 'equity' / 'usa' / 'daily' / 'spy.zip')]
+
+def test_existing_files_are_skipped(server, tmp_path):
+    with Api(0, 'token', url = server.url) as api:
+        api.download_data_range(['SPY'], 'Equity', 'USA', 'Minute', datetime(2020, 1, 1), datetime(2020, 1, 2), str(tmp_path))
+        requests = len(server.requests)
+        result = api.download_data_range(['SPY'], 'Equity', 'USA', 'Minute', datetime(2020, 1, 1), datetime(2020, 1, 2), str(tmp_path))
+
+    assert all(result.values())
+    assert len(server.requests) == requests
+
+def test_existing_corrupt_files_are_downloaded_again(server, tmp_path):
+    path = tmp_path / 'equity' / 'usa' / 'minute' / 'spy' / '20200102_trade.zip'
+    path.parent.mkdir(parents = True)
+    content = bytearray(make_zip('spy_20200102'))
+    # The central directory is intact, but the data of the member no longer matches its CRC
+    content[100] ^= 0xFF
+    path.write_bytes(bytes(content))
+
+    with Api(0, 'token', url = server.url) as api:
+        result = api.download_data_range(['SPY'], 'Equity', 'USA', 'Minute', datetime(2020, 1, 2), datetime(2020, 1, 2), str(tmp_path))
+
+    assert result[str(path)]
+    assert path.read_bytes() == server.files['spy_20200102']
+
+def test_partial_downloads_are_resumed(server, tmp_path):
+    path = tmp_path / 'equity' / 'usa' / 'minute' / 'spy' / '20200102_trade.zip'
+    path.parent.mkdir(parents = True)
+    content = make_zip('spy_20200102')
+    (path.parent / (path.name + '.part')).write_bytes(content[:100])
+
+    with Api(0, 'token', url = server.url) as api:
+        assert all(api.download_data_range(['SPY'], 'Equity', 'USA', 'Minute',
+                                           datetime(2020, 1, 2), datetime(2020, 1, 2), str(tmp_path)).values())
+
+    assert path.read_bytes() == content
+    assert not os.path.exists(str(path) + '.part')
+    ranges = [headers.get('Range') for _, path, _, headers in server.requests if path == '/files']
+    assert ranges == ['bytes=100-']
+
+def test_corrupt_partial_downloads_are_downloaded_again(server, tmp_path):
+    path = tmp_path / 'spy.zip'
+    content = make_zip('spy_20200102')
+    (tmp_path / 'spy.zip.part').write_bytes(b'x' * 100)
+
+    with Api(0, 'token', url = server.url) as api:
+        assert api.download_data('SPY', 'Equity', 'USA', 'Minute', datetime(2020, 1, 2), str(tmp_path / 'spy'))
+
+    assert path.read_bytes() == content
+    ranges = [headers.get('Range') for _, path, _, headers in server.requests if path == '/files']
+    assert ranges == ['bytes=100-', None]
+
+def test_failed_downloads_leave_no_file(server, tmp_path):
+    server.routes['files'] = lambda params, headers: (500, b'error', {})
+    with Api(0, 'token', url = server.url, max_retries = 0) as api:
+        assert not api.download_data('SPY', 'Equity', 'USA', 'Minute', datetime(2020, 1, 2), str(tmp_path / 'spy'))
+
+    assert os.listdir(str(tmp_path)) == []
+
+def test_download_progress_is_reported(server, tmp_path):
+    calls = []
+    with Api(0, 'token', url = server.url) as api:
+        api.download_data('SPY', 'Equity', 'USA', 'Minute', datetime(2020, 1, 2), str(tmp_path / 'spy'),
+                          progress = lambda *args: calls.append(args))
+
+    size = len(server.files['spy_20200102'])
+    assert calls[-1][:3] == (str(tmp_path / 'spy.zip'), size, size)
+    assert calls[-1][3] > 0
+
+def test_chunk_size_adapts_to_throughput():
+    assert adapt_chunk_size(DOWNLOAD_CHUNK_SIZE, DOWNLOAD_CHUNK_SIZE, 0.01) == 2 * DOWNLOAD_CHUNK_SIZE
+    assert adapt_chunk_size(DOWNLOAD_CHUNK_SIZE, DOWNLOAD_CHUNK_SIZE, 1) == DOWNLOAD_CHUNK_SIZE // 2
+    assert adapt_chunk_size(DOWNLOAD_CHUNK_SIZE, 100, 0.01) == DOWNLOAD_CHUNK_SIZE
+    assert adapt_chunk_size(MAX_DOWNLOAD_CHUNK_SIZE, MAX_DOWNLOAD_CHUNK_SIZE, 0.01) == MAX_DOWNLOAD_CHUNK_SIZE
+    assert adapt_chunk_size(MIN_DOWNLOAD_CHUNK_SIZE, MIN_DOWNLOAD_CHUNK_SIZE, 10) == MIN_DOWNLOAD_CHUNK_SIZE
+
+def test_encoded_files_are_decoded(server, tmp_path):
+    server.encoded.add('spy_20200102')
+    with Api(0, 'token', url = server.url) as api:
+        result = api.download_data_range(['SPY'], 'Equity', 'USA', 'Minute', datetime(2020, 1, 1), datetime(2020, 1, 2), str(tmp_path))
+
+    path = tmp_path / 'equity' / 'usa' / 'minute' / 'spy' / '20200102_trade.zip'
+    assert result[str(path)]
+    assert path.read_bytes() == server.files['spy_20200102']
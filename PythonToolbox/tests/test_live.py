@@ -0,0 +1,109 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean Algorithmic Trading Engine v2.0. Copyright 2014 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+from copy import deepcopy
+from datetime import datetime
+from itertools import islice
+from quantconnect.api import Api
+from quantconnect.live import LiveResultDelta
+from tests.local_server import LocalServer
+from tests.synthetic_result import synthetic_backtest
+
+def live_snapshot(orders, points):
+    '''Live result json with the first orders and chart points of the same synthetic backtest'''
+    json = synthetic_backtest(orders = 20, points = 100, trades = 0)
+    results = json.pop('result')
+    results['Orders'] = list(results['Orders'].values())[:orders]
+    for chart in results['Charts'].values():
+        for series in chart['Series'].values():
+            series['Values'] = [x for x in series['Values'] if x['x'] < 1420209000 + points * 60]
+    return {'success': True, 'status': 'Running', 'LiveResults': {'results': results}}
+
+def test_live_result_delta_has_only_new_orders_and_points():
+    delta = LiveResultDelta()
+    first = delta.update(live_snapshot(5, 10))['LiveResults']['results']
+    assert len(first['Orders']) == 5
+    assert len(first['Charts']['Strategy Equity']['Series']['Equity']['Values']) == 10
+
+    snapshot = live_snapshot(8, 15)
+    snapshot['LiveResults']['results']['Orders'][0]['Status'] = 5
+    second = delta.update(snapshot)['LiveResults']['results']
+    assert [x['Id'] for x in second['Orders']] == [1, 6, 7, 8]
+    assert [x['x'] for x in second['Charts']['Strategy Equity']['Series']['Equity']['Values']] == \
+        [1420209000 + i * 60 for i in range(10, 15)]
+    assert second['Statistics'] == first['Statistics']
+
+    third = delta.update(deepcopy(snapshot))['LiveResults']['results']
+    assert third['Orders'] == []
+    assert third['Charts'] == {}
+
+def test_tail_live_algorithm_yields_result_deltas():
+    snapshots = iter([live_snapshot(5, 10), {'success': False}, live_snapshot(7, 20)])
+    with LocalServer({'live/read': lambda params, headers: next(snapshots)}) as server:
+        with Api(0, 'token', url = server.url) as api:
+            first, second = islice(api.tail_live_algorithm(1, 'L-1', interval = 0), 2)
+
+    assert first.LiveMode
+    assert first.Orders.index.tolist() == [1, 2, 3, 4, 5]
+    assert second.Orders.index.tolist() == [6, 7]
+    assert len(first.Charts['Strategy Equity']) == 10
+    assert len(second.Charts['Strategy Equity']) == 10
+    assert second.Charts['Strategy Equity'].index[0] > first.Charts['Strategy Equity'].index[-1]
+
+def test_tail_live_logs_reads_and_appends_only_new_logs(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    logs = iter([['a', 'b'], ['b', 'c', 'd'], ['d'], ['e']])
+    with LocalServer({'live/read/log': lambda params, headers: {'success': True, 'LiveLogs': next(logs)}}) as server:
+        with Api(0, 'token', url = server.url) as api:
+            assert list(islice(api.tail_live_logs(1, 'L-1', interval = 0, save = True), 4)) == [['a', 'b'], ['c', 'd'], [], ['e']]
+
+        starts = [float(params['start']) for _, _, params, _ in server.requests]
+        ends = [float(params['end']) for _, _, params, _ in server.requests]
+        assert starts[0] == 0
+        assert starts[1:] == ends[:-1]
+
+    with open(tmp_path / 'L-1.txt') as fp:
+        assert fp.read() == 'a\nb\nc\nd\ne\n'
+
+def test_tail_live_logs_skips_every_log_already_emitted():
+    logs = iter([
+        ['2020-01-02 10:00:00 a', '2020-01-02 10:00:01 b'],
+        ['2020-01-02 10:00:01 b', '2020-01-02 10:00:01 c'],
+        ['2020-01-02 10:00:00 a', '2020-01-02 10:00:01 b', '2020-01-02 10:00:01 c', '2020-01-02 10:00:02 d'],
+        ['2020-01-02 10:00:02 d', '2020-01-02 10:00:03 b'] ])
+    with LocalServer({'live/read/log': lambda params, headers: {'success': True, 'LiveLogs': next(logs)}}) as server:
+        with Api(0, 'token', url = server.url) as api:
+            assert list(islice(api.tail_live_logs(1, 'L-1', interval = 0), 4)) == [
+                ['2020-01-02 10:00:00 a', '2020-01-02 10:00:01 b'],
+                ['2020-01-02 10:00:01 c'],
+                ['2020-01-02 10:00:02 d'],
+                ['2020-01-02 10:00:03 b'] ]
+
+def test_live_logs_windows_are_utc_timestamps_whatever_the_local_time_zone(monkeypatch):
+    monkeypatch.setenv('TZ', 'America/New_York')
+    time.tzset()
+    try:
+        with LocalServer({'live/read/log': lambda params, headers: {'success': True, 'LiveLogs': []}}) as server:
+            with Api(0, 'token', url = server.url) as api:
+                api.read_live_logs(1, 'L-1', datetime(2020, 1, 2), datetime(2020, 1, 3))
+                now = time.time()
+                next(api.tail_live_logs(1, 'L-1', datetime(2020, 1, 2), interval = 0))
+
+        params = [params for _, _, params, _ in server.requests]
+        assert [float(params[0]['start']), float(params[0]['end'])] == [1577923200, 1578009600]
+        assert float(params[1]['start']) == 1577923200
+        assert abs(float(params[1]['end']) - now) < 60
+    finally:
+        monkeypatch.undo()
+        time.tzset()
@@ -0,0 +1,125 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean Algorithmic Trading Engine v2.0. Copyright 2014 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pandas as pd
+import pytest
+from copy import deepcopy
+from datetime import datetime
+from pandas.testing import assert_frame_equal
+from quantconnect.Result import Result
+from tests.synthetic_result import synthetic_backtest
+
+def test_statistics_are_read_without_creating_tables():
+    result = Result(synthetic_backtest(orders = 10))
+    assert result.Statistics.TotalTrades == '10'
+    assert 'Orders' not in result.Information
+    assert result.Information.name == 'Synthetic'
+    assert not result._Result__tables
+
+def test_tables_are_created_once():
+    result = Result(synthetic_backtest(orders = 10))
+    assert result.Orders is result.Orders
+    assert list(result._Result__tables) == ['Orders']
+
+def test_order_table():
+    orders = Result(synthetic_backtest(orders = 100)).Orders
+
+    assert len(orders) == 100
+    assert orders.loc[3, 'Time'] == datetime(2015, 1, 2, 14, 52, 0, 123000)
+    assert orders.loc[1, 'Time'] == datetime(2015, 1, 2, 14, 38)
+    assert orders.loc[1, 'Symbol'] == 'AAPL R735QTJ8XC9X'
+    assert orders.loc[1, 'Type'] == 'Limit'
+    assert orders.loc[1, 'Direction'] == 'Sell'
+    assert orders.loc[1, 'Status'] == 'Filled'
+    assert orders.loc[50, 'Status'] == 'Canceled'
+    assert orders.loc[1, 'SecurityType'] == 'Equity'
+    assert pd.isnull(orders.loc[1, 'CanceledTime'])
+    assert 'LastUpdateTime' not in orders.columns
+    assert 'BrokerId' not in orders.columns
+
+def test_live_order_table():
+    json = synthetic_backtest(orders = 10)
+    result = json.pop('result')
+    result['Orders'] = [dict(x, DeployId = 'L-1') for x in result['Orders'].values()]
+    orders = Result({'LiveResults': {'results': result}}).Orders
+
+    assert len(orders) == 10
+    assert (orders['DeployId'] == 'L-1').all()
+
+def test_closed_trades_table():
+    trades = Result(synthetic_backtest(orders = 10)).ClosedTrades
+
+    assert len(trades) == 5
+    assert trades.index[0] == datetime(2015, 1, 2, 14, 31)
+    assert (trades['Duration'] == pd.Timedelta(minutes = 30)).all()
+
+def test_charts_table():
+    charts = Result(synthetic_backtest(points = 100)).Charts
+
+    assert list(charts['Strategy Equity'].columns) == ['Equity', 'Daily Performance']
+    assert len(charts['Strategy Equity']) == 100
+    assert not charts['Strategy Equity'].isnull().any().any()
+    assert charts['Benchmark'].index.name == 'time'
+    assert charts['Benchmark'].index[0] == datetime(2015, 1, 2, 14, 30)
+
+def test_profit_loss_and_rolling_window_tables():
+    result = Result(synthetic_backtest(orders = 10))
+
+    assert result.ProfitLoss['profit_loss'].tolist() == [0, 1.5, 3, 4.5, 6]
+    assert result.ProfitLoss.index[1] == datetime(2015, 1, 2, 15, 1)
+    assert len(result.RollingWindow) == 13
+    assert result.RollingWindow.loc['TotalPerformance', 'TotalNumberOfTrades'] == 5
+
+def test_saved_result_is_loaded_lazily(tmp_path):
+    pytest.importorskip('pyarrow')
+    json = synthetic_backtest(orders = 100, points = 100)
+    expected = Result(deepcopy(json))
+    expected.save(str(tmp_path))
+    result = Result.load(str(tmp_path))
+
+    assert not result._Result__tables
+    assert result.Statistics == expected.Statistics
+    assert result.RuntimeStatistics.Equity == '$100,000.00'
+    assert result.Information.name == 'Synthetic'
+    assert_frame_equal(result.Orders, expected.Orders, check_dtype = False, check_categorical = False)
+    assert_frame_equal(result.ClosedTrades, expected.ClosedTrades, check_dtype = False, check_categorical = False)
+    assert_frame_equal(result.ProfitLoss, expected.ProfitLoss, check_dtype = False)
+    assert_frame_equal(result.RollingWindow, expected.RollingWindow, check_dtype = False)
+    assert list(result.Charts) == list(expected.Charts)
+    for name, chart in expected.Charts.items():
+        assert (result.Charts[name].values == chart.values).all()
+        assert (result.Charts[name].index == chart.index).all()
+
+def test_saved_result_has_compact_columns(tmp_path):
+    pytest.importorskip('pyarrow')
+    result = Result(synthetic_backtest(orders = 100))
+    result.save(str(tmp_path))
+    loaded = Result.load(str(tmp_path))
+
+    assert loaded.Orders['Symbol'].dtype == 'category'
+    assert loaded.Orders['Status'].dtype == 'category'
+    assert loaded.ClosedTrades['Quantity'].dtype == np.float32
+    assert loaded.ClosedTrades['Duration'].dtype == result.ClosedTrades['Duration'].dtype
+    assert loaded.Charts['Strategy Equity']['Equity'].dtype == np.float64
+
+def test_saved_live_result_without_tables(tmp_path):
+    pytest.importorskip('pyarrow')
+    Result({'LiveResults': {'status': 'Running', 'results': {'Statistics': {'Drawdown': '1%'}}}}).save(str(tmp_path))
+    result = Result.load(str(tmp_path))
+
+    assert result.LiveMode
+    assert result.Information.status == 'Running'
+    assert result.Statistics.Drawdown == '1%'
+    assert result.Orders is None
+    assert result.Charts is None
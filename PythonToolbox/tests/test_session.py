@@ -0,0 +1,112 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean Algorithmic Trading Engine v2.0. Copyright 2014 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from time import sleep
+from quantconnect.api import Api, AsyncApi
+from tests.local_server import LocalServer
+
+def read_backtest(params, headers):
+    return {'success': True, 'backtestId': params['backtestId'], 'progress': 1}
+
+def test_requests_reuse_the_same_connection():
+    with LocalServer({'backtests/read': read_backtest}) as server:
+        with Api(0, 'token', url = server.url) as api:
+            for i in range(5):
+                assert api.read_backtest(1, f'id{i}')['backtestId'] == f'id{i}'
+
+        assert len(server.requests) == 5
+        assert len(server.connections) == 1
+
+def test_requests_are_authenticated():
+    with LocalServer({'authenticate': lambda params, headers: {'success': True}}) as server:
+        with Api(0, 'token', url = server.url) as api:
+            assert api.connected()
+            assert api.connected()
+
+        first, second = [headers for _, _, _, headers in server.requests]
+        assert first['Authorization'].startswith('Basic ')
+        assert 'Timestamp' in second
+
+def test_get_requests_are_retried_on_server_errors():
+    calls = []
+    def flaky(params, headers):
+        calls.append(params)
+        if len(calls) < 3:
+            return 503, b'', {}
+        return {'success': True, 'backtests': []}
+
+    with LocalServer({'backtests/read': flaky}) as server:
+        with Api(0, 'token', url = server.url, max_retries = 3, backoff_factor = 0) as api:
+            assert api.list_backtests(1)['success']
+        assert len(calls) == 3
+
+def test_post_requests_are_not_retried():
+    calls = []
+    def failing(params, headers):
+        calls.append(params)
+        return 503, b'', {}
+
+    with LocalServer({'projects/create': failing}) as server:
+        with Api(0, 'token', url = server.url, backoff_factor = 0) as api:
+            assert not api.create_project('name', 'Py')['success']
+        assert len(calls) == 1
+
+def test_async_api_fans_out_requests():
+    with LocalServer({'backtests/read': read_backtest}) as server:
+        async def read_all(ids):
+            async with AsyncApi(0, 'token', pool_size = 4, url = server.url) as api:
+                return await asyncio.gather(*[api.read_backtest(1, x) for x in ids])
+
+        ids = [f'id{i}' for i in range(20)]
+        loop = asyncio.new_event_loop()
+        results = loop.run_until_complete(read_all(ids))
+        loop.close()
+
+        assert [x['backtestId'] for x in results] == ids
+        assert len(server.connections) <= 4
+
+def test_async_api_exit_does_not_block_the_event_loop():
+    def slow_read_backtest(params, headers):
+        sleep(0.3)
+        return read_backtest(params, headers)
+
+    with LocalServer({'backtests/read': slow_read_backtest}) as server:
+        ticks = []
+        async def tick():
+            while True:
+                ticks.append(None)
+                await asyncio.sleep(0.01)
+
+        async def exit_with_pending_request():
+            ticker = asyncio.ensure_future(tick())
+            async with AsyncApi(0, 'token', url = server.url) as api:
+                request = asyncio.ensure_future(api.read_backtest(1, 'id'))
+                await asyncio.sleep(0.05)
+                count = len(ticks)
+            # the exit waited for the pending request while the other task kept running
+            ticker.cancel()
+            return (await request)['backtestId'], len(ticks) - count
+
+        loop = asyncio.new_event_loop()
+        backtestId, ticks_during_exit = loop.run_until_complete(exit_with_pending_request())
+        loop.close()
+
+        assert backtestId == 'id'
+        assert ticks_during_exit > 5
+
+def test_async_api_exposes_api_endpoints():
+    api = AsyncApi(0, 'token')
+    assert asyncio.iscoroutinefunction(api.read_live_algorithm)
+    assert api.list_backtests.__doc__ == Api.list_backtests.__doc__
+    api.close()
@@ -0,0 +1,102 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean Algorithmic Trading Engine v2.0. Copyright 2014 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import pytest
+from copy import deepcopy
+from io import BytesIO
+from json import dumps
+from pandas.testing import assert_frame_equal
+from quantconnect.api import Api
+from quantconnect.Result import Result
+from quantconnect.stream import ANY, stream_json
+from tests.local_server import LocalServer
+from tests.synthetic_result import synthetic_backtest
+
+ijson = pytest.importorskip('ijson')
+
+def to_stream(json):
+    return BytesIO(dumps(json).encode('utf-8'))
+
+def assert_same_tables(actual, expected):
+    assert_frame_equal(actual.Orders, expected.Orders)
+    assert_frame_equal(actual.ClosedTrades, expected.ClosedTrades)
+    assert_frame_equal(actual.ProfitLoss, expected.ProfitLoss)
+    assert list(actual.Charts) == list(expected.Charts)
+    for name, chart in expected.Charts.items():
+        assert actual.Charts[name].equals(chart)
+
+def test_stream_json_routes_children_of_containers():
+    document = {'a': {'b': [1, {'c': 2}], 'd': {'x': {'v': [3, 4]}, 'y': {'v': []}}}, 'e': 'f'}
+    calls = []
+    routes = {
+        ('a', 'b'): lambda route, key, value: calls.append((route, key, value)),
+        ('a', 'd', ANY, 'v'): lambda route, key, value: calls.append((route, key, value)) }
+
+    skeleton = stream_json(to_stream(document), routes)
+
+    assert skeleton == {'a': {'b': [], 'd': {'x': {'v': []}, 'y': {'v': []}}}, 'e': 'f'}
+    assert calls == [
+        (('a', 'b'), None, 1),
+        (('a', 'b'), None, {'c': 2}),
+        (('a', 'd', 'x', 'v'), None, 3),
+        (('a', 'd', 'x', 'v'), None, 4)]
+
+def test_streamed_result_matches_parsed_result():
+    json = synthetic_backtest(orders = 250, points = 300)
+    result = Result.from_stream(to_stream(json), chunk_size = 100)
+    expected = Result(deepcopy(json))
+
+    assert result.Statistics == expected.Statistics
+    assert result.Information == expected.Information
+    assert_same_tables(result, expected)
+    assert result.RollingWindow.equals(expected.RollingWindow)
+
+def test_streamed_live_result_matches_parsed_result():
+    json = synthetic_backtest(orders = 30)
+    results = json.pop('result')
+    results['Orders'] = [dict(x, DeployId = 'L-1') for x in results['Orders'].values()]
+    json = {'LiveResults': {'results': results}}
+
+    result = Result.from_stream(to_stream(json), chunk_size = 7)
+
+    assert result.LiveMode
+    assert (result.Orders['DeployId'] == 'L-1').all()
+    assert_same_tables(result, Result(deepcopy(json)))
+
+def test_streamed_result_spills_tables_to_disk(tmp_path):
+    pytest.importorskip('pyarrow')
+    json = synthetic_backtest(orders = 250, points = 300)
+    result = Result.from_stream(to_stream(json), folder = str(tmp_path), chunk_size = 100)
+
+    assert not result._Result__tables
+    assert sorted(os.listdir(tmp_path)) == ['Charts', 'ClosedTrades.feather', 'Orders.feather', 'ProfitLoss.feather']
+    assert sorted(os.listdir(tmp_path / 'Charts')) == ['Benchmark.feather', 'Strategy%20Equity.feather']
+    assert_same_tables(result, Result(deepcopy(json)))
+
+def test_streamed_result_without_tables():
+    result = Result.from_stream(to_stream({'success': True, 'result': {'Statistics': {'Sharpe Ratio': '1'}}}))
+
+    assert result.Statistics.SharpeRatio == '1'
+    assert result.Orders is None
+    assert result.ProfitLoss is None
+    assert result.Charts is None
+
+def test_api_streams_backtest_results():
+    json = synthetic_backtest(orders = 20)
+    with LocalServer({'backtests/read': lambda params, headers: json}) as server:
+        with Api(0, 'token', url = server.url) as api:
+            result = api.read_backtest(1, 'id', stream = True)
+
+        assert server.requests[0][3]['Authorization'].startswith('Basic ')
+    assert_same_tables(result, Result(deepcopy(json)))
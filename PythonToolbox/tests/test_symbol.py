@@ -12,8 +12,9 @@
 # limitations under the License.
 
 import pytest
+import pandas as pd
 from datetime import datetime
-from quantconnect.symbol import Symbol
+from quantconnect.symbol import Symbol, decode_symbols
 
 # noinspection PyPep8
 spot_price_securities_cases = (
@@ -61,3 +62,36 @@ def test_option_securities(security_id, ticker, security_type, market, date_arg,
 
 def test_equal_symbols_are_equal():
     assert Symbol('SPY R735QTJ8XC9X') == Symbol('SPY R735QTJ8XC9X')
+
+
+def test_decode_symbols_matches_symbol():
+    security_ids = [x[0] for x in spot_price_securities_cases[1] + option_security_cases[1]]
+    decoded = decode_symbols(security_ids)
+
+    assert len(decoded) == len(security_ids)
+    for security_id, (_, row) in zip(security_ids, decoded.iterrows()):
+        symbol = Symbol(security_id)
+        assert row['Symbol'] == symbol.Symbol
+        assert row['SecurityType'] == symbol.SecurityType
+        assert row['Market'] == symbol.Market
+        if symbol.Date is None:
+            assert pd.isnull(row['Date'])
+        else:
+            assert row['Date'] == symbol.Date
+        if symbol.SecurityType == 'Option':
+            assert row['Underlying'] == symbol.Underlying.ID
+            assert row['OptionRight'] == symbol.OptionRight
+            assert row['OptionStyle'] == symbol.OptionStyle
+            assert row['StrikePrice'] == symbol.StrikePrice
+        else:
+            assert row[['Underlying', 'OptionRight', 'OptionStyle', 'StrikePrice']].isnull().all()
+
+def test_decode_symbols_keeps_the_index_and_missing_values():
+    security_ids = pd.Series(['SPY R735QTJ8XC9X', None, 'EURUSD 5O', 'SPY R735QTJ8XC9X'], index=[4, 3, 2, 1])
+    decoded = decode_symbols(security_ids)
+
+    assert decoded.index.tolist() == [4, 3, 2, 1]
+    assert decoded['Symbol'].tolist()[::2] == ['SPY', 'EURUSD']
+    assert decoded.loc[3].isnull().all()
+    assert decoded.loc[1].equals(decoded.loc[4])
+    assert decoded['SecurityType'].cat.categories.tolist()[:2] == ['Base', 'Equity']
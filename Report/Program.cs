@@ -14,9 +14,7 @@
 */
 
 using System;
-using System.Collections.Generic;
 using System.IO;
-using Newtonsoft.Json;
 using QuantConnect.Configuration;
 using QuantConnect.Logging;
 using QuantConnect.Packets;
@@ -42,30 +40,32 @@ namespace QuantConnect.Report
             var name = Config.Get("strategy-name");
             var description = Config.Get("strategy-description");
             var version = Config.Get("strategy-version");
+
+            // Generate the reports of many backtests in this process when given a batch source
+            var batchSource = Config.Get("report-batch-source");
+            if (batchSource != string.Empty)
+            {
+                var backtestFiles = ReportBatch.GetBacktestFiles(batchSource);
+                var workers = Config.GetInt("report-batch-workers", Environment.ProcessorCount);
+                var batch = new ReportBatch(name, description, version, workers);
+
+                batch.Run(backtestFiles, Config.Get("report-batch-destination"));
+                Log.Trace("QuantConnect.Report.Main(): Completed.");
+                return;
+            }
+
             var backtestDataFile = Config.Get("backtest-data-source-file");
             var liveDataFile = Config.Get("live-data-source-file");
             var destination = Config.Get("report-destination");
 
             // Parse content from source files into result objects
             Log.Trace($"QuantConnect.Report.Main(): Parsing source files...{backtestDataFile}, {liveDataFile}");
-            var backtestSettings = new JsonSerializerSettings
-            {
-                Converters = new List<JsonConverter> { new NullResultValueTypeJsonConverter<BacktestResult>() },
-                FloatParseHandling = FloatParseHandling.Decimal
-            };
-
-            var backtest = JsonConvert.DeserializeObject<BacktestResult>(File.ReadAllText(backtestDataFile), backtestSettings);
+            var backtest = ResultsUtil.ReadBacktestResult(backtestDataFile);
             LiveResult live = null;
 
             if (liveDataFile != string.Empty)
             {
-                var settings = new JsonSerializerSettings
-                {
-                    NullValueHandling = NullValueHandling.Ignore,
-                    Converters = new List<JsonConverter> { new NullResultValueTypeJsonConverter<LiveResult>() }
-                };
-
-                live = JsonConvert.DeserializeObject<LiveResult>(File.ReadAllText(liveDataFile), settings);
+                live = ResultsUtil.ReadLiveResult(liveDataFile);
             }
 
             //Create a new report
@@ -0,0 +1,272 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean Algorithmic Trading Engine v2.0. Copyright 2014 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pandas as pd
+
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+TRADING_DAYS_PER_YEAR = 252
+
+def to_series(data):
+    '''
+    Converts chart data to a float Series indexed by time
+    data: pandas Series indexed by time, [[time], [value]] or None
+    '''
+    if data is None:
+        return pd.Series([], index = pd.DatetimeIndex([]), dtype = float)
+    if isinstance(data, pd.Series):
+        return data.astype(float).dropna()
+    # Lists of the report generator are .NET lists, whose items are converted one by one
+    return pd.Series(np.asarray(list(data[1]), dtype = float), index = pd.DatetimeIndex(list(data[0]))).dropna()
+
+def to_lists(series):
+    '''
+    Converts a Series indexed by time to the [[time], [value]] lists taken by ReportCharts
+    '''
+    return [series.index.to_pydatetime().tolist(), series.values.tolist()]
+
+def rolling_moments(x, y, first, last):
+    '''
+    Means, sample variances and sample covariance of the pairs of values in each window, from running sums of the
+    values, of their squares and of their products, so that a window costs the same whatever its length. The moments
+    of a window holding a NaN or infinite value, or too few pairs, are NaN.
+    x: first values of the pairs
+    y: second values of the pairs, None for the moments of the first values only
+    first: position of the first pair of each window
+    last: position after the last pair of each window
+    Returns the count, mean_x, mean_y, variance_x, variance_y and covariance arrays, with one value per window
+    '''
+    x = np.asarray(x, dtype = float)
+    y = np.zeros(len(x)) if y is None else np.asarray(y, dtype = float)
+    first = np.asarray(first)
+    last = np.asarray(last)
+    finite = np.isfinite(x) & np.isfinite(y)
+
+    # Sums are taken around the overall means so that the squares of small deviations keep their precision
+    center_x = x[finite].mean() if finite.any() else 0
+    center_y = y[finite].mean() if finite.any() else 0
+    x = np.where(finite, x - center_x, 0)
+    y = np.where(finite, y - center_y, 0)
+
+    def window_sums(values):
+        sums = np.concatenate([[0], np.cumsum(values)])
+        return sums[last] - sums[first]
+
+    count = (last - first).astype(float)
+    finite_windows = window_sums(~finite) == 0
+    sum_x = window_sums(x)
+    sum_y = window_sums(y)
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
+        mean_x = np.where(finite_windows & (count > 0), sum_x / count + center_x, np.nan)
+        mean_y = np.where(finite_windows & (count > 0), sum_y / count + center_y, np.nan)
+        comoments = np.array([window_sums(x * x) - sum_x * sum_x / count,
+                              window_sums(y * y) - sum_y * sum_y / count,
+                              window_sums(x * y) - sum_x * sum_y / count]) / (count - 1)
+    variance_x, variance_y, covariance = np.where(finite_windows & (count > 1), comoments, np.nan)
+    return count, mean_x, mean_y, np.maximum(variance_x, 0), np.maximum(variance_y, 0), covariance
+
+class ReportAggregates:
+    '''
+    Aggregates of an equity curve and of its benchmark consumed by the report charts: daily, monthly, annual and
+    cumulative returns, drawdown, rolling beta and rolling Sharpe ratio. They are computed with vectorized operations
+    from intermediate series (daily values, daily returns, monthly periods) that are computed once on first use and
+    shared by every aggregate. They are not persisted between reports: recomputing them is faster than loading,
+    comparing and saving them, and the chart cache already skips the charts whose data did not change.
+    '''
+
+    def __init__(self, equity = None, benchmark = None):
+        '''
+        equity: equity curve, as a pandas Series indexed by time or [[time], [value]], sorted by time
+        benchmark: benchmark prices, in the same format
+        '''
+        self.equity = to_series(equity)
+        self.benchmark = to_series(benchmark)
+        self.__cache = {}
+
+    def __cached(self, key, compute):
+        '''Value of an intermediate series, computed on first use'''
+        if key not in self.__cache:
+            self.__cache[key] = compute()
+        return self.__cache[key]
+
+    def __daily(self, series):
+        '''Last value of each day'''
+        return series.groupby(series.index.normalize()).last()
+
+    def DailyEquity(self):
+        '''Last equity value of each day'''
+        return self.__cached('daily_equity', lambda: self.__daily(self.equity))
+
+    def DailyBenchmark(self):
+        '''Last benchmark value of each day'''
+        return self.__cached('daily_benchmark', lambda: self.__daily(self.benchmark))
+
+    def DailyReturns(self):
+        '''Daily returns as fractions, i.e. 1% is 0.01'''
+        return self.__cached('daily_returns', lambda: self.DailyEquity().pct_change().dropna())
+
+    def __month_values(self, series):
+        '''
+        Months of a series with their first and last values and their number of values, from the positions where the
+        month changes
+        '''
+        index = series.index
+        values = series.values
+        month = np.asarray(index.year * 12 + index.month - 1)
+        if len(month) == 0:
+            return month, values, values, month
+        starts = np.concatenate([[0], np.flatnonzero(np.diff(month)) + 1])
+        ends = np.concatenate([starts[1:] - 1, [len(month) - 1]])
+        return month[starts], values[starts], values[ends], ends - starts + 1
+
+    def __months(self):
+        '''First and last equity values and number of equity values of each month'''
+        return self.__cached('months', lambda: self.__month_values(self.equity))
+
+    def MonthlyReturns(self):
+        '''
+        Monthly returns in percent as a DataFrame with one row per year and one column per month, NaN for months
+        without data. The return of a month goes from its first to its last equity value, like DeedleUtil.TotalReturns
+        it is NaN for a month with a single value.
+        '''
+        def compute():
+            month, first, last, count = self.__months()
+            with np.errstate(divide = 'ignore', invalid = 'ignore'):
+                returns = (last / first - 1) * 100
+            returns[~np.isfinite(returns) | (count < 2)] = np.nan
+            years = np.unique(month // 12)
+            table = np.full((len(years), 12), np.nan)
+            table[np.searchsorted(years, month // 12), month % 12] = returns
+            return pd.DataFrame(table, index = [str(year) for year in years], columns = MONTHS)
+        return self.__cached('monthly_returns', compute)
+
+    def MonthlyReturnsDictionary(self):
+        '''Monthly returns in the format of ReportCharts.GetMonthlyReturns, i.e. lists of 12 percentages keyed by year'''
+        return {year: values.tolist() for year, values in self.MonthlyReturns().iterrows()}
+
+    def AnnualReturns(self):
+        '''
+        Annual returns in percent indexed by year, from the first to the last equity value of the year. Years with a
+        single value are left out
+        '''
+        def compute():
+            month, first, last, count = self.__months()
+            year = month // 12
+            if len(year) == 0:
+                return pd.Series([], index = pd.Index([], dtype = int), dtype = float)
+            starts = np.concatenate([[0], np.flatnonzero(np.diff(year)) + 1])
+            ends = np.concatenate([starts[1:] - 1, [len(year) - 1]])
+            with np.errstate(divide = 'ignore', invalid = 'ignore'):
+                returns = (last[ends] / first[starts] - 1) * 100
+            returns[np.add.reduceat(count, starts) < 2] = np.nan
+            return pd.Series(returns, index = year[starts]).replace([np.inf, -np.inf], np.nan).dropna()
+        return self.__cached('annual_returns', compute)
+
+    def CumulativeReturns(self):
+        '''Cumulative returns of the equity in percent'''
+        return self.__cached('cumulative_returns', lambda: self.__cumulative(self.equity))
+
+    def CumulativeBenchmarkReturns(self):
+        '''Cumulative returns of the benchmark in percent'''
+        return self.__cached('cumulative_benchmark_returns', lambda: self.__cumulative(self.benchmark))
+
+    def __cumulative(self, series):
+        '''Returns from the first value'''
+        if len(series) == 0:
+            return series
+        return (series / series.iloc[0] - 1) * 100
+
+    def Drawdown(self):
+        '''Drawdown from the running maximum of the equity as fractions, i.e. -10% is -0.1'''
+        return self.__cached('drawdown', lambda: self.equity / self.equity.cummax() - 1)
+
+    def RollingBeta(self, window = 22 * 6):
+        '''
+        Beta of the daily returns over a rolling number of days, as computed by Rolling.Beta: to the cumulative daily
+        returns of the benchmark on the days of the daily returns, and carried forward while it is undefined
+        window: number of days of the rolling window
+        '''
+        return self.__cached(('rolling_beta', window), lambda: self.__rolling_beta(window).ffill().dropna())
+
+    def __rolling_beta(self, window):
+        '''Rolling beta of every window, NaN where undefined'''
+        benchmark = self.DailyBenchmark().pct_change().iloc[1:]
+        benchmark = (benchmark[~np.isinf(benchmark.values)] + 1).cumprod() - 1
+        returns = self.DailyReturns().rename('strategy').to_frame().join(benchmark.rename('benchmark'))
+        returns = returns.ffill().dropna()
+        last = np.arange(1, len(returns) + 1)
+        first = last - window
+        windows = first >= 0
+        _, _, _, _, variance, covariance = rolling_moments(returns['strategy'].values, returns['benchmark'].values,
+                                                           first[windows], last[windows])
+        with np.errstate(divide = 'ignore', invalid = 'ignore'):
+            beta = np.where(variance > 0, covariance / variance, np.nan)
+        return pd.Series(beta, index = returns.index[windows])
+
+    def RollingSharpe(self, months = 6, risk_free_rate = 0.0):
+        '''
+        Annualized Sharpe ratio of the daily returns between each day and the same day a number of months before,
+        starting once that many months of equity are available
+        months: number of months of the rolling window
+        risk_free_rate: annual risk free rate
+        '''
+        return self.__cached(('rolling_sharpe', months, risk_free_rate),
+                             lambda: self.__rolling_sharpe(months, risk_free_rate))
+
+    def __rolling_sharpe(self, months, risk_free_rate):
+        '''Rolling Sharpe ratio of every window'''
+        returns = self.DailyReturns()
+        if len(returns) < 2:
+            return pd.Series([], index = pd.DatetimeIndex([]), dtype = float)
+
+        starts = returns.index - pd.DateOffset(months = months)
+        windows = np.asarray(starts >= self.equity.index[0].normalize())
+        first = np.searchsorted(returns.index.values, starts.values)
+        last = np.arange(1, len(returns) + 1)
+
+        _, mean, _, variance, _, _ = rolling_moments(returns.values, None, first[windows], last[windows])
+        with np.errstate(divide = 'ignore', invalid = 'ignore'):
+            sharpe = ((mean + 1) ** TRADING_DAYS_PER_YEAR - 1 - risk_free_rate) / \
+                np.sqrt(variance * TRADING_DAYS_PER_YEAR)
+        sharpe = pd.Series(sharpe, index = returns.index[windows])
+        return sharpe.replace([np.inf, -np.inf], np.nan).dropna()
+
+    def ChartData(self, name = None):
+        '''
+        Data argument of each ReportCharts method keyed by the method name, e.g.
+        charts.GetDrawdown(backtest['GetDrawdown'], live['GetDrawdown'], worst)
+        name: name of a ReportCharts method to get the data argument of that method only
+        '''
+        def times():
+            # The times of the equity are converted once for the cumulative returns and the drawdown
+            return self.__cached('time', lambda: self.equity.index.to_pydatetime().tolist())
+
+        def benchmark_times():
+            return self.__cached('benchmark_time', lambda: self.benchmark.index.to_pydatetime().tolist())
+
+        def annual_returns():
+            annual = self.AnnualReturns()
+            return [annual.index.tolist(), annual.values.tolist()]
+
+        charts = {
+            'GetCumulativeReturns': lambda: [times(), self.CumulativeReturns().values.tolist(),
+                                             benchmark_times(), self.CumulativeBenchmarkReturns().values.tolist()],
+            'GetDailyReturns': lambda: to_lists(self.DailyReturns() * 100),
+            'GetMonthlyReturns': self.MonthlyReturnsDictionary,
+            'GetAnnualReturns': annual_returns,
+            'GetDrawdown': lambda: [times(), self.Drawdown().values.tolist()],
+            'GetRollingBeta': lambda: to_lists(self.RollingBeta(22 * 6)) + to_lists(self.RollingBeta(252)),
+            'GetRollingSharpeRatio': lambda: to_lists(self.RollingSharpe()) }
+        if name is not None:
+            return charts[name]()
+        return {name: data() for name, data in charts.items()}
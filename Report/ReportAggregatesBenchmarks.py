@@ -0,0 +1,88 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean Algorithmic Trading Engine v2.0. Copyright 2014 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Benchmarks the rolling statistics of ReportAggregates on a 10 year daily series and a 2 year minute series:
+# the rolling beta and Sharpe ratio charts, then rolling moments over windows of 6 months of points computed
+# from running sums, with pandas rolling windows and by recomputing each window.
+# You can run this benchmark like the tests, by first running `nPython.exe` (with mono or otherwise):
+# $ ./nPython.exe ReportAggregatesBenchmarks.py
+
+import numpy as np
+import pandas as pd
+from time import perf_counter
+from ReportAggregates import ReportAggregates, rolling_moments
+
+def random_series(start, periods, freq, seed):
+    '''Random walk of an equity curve'''
+    np.random.seed(seed)
+    time = pd.date_range(start, periods = periods, freq = freq)
+    return pd.Series(100000 * np.cumprod(1 + np.random.normal(0.00002, 0.001, periods)), index = time)
+
+def best_time(function, repeat = 3):
+    '''Best wall time of calling the function'''
+    best = float('inf')
+    for _ in range(repeat):
+        start = perf_counter()
+        function()
+        best = min(best, perf_counter() - start)
+    return best
+
+def rolling_charts(equity, benchmark):
+    '''Rolling statistics of the report charts of a new ReportAggregates'''
+    aggregates = ReportAggregates(equity, benchmark)
+    aggregates.RollingBeta(22 * 6)
+    aggregates.RollingBeta(252)
+    aggregates.RollingSharpe(6)
+
+def recomputed_moments(x, y, first, last):
+    '''Means, variances and covariance of each window, computed from all the values of the window'''
+    moments = np.full((len(first), 5), np.nan)
+    for i, (start, end) in enumerate(zip(first, last)):
+        a, b = x[start:end], y[start:end]
+        moments[i] = a.mean(), b.mean(), a.var(ddof = 1), b.var(ddof = 1), np.cov(a, b)[0, 1]
+    return moments
+
+def pandas_moments(x, y, window):
+    '''Means, variances and covariance of each window with pandas rolling windows'''
+    x, y = pd.Series(x), pd.Series(y)
+    return x.rolling(window).mean(), y.rolling(window).mean(), x.rolling(window).var(), \
+        y.rolling(window).var(), x.rolling(window).cov(y)
+
+if __name__ == '__main__':
+    series = {
+        '10 years of daily equity': ('2010-01-01', 10 * 252, 'B'),
+        '2 years of minute equity': ('2010-01-01', 2 * 365 * 24 * 60, 'min') }
+
+    for name, (start, periods, freq) in series.items():
+        equity = random_series(start, periods, freq, 0)
+        benchmark = random_series(start, periods, freq, 1)
+        print(f'{name}, {periods} points')
+        print(f'Rolling beta and Sharpe charts:    {best_time(lambda: rolling_charts(equity, benchmark)):8.3f} s')
+
+        # Rolling moments of the returns over windows of 6 months of points
+        x = equity.pct_change().values[1:]
+        y = benchmark.pct_change().values[1:]
+        window = len(equity[:equity.index[0] + pd.DateOffset(months = 6)])
+        last = np.arange(window, len(x) + 1)
+        first = last - window
+
+        sums_time = best_time(lambda: rolling_moments(x, y, first, last))
+        pandas_time = best_time(lambda: pandas_moments(x, y, window))
+        sample = min(len(first), 2000)
+        recomputed_time = best_time(lambda: recomputed_moments(x, y, first[:sample], last[:sample]), repeat = 1)
+        recomputed_time *= len(first) / sample
+        print(f'Moments over {window} point windows')
+        print(f'Running sums:                      {sums_time:8.3f} s')
+        print(f'pandas rolling:                    {pandas_time:8.3f} s')
+        print(f'Window recomputation:              {recomputed_time:8.3f} s' +
+              (f', estimated from {sample} of {len(first)} windows' if sample < len(first) else ''))
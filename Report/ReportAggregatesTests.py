@@ -0,0 +1,106 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean Algorithmic Trading Engine v2.0. Copyright 2014 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# You can run this test by first running `nPython.exe` (with mono or otherwise):
+# $ ./nPython.exe ReportAggregatesTests.py
+
+import numpy as np
+import pandas as pd
+from ReportAggregates import ReportAggregates, rolling_moments
+
+# Hourly equity and benchmark over two and a half years
+time = pd.date_range('2012-10-01', '2015-03-31', freq='h')
+equity = pd.Series(100000 * np.cumprod(1 + np.random.normal(0.00005, 0.002, len(time))), index=time)
+benchmark = pd.Series(100 * np.cumprod(1 + np.random.normal(0.00005, 0.002, len(time))), index=time)
+aggregates = ReportAggregates([list(time.to_pydatetime()), list(equity.values)], benchmark)
+
+## Test DailyReturns
+daily = equity.resample('D').last().dropna()
+assert np.allclose(aggregates.DailyReturns().values, daily.pct_change().dropna().values)
+assert aggregates.DailyReturns() is aggregates.DailyReturns()
+
+## Test MonthlyReturns
+monthly = aggregates.MonthlyReturns()
+assert list(monthly.index) == ['2012', '2013', '2014', '2015']
+assert np.isnan(monthly.loc['2012', 'Sep']) and np.isnan(monthly.loc['2015', 'Apr'])
+for (year, month), values in equity.groupby([equity.index.year, equity.index.month]):
+    assert np.isclose(monthly.iloc[year - 2012, month - 1], (values.iloc[-1] / values.iloc[0] - 1) * 100)
+assert aggregates.MonthlyReturnsDictionary()['2013'] == list(monthly.loc['2013'])
+
+# Like DeedleUtil.TotalReturns, periods with a single value have no return
+single = ReportAggregates(pd.Series([1.0, 2.0, 3.0], index=pd.to_datetime(['2013-12-31', '2014-01-02', '2014-02-03'])))
+assert np.isnan(single.MonthlyReturns().values).all()
+assert list(single.AnnualReturns().index) == [2014]
+
+## Test AnnualReturns
+annual = aggregates.AnnualReturns()
+assert list(annual.index) == [2012, 2013, 2014, 2015]
+for year, values in equity.groupby(equity.index.year):
+    assert np.isclose(annual[year], (values.iloc[-1] / values.iloc[0] - 1) * 100)
+
+## Test Drawdown
+drawdown = aggregates.Drawdown()
+assert drawdown.max() == 0
+returns = equity / equity.iloc[0]
+assert np.allclose(drawdown.values, (1 - returns / returns.cummax()) * -1)
+
+## Test rolling_moments
+x = np.random.normal(0.001, 0.01, 300)
+y = 0.5 * x + np.random.normal(0, 0.01, 300)
+x[200] = np.inf
+first = np.maximum(np.arange(300) - 29, 0)
+last = np.arange(1, 301)
+count, mean_x, mean_y, variance_x, variance_y, covariance = rolling_moments(x, y, first, last)
+for i in [1, 29, 150, 199, 230, 299]:
+    a, b = x[first[i]:last[i]], y[first[i]:last[i]]
+    assert count[i] == len(a)
+    if np.isfinite(a).all():
+        assert np.isclose(mean_x[i], a.mean()) and np.isclose(mean_y[i], b.mean())
+        assert np.isclose(variance_x[i], a.var(ddof=1)) and np.isclose(variance_y[i], b.var(ddof=1))
+        assert np.isclose(covariance[i], np.cov(a, b)[0, 1])
+    else:
+        assert np.isnan([mean_x[i], variance_x[i], covariance[i]]).all()
+assert np.isnan(rolling_moments(x, None, [0], [1])[3]).all()
+
+## Test RollingBeta
+# Like Rolling.Beta, to the cumulative returns of the benchmark on the days of the returns of the equity
+cumulative = benchmark.resample('D').last().dropna().pct_change().add(1).cumprod().sub(1)
+returns = pd.concat([daily.pct_change(), cumulative], axis=1).dropna()
+beta = aggregates.RollingBeta(132)
+window = returns.iloc[-132:]
+assert np.isclose(beta.iloc[-1], np.cov(window.iloc[:, 0], window.iloc[:, 1])[0, 1] / window.iloc[:, 1].var())
+assert len(beta) == len(returns) - 131
+
+# The covariance and the variance are those of the rows of the window, since Rolling.Beta computes them from running
+# moments instead of the standard deviations of separate windows of the strategy and of the benchmark
+small = ReportAggregates(pd.Series([100, 101, 99, 102, 104, 103, 106, 105.], index=pd.date_range('2020-01-01', periods=8)),
+                         pd.Series([50, 50.5, 50, 51, 52, 51.5, 52.5, 53], index=pd.date_range('2020-01-01', periods=8)))
+beta = small.RollingBeta(4)
+assert list(beta.index) == list(pd.date_range('2020-01-05', periods=4))
+assert np.allclose(beta.values, [0.9011070854984633, 0.7323529702679368, 0.2569277762024754, 0.10062637508679076], rtol=0, atol=1e-12)
+
+## Test RollingSharpe
+sharpe = aggregates.RollingSharpe(6)
+assert sharpe.index[0] >= time[0] + pd.DateOffset(months=6)
+end = sharpe.index[-1]
+window = aggregates.DailyReturns()[end - pd.DateOffset(months=6):end]
+expected = ((window.mean() + 1) ** 252 - 1) / (window.std() * np.sqrt(252))
+assert np.isclose(sharpe.iloc[-1], expected)
+
+## Test ChartData
+data = aggregates.ChartData()
+assert len(data['GetRollingBeta']) == 4 and len(data['GetCumulativeReturns']) == 4
+assert data['GetDrawdown'][0][0] == time[0].to_pydatetime()
+assert ReportAggregates().ChartData()['GetMonthlyReturns'] == {}
+assert aggregates.ChartData('GetAnnualReturns') == data['GetAnnualReturns']
+
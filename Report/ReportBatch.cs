@@ -0,0 +1,172 @@
+﻿/*
+ * QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+ * Lean Algorithmic Trading Engine v2.0. Copyright 2014 QuantConnect Corporation.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+*/
+
+using System;
+using System.Collections.Concurrent;
+using System.Collections.Generic;
+using System.Diagnostics;
+using System.IO;
+using System.Linq;
+using System.Threading.Tasks;
+using QuantConnect.Logging;
+
+namespace QuantConnect.Report
+{
+    /// <summary>
+    /// Generates the reports of many backtests in a single process, so that the Python runtime and the
+    /// chart module are initialized once and shared by every report instead of once per report.
+    /// </summary>
+    public class ReportBatch
+    {
+        /// <summary>
+        /// Suffix of the live result file of a backtest, i.e. the live result of "Foobar.json" is "Foobar-live.json"
+        /// </summary>
+        public const string LiveFileSuffix = "-live";
+
+        private readonly string _name;
+        private readonly string _description;
+        private readonly string _version;
+        private readonly int _workers;
+
+        /// <summary>
+        /// Creates a batch of reports sharing the same strategy name, description and version
+        /// </summary>
+        /// <param name="name">Name of the strategy, the backtest file name when empty</param>
+        /// <param name="description">Description of the strategy</param>
+        /// <param name="version">Version number of the strategy</param>
+        /// <param name="workers">Number of reports generated concurrently</param>
+        public ReportBatch(string name, string description, string version, int workers)
+        {
+            _name = name;
+            _description = description;
+            _version = version;
+            _workers = Math.Max(workers, 1);
+        }
+
+        /// <summary>
+        /// Gets the backtest result files of a batch source
+        /// </summary>
+        /// <param name="source">Folder of backtest result json files, or list of backtest result json files separated by commas</param>
+        /// <returns>Backtest result files, without the live result and point in time portfolio files of a folder</returns>
+        public static List<string> GetBacktestFiles(string source)
+        {
+            if (Directory.Exists(source))
+            {
+                return Directory.GetFiles(source, "*.json")
+                    .Where(file =>
+                    {
+                        var name = Path.GetFileNameWithoutExtension(file);
+                        return !name.EndsWith(LiveFileSuffix, StringComparison.InvariantCulture) &&
+                            !name.EndsWith("-portfolio", StringComparison.InvariantCulture) &&
+                            Path.GetFileName(file) != Report.StatisticsFileName;
+                    })
+                    .OrderBy(file => file, StringComparer.InvariantCulture)
+                    .ToList();
+            }
+
+            return source.Split(new[] { ',' }, StringSplitOptions.RemoveEmptyEntries)
+                .Select(file => file.Trim())
+                .Where(file => file.Length != 0)
+                .ToList();
+        }
+
+        /// <summary>
+        /// Gets the live result file of a backtest result file
+        /// </summary>
+        /// <param name="backtestFile">Backtest result json file</param>
+        /// <returns>The live result json file next to the backtest file, or an empty string if there is none</returns>
+        public static string GetLiveFile(string backtestFile)
+        {
+            var liveFile = Path.Combine(Path.GetDirectoryName(Path.GetFullPath(backtestFile)),
+                Path.GetFileNameWithoutExtension(backtestFile) + LiveFileSuffix + ".json");
+
+            return File.Exists(liveFile) ? liveFile : string.Empty;
+        }
+
+        /// <summary>
+        /// Generates the report of each backtest result file
+        /// </summary>
+        /// <param name="backtestFiles">Backtest result json files</param>
+        /// <param name="destination">Folder of the html reports, the folder of each backtest file when empty</param>
+        /// <returns>Time taken to generate each report keyed by backtest file, for the reports that were generated</returns>
+        public Dictionary<string, TimeSpan> Run(IReadOnlyCollection<string> backtestFiles, string destination)
+        {
+            if (!string.IsNullOrEmpty(destination))
+            {
+                Directory.CreateDirectory(destination);
+            }
+
+            Log.Trace($"ReportBatch.Run(): Generating {backtestFiles.Count} reports with {_workers} workers...");
+            var timings = new ConcurrentDictionary<string, TimeSpan>();
+            var stopwatch = Stopwatch.StartNew();
+
+            // Reports share the Python runtime and the chart module. Their charts are rendered on their own
+            // figures, so Python calls of concurrent reports only wait on each other for the GIL
+            Parallel.ForEach(backtestFiles, new ParallelOptions { MaxDegreeOfParallelism = _workers }, backtestFile =>
+            {
+                var reportStopwatch = Stopwatch.StartNew();
+                try
+                {
+                    Generate(backtestFile, GetReportFile(backtestFile, destination));
+                    timings[backtestFile] = reportStopwatch.Elapsed;
+                    Log.Trace($"ReportBatch.Run(): Generated the report of {backtestFile} in {reportStopwatch.Elapsed.TotalSeconds:F2} seconds");
+                }
+                catch (Exception err)
+                {
+                    Log.Error(err, $"ReportBatch.Run(): Failed to generate the report of {backtestFile}");
+                }
+            });
+
+            stopwatch.Stop();
+            var generated = backtestFiles.Where(timings.ContainsKey).ToDictionary(file => file, file => timings[file]);
+            var mean = generated.Count == 0 ? 0 : generated.Values.Average(x => x.TotalSeconds);
+            Log.Trace($"ReportBatch.Run(): Generated {generated.Count} of {backtestFiles.Count} reports in " +
+                $"{stopwatch.Elapsed.TotalSeconds:F2} seconds, {mean:F2} seconds per report");
+
+            return generated;
+        }
+
+        /// <summary>
+        /// Generates the report of a backtest result file and of its live result file if any
+        /// </summary>
+        private void Generate(string backtestFile, string reportFile)
+        {
+            var liveFile = GetLiveFile(backtestFile);
+            var backtest = ResultsUtil.ReadBacktestResult(backtestFile);
+            var live = liveFile != string.Empty ? ResultsUtil.ReadLiveResult(liveFile) : null;
+            var name = string.IsNullOrEmpty(_name) ? Path.GetFileNameWithoutExtension(backtestFile) : _name;
+
+            var report = new Report(name, _description, _version, backtest, live, reportFile);
+
+            string html;
+            string _;
+            report.Compile(out html, out _);
+
+            File.WriteAllText(reportFile, html);
+        }
+
+        /// <summary>
+        /// Gets the html report file of a backtest result file
+        /// </summary>
+        private static string GetReportFile(string backtestFile, string destination)
+        {
+            var folder = string.IsNullOrEmpty(destination)
+                ? Path.GetDirectoryName(Path.GetFullPath(backtestFile))
+                : destination;
+
+            return Path.Combine(folder, Path.GetFileNameWithoutExtension(backtestFile) + ".html");
+        }
+    }
+}
@@ -0,0 +1,196 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean Algorithmic Trading Engine v2.0. Copyright 2014 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Benchmarks the chart rendering of ReportCharts over the scenarios of ReportChartTests.py,
+# the import time of ReportCharts, in memory against through PNG files, then serially against in a process pool,
+# the size and time of each image format, the charts of a report rendered again with a chart cache,
+# and the rendering of long minute resolution series with and without downsampling.
+# You can run this benchmark like the tests, by first running `nPython.exe` (with mono or otherwise):
+# $ ./nPython.exe ReportChartBenchmarks.py
+
+import os
+import runpy
+import subprocess
+import sys
+import numpy as np
+import pandas as pd
+from base64 import b64encode
+from copy import deepcopy
+from shutil import rmtree
+from tempfile import mkdtemp
+from time import perf_counter
+from ReportCharts import ReportCharts
+
+FOLDER = os.path.dirname(os.path.abspath(__file__))
+SCENARIOS = os.path.join(FOLDER, 'ReportChartTests.py')
+
+# Steps that importing ReportCharts used to take on top of the plotting imports
+EAGER_STARTUP = {
+    'Font manager scan': 'import matplotlib.font_manager; matplotlib.font_manager.FontManager()',
+    'pythonnet System import': 'from clr import AddReference; AddReference("System"); from System import *' }
+
+def startup_time(code, repeat = 5):
+    '''Best wall time of running Python code in a new process from this folder, or None if it fails'''
+    best = float('inf')
+    for _ in range(repeat):
+        start = perf_counter()
+        if subprocess.run([sys.executable, '-c', code], cwd = FOLDER, stdout = subprocess.DEVNULL,
+                          stderr = subprocess.DEVNULL).returncode != 0:
+            return None
+        best = min(best, perf_counter() - start)
+    return best
+
+def fig_to_base64_on_disk(self, filename = '', fig = None, dpi = 200):
+    '''Rendering of fig_to_base64 before in-memory rendering: save the PNG file and read it back'''
+    base64 = 'data:image/png;base64,'
+    if fig is not None:
+        fig.savefig(filename, dpi=dpi, bbox_inches='tight')
+        with open(filename, "rb") as fp:
+            base64 += b64encode(fp.read()).decode('utf-8').replace('\n', '')
+        return base64
+
+def record_charts():
+    '''Chart method calls of the ReportChartTests.py scenarios, keyed by call number for ReportCharts.RenderCharts'''
+    calls = {}
+    methods = {name: getattr(ReportCharts, name) for name in dir(ReportCharts) if name.startswith('Get')}
+
+    def recorder(name):
+        def record(self, *args, **kwargs):
+            calls[len(calls)] = (name, deepcopy(args), deepcopy(kwargs))
+            return methods[name](self, *args, **kwargs)
+        return record
+
+    for name in methods:
+        setattr(ReportCharts, name, recorder(name))
+    try:
+        run_scenarios(repeat = 1)
+    finally:
+        for name, method in methods.items():
+            setattr(ReportCharts, name, method)
+    return calls
+
+def render_charts(calls, processes, repeat = 3, image_format = 'png', dpi = 200, cache_folder = None):
+    '''Best wall time of rendering the chart calls with ReportCharts.RenderCharts and its outputs'''
+    best = float('inf')
+    for _ in range(repeat):
+        start = perf_counter()
+        charts = ReportCharts(image_format = image_format, dpi = dpi, cache_folder = cache_folder)
+        outputs = charts.RenderCharts(calls, processes = processes)
+        best = min(best, perf_counter() - start)
+    return best, outputs
+
+def encoded_size(outputs):
+    '''Total length of the data URLs of the chart outputs, as embedded in the report html'''
+    urls = [x for output in outputs.values() for x in (output.values() if isinstance(output, dict) else [output])]
+    return sum(len(x) for x in urls)
+
+def long_series(points = 1000000):
+    '''Chart calls of the downsampled methods for a random minute resolution series of many points'''
+    time = [x.to_pydatetime() for x in pd.date_range('2010-01-01', periods = points, freq = 'min')]
+    equity = np.cumsum(np.random.normal(0, 0.01, points))
+    benchmark = np.cumsum(np.random.normal(0, 0.01, points))
+    drawdown = (equity - np.maximum.accumulate(equity)) / 100
+    leverage = np.random.uniform(0.5, 1.5, points)
+    return {
+        'GetCumulativeReturns': ([time, equity, time, benchmark],),
+        'GetDrawdown': ([time, list(drawdown)], [[], []], []),
+        'GetRollingBeta': ([time, equity, time, benchmark],),
+        'GetLeverage': ([time, leverage],) }
+
+def render_downsampled(calls, downsample):
+    '''Wall time of rendering each chart call, or the error if it cannot be rendered'''
+    charts = ReportCharts()
+    times = {}
+    for method, args in calls.items():
+        start = perf_counter()
+        try:
+            getattr(charts, method)(*args, downsample = downsample)
+            times[method] = f'{perf_counter() - start:8.3f} s'
+        except Exception as e:
+            times[method] = f'{type(e).__name__}: {e}'
+    return times
+
+def run_scenarios(repeat = 3):
+    '''Best wall time of the ReportChartTests.py scenarios and number of files they leave in the working directory'''
+    best = float('inf')
+    files = 0
+    cwd = os.getcwd()
+    for _ in range(repeat):
+        folder = mkdtemp()
+        os.chdir(folder)
+        try:
+            np.random.seed(0)
+            start = perf_counter()
+            runpy.run_path(SCENARIOS, run_name = '__benchmark__')
+            best = min(best, perf_counter() - start)
+            files = len(os.listdir(folder))
+        finally:
+            os.chdir(cwd)
+            rmtree(folder)
+    return best, files
+
+if __name__ == '__main__':
+    print('Startup in a new process')
+    print(f'import ReportCharts:     {startup_time("import ReportCharts"):8.3f} s')
+    baseline = startup_time('import matplotlib')
+    for step, code in EAGER_STARTUP.items():
+        step_time = startup_time(f'import matplotlib; {code}')
+        print(f'{step + ":":24s} ' + ('not available' if step_time is None else
+                                      f'{step_time - baseline:8.3f} s, no longer taken at import'))
+
+    in_memory = ReportCharts.fig_to_base64
+    memory_time, memory_files = run_scenarios()
+
+    ReportCharts.fig_to_base64 = fig_to_base64_on_disk
+    disk_time, disk_files = run_scenarios()
+    ReportCharts.fig_to_base64 = in_memory
+
+    print('ReportChartTests.py scenarios')
+    print(f'PNG file round trip: {disk_time:8.3f} s, {disk_files} temporary files')
+    print(f'In-memory rendering: {memory_time:8.3f} s, {memory_files} temporary files ({disk_time / memory_time:.2f}x)')
+
+    calls = record_charts()
+    serial_time, serial = render_charts(calls, processes = 0)
+    pool_time, pool = render_charts(calls, processes = None)
+    print(f'{len(calls)} charts of the scenarios')
+    print(f'Serial rendering:    {serial_time:8.3f} s')
+    print(f'Process pool ({os.cpu_count()}):    {pool_time:8.3f} s ({serial_time / pool_time:.2f}x), same outputs: {serial == pool}')
+
+    print('Image formats, serial rendering')
+    for image_format, dpi in [('png', 200), ('optimized-png', 200), ('webp', 200), ('png', 100), ('optimized-png', 100), ('svg', 72)]:
+        format_time, outputs = render_charts(calls, processes = 0, repeat = 1, image_format = image_format, dpi = dpi)
+        print(f'{image_format:13s} {dpi:3d} dpi: {format_time:8.3f} s, {encoded_size(outputs) / 1e6:6.2f} MB of data URLs')
+
+    folder = mkdtemp()
+    try:
+        first_time, first = render_charts(calls, processes = 0, repeat = 1, cache_folder = folder)
+        cached_time, cached = render_charts(calls, processes = 0, repeat = 1, cache_folder = folder)
+        # A live chart with new data, drawn wider
+        changed = dict(calls)
+        key = next(key for key, (method, args, kwargs) in calls.items() if method == 'GetCumulativeReturns' and args)
+        method, args, kwargs = changed[key]
+        changed[key] = (method, args, dict(kwargs, width = 12))
+        changed_time, _ = render_charts(changed, processes = 0, repeat = 1, cache_folder = folder)
+    finally:
+        rmtree(folder)
+    print('Chart cache, serial rendering')
+    print(f'First report:        {first_time:8.3f} s')
+    print(f'Same data:           {cached_time:8.3f} s ({first_time / cached_time:.1f}x), same outputs: {cached == first == serial}')
+    print(f'One chart changed:   {changed_time:8.3f} s')
+
+    calls = long_series()
+    all_points = render_downsampled(calls, downsample = False)
+    downsampled = render_downsampled(calls, downsample = True)
+    print('Series of 1,000,000 minutes')
+    for method in calls:
+        print(f'{method:21s} all points: {all_points[method]}, downsampled: {downsampled[method]}')
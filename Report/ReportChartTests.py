@@ -179,3 +179,87 @@ result = charts.GetExposure(time, long_securities, short_securities, long, short
 result = charts.GetExposure(time, long_securities, short_securities, long, short,
                                 live_time, live_long_securities, live_short_securities,
                                 live_long, live_short)
+
+## Test RenderCharts
+batch = {'leverage': ('GetLeverage', [backtest, live], {}),
+         'exposure': ('GetExposure', [], {}),
+         'empty': ('GetDrawdown', [], {'data': empty})}
+result = charts.RenderCharts(batch, processes=2)
+assert result['leverage'] == charts.GetLeverage(backtest, live)
+assert result['exposure'] == charts.GetExposure()
+assert result['empty'] == charts.GetDrawdown(data = empty)
+
+## Test the charts render the data of ReportAggregates, as passed by the report elements of the daily, monthly and
+## annual returns and of the rolling beta, with empty aggregates for a missing live result
+from ReportAggregates import ReportAggregates
+time = [pd.Timestamp(x).to_pydatetime() for x in pd.date_range('2012-10-01 00:00:00', periods=600)]
+equity = list(np.cumprod(np.random.normal(1.0005, 0.01, 600)) * 1e5)
+benchmark = list(np.cumprod(np.random.normal(1.0003, 0.01, 600)) * 100)
+aggregates = ReportAggregates([time, equity], [time, benchmark])
+for name in ['GetDailyReturns', 'GetMonthlyReturns', 'GetAnnualReturns', 'GetRollingBeta']:
+    result = getattr(charts, name)(aggregates.ChartData(name), ReportAggregates().ChartData(name))
+    assert result != getattr(charts, name)(ReportAggregates().ChartData(name), ReportAggregates().ChartData(name))
+
+## Test "Insufficient Data" placeholders are rendered once per size
+from ReportCharts import render_insufficient_data
+result = charts.GetDrawdown()
+hits = render_insufficient_data.cache_info().hits
+assert charts.GetDrawdown() == result
+assert render_insufficient_data.cache_info().hits == hits + 1
+
+## Test downsampling of long series
+from ReportCharts import downsample_points
+time = [pd.Timestamp(x).to_pydatetime() for x in pd.date_range('2010-01-01', periods=100000, freq='min')]
+values = list(np.random.normal(0, 1, 100000))
+x, y = downsample_points(time, values, 1000)
+assert len(x) == len(y) <= 4000
+assert x[0] == time[0] and x[-1] == time[-1]
+assert min(y) == min(values) and max(y) == max(values)
+assert downsample_points(time, values, None) == (time, values)
+result = charts.GetCumulativeReturns([time, values, time, values], downsample=True)
+result = charts.GetDrawdown([time, values], [[], []], [], downsample=True)
+result = charts.GetRollingBeta([time, values, time, values], downsample=True)
+result = charts.GetLeverage([time, values], downsample=True)
+
+## Test charts are reused from the chart cache folder until their data changes
+import os
+from tempfile import mkdtemp
+folder = mkdtemp()
+cached = ReportCharts(cache_folder=folder)
+backtest = [time[:1000], values[:1000]]
+result = cached.GetLeverage(backtest)
+assert sorted(os.path.splitext(x)[1] for x in os.listdir(folder)) == ['.json', '.png']
+assert ReportCharts(cache_folder=folder).GetLeverage([list(time[:1000]), np.array(values[:1000])]) == result
+assert len(os.listdir(folder)) == 2
+assert cached.GetLeverage(backtest, [time[1000:1001], values[1000:1001]]) != result
+assert len(os.listdir(folder)) == 4
+assert result == charts.GetLeverage(backtest)
+
+# Concurrent writers of a chart, like the threads of a report batch, never leave a chart that pairs with another image
+from concurrent.futures import ThreadPoolExecutor
+from base64 import b64encode
+from json import load
+from ReportCharts import read_cached_chart, write_cached_chart
+folder = mkdtemp()
+path = os.path.join(folder, 'chart')
+urls = ['data:image/png;base64,' + b64encode(bytes([i]) * 1000).decode() for i in range(8)]
+with ThreadPoolExecutor(8) as executor:
+    list(executor.map(lambda url: write_cached_chart(path, 'GetLeverage', url), urls * 4))
+assert read_cached_chart(path) in urls
+assert not [x for x in os.listdir(folder) if x.endswith('.tmp')]
+with open(f'{path}.json') as fp:
+    image = os.path.join(folder, load(fp)['image'])
+with open(image, 'wb') as fp:
+    fp.write(b'\x00' * 1000)
+assert read_cached_chart(path) is None
+
+# .NET times are told apart by their ticks, their strings only have a precision of seconds
+from ReportCharts import chart_fingerprint
+class DateTime:
+    def __init__(self, ticks):
+        self.Ticks = ticks
+    def __str__(self):
+        return '1/2/2020 10:00:00 AM'
+fingerprint = lambda ticks: chart_fingerprint('GetLeverage', [[[DateTime(x) for x in ticks], [1.0, 2.0]]], {}, 'png', 200)
+assert fingerprint([0, 1]) == fingerprint([0, 1])
+assert fingerprint([0, 1]) != fingerprint([0, 2])
@@ -11,80 +11,383 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import re
+import hashlib
 import matplotlib
+import os
+import re
+import tempfile
 import numpy as np
 import pandas as pd
-from base64 import b64encode
+from base64 import b64decode, b64encode
+from concurrent.futures import ProcessPoolExecutor
 from datetime import date, datetime, timedelta
+from functools import lru_cache, wraps
+from io import BytesIO
+from json import dumps, load
 from pandas.plotting import register_matplotlib_converters
-from clr import AddReference
-AddReference("System")
-from System import *
 
 register_matplotlib_converters()
 
-
-
 matplotlib.use('Agg')
 font = {'family': 'DejaVu Sans'}
 matplotlib.rc('font',**font)
 matplotlib.rc('axes', edgecolor='#d5d5d5')
 
-import matplotlib.pyplot as plt
+from matplotlib.artist import setp
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.patches import Rectangle
 import matplotlib.ticker as ticker
 import matplotlib.colors as mcolors
 from matplotlib.dates import DateFormatter
 from matplotlib.ticker import MaxNLocator, NullFormatter, ScalarFormatter, FormatStrFormatter
-la = matplotlib.font_manager.FontManager()
-lu = matplotlib.font_manager.FontProperties(family = "Open Sans Condensed")
+
+def new_figure(**kwargs):
+    '''
+    Creates a figure drawn by the Agg backend. Charts use figures directly instead of the pyplot state machine,
+    so that no state is shared between charts and they can be rendered concurrently
+    '''
+    fig = Figure(**kwargs)
+    FigureCanvasAgg(fig)
+    return fig
+
+# Image formats of the charts with their file extension and MIME type
+IMAGE_FORMATS = {
+    'png': ('png', 'image/png'),
+    'optimized-png': ('png', 'image/png'),
+    'webp': ('webp', 'image/webp'),
+    'svg': ('svg', 'image/svg+xml') }
+
+# Paths of vector images are simplified more than for raster images, since each point is written to the file
+SVG_SIMPLIFY_THRESHOLD = 0.5
+WEBP_QUALITY = 90
+
+def render_image(fig, dpi = 200, image_format = 'png'):
+    '''
+    Renders a figure as the bytes of an image format
+    image_format: 'png', 'optimized-png' (reduced to a 256 colors palette), 'webp' or 'svg'
+    '''
+    buffer = BytesIO()
+    if image_format == 'svg':
+        with matplotlib.rc_context({'path.simplify': True, 'path.simplify_threshold': SVG_SIMPLIFY_THRESHOLD}):
+            fig.savefig(buffer, format='svg', bbox_inches='tight')
+        return buffer.getvalue()
+
+    fig.savefig(buffer, format='png', dpi=dpi, bbox_inches='tight')
+    if image_format == 'png':
+        return buffer.getvalue()
+
+    # Pillow is only needed for the compressed raster formats
+    from PIL import Image
+    buffer.seek(0)
+    image = Image.open(buffer)
+    output = BytesIO()
+    if image_format == 'webp':
+        image.save(output, format='WEBP', quality=WEBP_QUALITY)
+    else:
+        image.quantize(256, method=Image.FASTOCTREE).save(output, format='PNG', optimize=True)
+    return output.getvalue()
+
+@lru_cache(maxsize=None)
+def render_insufficient_data(width, height, fontsize, dpi = 200, image_format = 'png'):
+    '''
+    Renders the "Insufficient Data" placeholder of empty charts as image bytes, memoized by size, font size, dpi and format
+    '''
+    fig = new_figure()
+    fig.set_size_inches(width, height)
+
+    left, box_width = .25, .5
+    bottom, box_height = .25, .5
+    right = left + box_width
+    top = bottom + box_height
+
+    ax = fig.add_axes([0, 0, 1, 1])
+    ax.text(0.5 * (left + right), 0.5 * (top + bottom), 'Insufficient Data', color="#d5d5d5",
+            horizontalalignment='center',
+            verticalalignment='center',
+            fontsize=fontsize,
+            transform=ax.transAxes)
+
+    ax.axis('off')
+
+    for _, spine in ax.spines.items():
+        spine.set_visible(False)
+
+    return render_image(fig, dpi, image_format)
+
+def downsample_points(x, y, pixels = None):
+    '''
+    Downsamples a line to the first, last, lowest and highest points of each pixel column (M4 downsampling),
+    so that it is drawn the same with at most four points per pixel column.
+    x: sorted times or numbers of the points
+    y: values of the points
+    pixels: number of pixel columns of the plot, None to keep all the points
+    Returns the kept points as (x, y)
+    '''
+    if pixels is None or len(x) != len(y) or len(x) <= 4 * pixels:
+        return x, y
+
+    values = np.asarray(y, dtype=float)
+    position = np.asarray(x)
+    if not np.issubdtype(position.dtype, np.number):
+        position = pd.DatetimeIndex(position).asi8
+    position = position.astype(float)
+    span = position[-1] - position[0]
+    if not span > 0:
+        return x, y
+
+    column = np.minimum(((position - position[0]) * (pixels / span)).astype(int), pixels - 1)
+    starts = np.flatnonzero(np.diff(column)) + 1
+    first = np.concatenate([[0], starts])
+    last = np.concatenate([starts - 1, [len(values) - 1]])
+
+    # Ordered by column then value, the first point of each column is its lowest and the last its highest
+    order = np.lexsort((values, column))
+    keep = np.unique(np.concatenate([first, last, order[first], order[last]]))
+
+    take = lambda points: [points[i] for i in keep] if isinstance(points, list) else np.asarray(points)[keep]
+    return take(x), take(y)
+
+def render_chart(method, args = (), kwargs = None, save_images = False, image_format = 'png', dpi = 200,
+                 cache_folder = None):
+    '''
+    Calls a chart method of a new ReportCharts instance. Module level so worker processes can run it
+    '''
+    return getattr(ReportCharts(save_images, image_format, dpi, cache_folder), method)(*args, **(kwargs or {}))
+
+# Cached charts unused for this long are deleted from the chart cache folder
+CHART_CACHE_MAX_AGE = timedelta(days = 7)
+
+# Charts cached by another version of this file are not reused
+with open(os.path.abspath(__file__), 'rb') as fp:
+    CHARTS_VERSION = hashlib.sha1(fp.read()).hexdigest()
+
+def update_fingerprint(digest, value):
+    '''
+    Feeds a chart argument to a hash: numbers, strings, times, arrays, pandas objects, dictionaries and any iterable
+    of them, like the lists passed by the report elements
+    '''
+    if value is None or isinstance(value, (str, bytes, bool, int, float, np.number, date, timedelta)):
+        digest.update(f'{type(value).__name__}:{value!r};'.encode())
+    elif hasattr(value, 'Ticks'):
+        # .NET times and time spans, whose strings only have a precision of seconds
+        digest.update(f'{type(value).__name__}:{value.Ticks};'.encode())
+    elif isinstance(value, dict):
+        digest.update(b'{')
+        for key in sorted(value, key = repr):
+            update_fingerprint(digest, key)
+            update_fingerprint(digest, value[key])
+        digest.update(b'}')
+    elif isinstance(value, (pd.Series, pd.DataFrame, pd.Index)):
+        digest.update(f'{type(value).__name__}:{getattr(value, "columns", None)};'.encode())
+        digest.update(pd.util.hash_pandas_object(value).values.tobytes())
+    elif isinstance(value, np.ndarray) and value.dtype != object:
+        digest.update(f'{value.dtype}{value.shape};'.encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    else:
+        try:
+            items = list(value)
+        except TypeError:
+            digest.update(f'{type(value).__name__}:{value};'.encode())
+            return
+
+        # Long lists of numbers or times are hashed as arrays rather than one value at a time
+        types = set(map(type, items))
+        if len(types) == 1 and hasattr(items[0], 'Ticks'):
+            # .NET times, like the items of the List<DateTime> of the report elements
+            digest.update(f'{types.pop().__name__}[];'.encode())
+            update_fingerprint(digest, np.fromiter((item.Ticks for item in items), dtype = np.int64, count = len(items)))
+            return
+        if len(types) == 1 and issubclass(types.pop(), (int, float, np.number, datetime)):
+            if isinstance(items[0], datetime):
+                times = pd.DatetimeIndex(items)
+                digest.update(f'{times.tz};'.encode())
+                items = times.asi8
+            array = np.asarray(items)
+            if array.dtype != object:
+                update_fingerprint(digest, array)
+                return
+
+        digest.update(b'[')
+        for item in items:
+            update_fingerprint(digest, item)
+        digest.update(b']')
+
+def chart_fingerprint(method, args, kwargs, image_format, dpi):
+    '''Hash of a chart method call, identifying its output'''
+    digest = hashlib.sha1(f'{CHARTS_VERSION}:{method}:{image_format}:{dpi}'.encode())
+    update_fingerprint(digest, list(args))
+    update_fingerprint(digest, kwargs)
+    return digest.hexdigest()
+
+def prune_chart_cache(folder, max_age = CHART_CACHE_MAX_AGE):
+    '''
+    Deletes the files of a chart cache folder that were not used for the maximum age: the cached charts, the images
+    replaced by a newer image of the same chart and the temporary files left by interrupted writers
+    '''
+    oldest = (datetime.now() - max_age).timestamp()
+    for entry in os.scandir(folder):
+        try:
+            if entry.is_file() and entry.stat().st_mtime < oldest:
+                os.remove(entry.path)
+        except OSError:
+            pass
+
+def read_cached_chart(path):
+    '''
+    Reads a chart of the chart cache: the JSON file describing it, which is written last, and the image it names.
+    Returns the data URL of the chart, or None if it is not cached
+    '''
+    try:
+        with open(f'{path}.json') as fp:
+            entry = load(fp)
+        image = os.path.join(os.path.dirname(path), os.path.basename(entry['image']))
+        with open(image, 'rb') as fp:
+            content = fp.read()
+        if hashlib.sha1(content).hexdigest() != entry['sha1']:
+            return None
+        os.utime(f'{path}.json')
+        os.utime(image)
+        return f'data:{entry["mime_type"]};base64,' + b64encode(content).decode('utf-8')
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+def write_file(path, content):
+    '''
+    Writes a file through a temporary file of its folder with a unique name, so that readers never see a partial file
+    and concurrent writers, like the threads of a report batch, never write to the same temporary file
+    '''
+    descriptor, temporary = tempfile.mkstemp(dir = os.path.dirname(path), suffix = '.tmp')
+    try:
+        with os.fdopen(descriptor, 'wb') as fp:
+            fp.write(content)
+        os.replace(temporary, path)
+    except BaseException:
+        try:
+            os.remove(temporary)
+        except OSError:
+            pass
+        raise
+
+def write_cached_chart(path, method, output):
+    '''
+    Writes the image of a chart data URL to the chart cache, with a JSON file describing it. Images and data are kept
+    as plain files rather than serialized objects, so that reading a cache folder shared by other processes never runs
+    code. The image is named after its content and written before the JSON file, so that the JSON file only ever
+    names a complete image with the content it describes, whichever writer of the same chart finishes last
+    '''
+    header, _, data = output.partition(',')
+    if not header.startswith('data:') or not header.endswith(';base64'):
+        return
+    mime_type = header[len('data:'):-len(';base64')]
+    extension = next((x for x, y in IMAGE_FORMATS.values() if y == mime_type), None)
+    if extension is None:
+        return
+
+    content = b64decode(data)
+    digest = hashlib.sha1(content).hexdigest()
+    image = f'{path}.{digest}.{extension}'
+    write_file(image, content)
+    entry = {'method': method, 'image': os.path.basename(image), 'mime_type': mime_type, 'sha1': digest}
+    write_file(f'{path}.json', dumps(entry).encode())
+
+def cached_chart(method):
+    '''
+    Decorates a chart method so that, with a chart cache folder, its output is saved to the folder and reused by later
+    calls with the same arguments, in this process or another. Regenerating a report then only renders the charts
+    whose data changed, like the charts of a live deployment that received new points
+    '''
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.cache_folder is None or self.save_images:
+            return method(self, *args, **kwargs)
+
+        key = chart_fingerprint(method.__name__, args, kwargs, self.image_format, self.dpi)
+        path = os.path.join(self.cache_folder, key)
+        output = read_cached_chart(path)
+        if output is None:
+            output = method(self, *args, **kwargs)
+            if isinstance(output, str):
+                write_cached_chart(path, method.__name__, output)
+        return output
+    return wrapper
 
 class ReportCharts:
 
-    def fig_to_base64(self, filename = '', fig = None, dpi = 200):
-        base64 = 'data:image/png;base64,'
+    def __init__(self, save_images = False, image_format = 'png', dpi = 200, cache_folder = None):
+        '''
+        save_images: True to also write each rendered chart to its file name. Charts are rendered in memory either way
+        image_format: format of the chart images: 'png', 'optimized-png' (reduced to a 256 colors palette), 'webp' or
+                      'svg' (vector image with simplified paths, independent of the dpi)
+        dpi: resolution of the raster images
+        cache_folder: folder keeping the rendered charts between reports, so that a chart is only rendered again when
+                      its data changed. None or empty to render every chart. Not used when saving images
+        '''
+        if image_format not in IMAGE_FORMATS:
+            raise ValueError(f'Unsupported image format {image_format}, expected one of {", ".join(IMAGE_FORMATS)}')
+        self.save_images = save_images
+        self.image_format = image_format
+        self.dpi = dpi
+        self.cache_folder = cache_folder or None
+        if self.cache_folder is not None:
+            os.makedirs(self.cache_folder, exist_ok = True)
+            prune_chart_cache(self.cache_folder)
+
+    def fig_to_base64(self, filename = '', fig = None, dpi = None):
         if fig is not None:
-            fig.savefig(filename, dpi=dpi, bbox_inches='tight')
-            with open(filename, "rb") as fp:
-                base64 += b64encode(fp.read()).decode('utf-8').replace('\n', '')
-            return base64
+            return self.image_to_base64(filename, render_image(fig, dpi or self.dpi, self.image_format))
 
+    def insufficient_data_to_base64(self, filename, width, height, fontsize):
+        '''
+        Gets the "Insufficient Data" placeholder of a chart. It is rendered once per process for each size
+        '''
+        return self.image_to_base64(filename, render_insufficient_data(width, height, fontsize, self.dpi, self.image_format))
+
+    def image_to_base64(self, filename, content):
+        '''
+        Encodes image bytes as a data URL, also writing them to the file name, with the extension of the format,
+        if saving images
+        '''
+        extension, mime_type = IMAGE_FORMATS[self.image_format]
+        if self.save_images and filename:
+            with open(f'{os.path.splitext(filename)[0]}.{extension}', "wb") as fp:
+                fp.write(content)
+        return f'data:{mime_type};base64,' + b64encode(content).decode('utf-8')
+
+    def RenderCharts(self, charts, processes = None):
+        '''
+        Renders independent charts concurrently, each worker process with its own matplotlib state.
+        charts: dictionary keyed by chart name of (method name, args, kwargs) tuples,
+                e.g. {'drawdown': ('GetDrawdown', [data, live_data, worst], {})}
+        processes: number of worker processes. None for the number of processors, 0 to render in this process,
+                   e.g. when Python is embedded and cannot start standalone worker processes
+        Returns a dictionary keyed by chart name with the output of each method
+        '''
+        if processes is None:
+            processes = os.cpu_count()
+        if processes is None or processes <= 1 or len(charts) <= 1:
+            return {name: render_chart(method, args, kwargs, self.save_images, self.image_format, self.dpi, self.cache_folder)
+                    for name, (method, args, kwargs) in charts.items()}
+
+        with ProcessPoolExecutor(min(processes, len(charts))) as pool:
+            futures = {name: pool.submit(render_chart, method, args, kwargs, self.save_images, self.image_format, self.dpi,
+                                         self.cache_folder)
+                       for name, (method, args, kwargs) in charts.items()}
+            return {name: future.result() for name, future in futures.items()}
+
+    @cached_chart
     def GetReturnsPerTrade(self, returns_per_trade = [], live_returns_per_trade = [],
                            name = "returns-per-trade.png", width = 7, height = 5,
                            live_color = "#ff9914", backtest_color = "#71c3fc"):
 
         if len(returns_per_trade) == 0:
-            fig = plt.figure()
-            fig.set_size_inches(width, height)
-
-            left, box_width = .25, .5
-            bottom, box_height = .25, .5
-            right = left + box_width
-            top = bottom + box_height
-
-            ax = fig.add_axes([0, 0, 1, 1])
-            ax.text(0.5 * (left + right), 0.5 * (top + bottom), 'Insufficient Data', color="#d5d5d5",
-                    horizontalalignment='center',
-                    verticalalignment='center',
-                    fontsize=30,
-                    transform=ax.transAxes)
-
-            ax.axis('off')
-
-            for _, spine in ax.spines.items():
-                spine.set_visible(False)
-
-            base64 = self.fig_to_base64(name, fig)
-            plt.cla()
-            plt.clf()
-            plt.close('all')
-            return base64
+            return self.insufficient_data_to_base64(name, width, height, 30)
 
         if len(live_returns_per_trade) > 0:
             width = 11.5
             height = 5
-            plt.figure()
-            fig, ax = plt.subplots(1, 2, tight_layout=True)
+            fig = new_figure(tight_layout=True)
+            ax = fig.subplots(1, 2)
             ax[0].hist(returns_per_trade, bins=75, color=backtest_color)
             ax[1].hist(live_returns_per_trade, bins=25, color=live_color)
             for i in range(2):
@@ -98,37 +401,40 @@ class ReportCharts:
                     ax[i].tick_params(labelsize=8)
                     ax[i].tick_params(axis='x', color='#d5d5d5')
                     ax[i].tick_params(axis='y', color='#d5d5d5')
-                    plt.setp(ax[i].spines.values(), color='#d5d5d5')
+                    setp(ax[i].spines.values(), color='#d5d5d5')
                     ax[i].spines['right'].set_visible(False)
                     ax[i].spines['top'].set_visible(False)
         else:
-            fig = plt.figure()
-            plt.hist(returns_per_trade, bins=75, color=backtest_color)
-            plt.xticks(fontsize=8)
-            plt.yticks(fontsize=8)
-            plt.gca().spines['right'].set_visible(False)
-            plt.gca().spines['top'].set_visible(False)
-            plt.gca().tick_params(axis='x', color='#d5d5d5')
-            plt.gca().tick_params(axis='y', color='#d5d5d5')
-            plt.gca().axvline(x=np.median(returns_per_trade), color="red", ls="dashed", label="median", linewidth=0.5)
-            plt.ylabel('')
-
-        # Set the x ticks as percentage to keep consistency
-        plt.xticks(ticks=plt.xticks()[0], labels=["{:.2f}%".format(tick * 100) for tick in plt.xticks()[0]])
+            fig = new_figure()
+            ax = fig.add_subplot(111)
+            ax.hist(returns_per_trade, bins=75, color=backtest_color)
+            setp(ax.get_xticklabels(), fontsize=8)
+            setp(ax.get_yticklabels(), fontsize=8)
+            ax.spines['right'].set_visible(False)
+            ax.spines['top'].set_visible(False)
+            ax.tick_params(axis='x', color='#d5d5d5')
+            ax.tick_params(axis='y', color='#d5d5d5')
+            ax.axvline(x=np.median(returns_per_trade), color="red", ls="dashed", label="median", linewidth=0.5)
+            ax.set_ylabel('')
+
+        # Set the x ticks as percentage to keep consistency, on the live histogram if there is one
+        last = ax[-1] if len(live_returns_per_trade) > 0 else ax
+        ticks = last.get_xticks()
+        last.set_xticks(ticks)
+        last.set_xticklabels(["{:.2f}%".format(tick * 100) for tick in ticks])
 
         fig.set_size_inches(width, height)
         base64 = self.fig_to_base64(name, fig)
-        plt.cla()
-        plt.clf()
-        plt.close('all')
         return base64
 
+    @cached_chart
     def GetCumulativeReturns(self, data = None, live_data = None, benchmark_symbol = 'SPY',
                                  name = "cumulative-return.png", width = 11.5, height = 2.5, live_color = "#ff9914",
-                                 backtest_color = "#71c3fc", gray = "#b3bcc0"):
+                                 backtest_color = "#71c3fc", gray = "#b3bcc0", downsample = False):
         '''
         data: [ [strategyTime], [strategyPoints], [benchTime], [benchResults] ]
         live_data: [ [strategyTime], [strategyPoints], [benchTime], [benchResults] ]
+        downsample: True to draw at most four points per pixel column of each line, for long high resolution series
         '''
 
         # Initialize lists here instead of method signature to avoid
@@ -139,34 +445,11 @@ class ReportCharts:
             live_data = [[],[],[],[]]
 
         if len(data[0]) == 0:
-            fig = plt.figure()
-            fig.set_size_inches(width, height)
+            return self.insufficient_data_to_base64(name, width, height, 20)
 
-            left, box_width = .25, .5
-            bottom, box_height = .25, .5
-            right = left + box_width
-            top = bottom + box_height
-
-            ax = fig.add_axes([0, 0, 1, 1])
-            ax.text(0.5 * (left + right), 0.5 * (top + bottom), 'Insufficient Data', color="#d5d5d5",
-                    horizontalalignment='center',
-                    verticalalignment='center',
-                    fontsize=20,
-                    transform=ax.transAxes)
-
-            ax.axis('off')
-
-            for _, spine in ax.spines.items():
-                spine.set_visible(False)
-
-            base64 = self.fig_to_base64(name, fig)
-            plt.cla()
-            plt.clf()
-            plt.close('all')
-            return base64
-
-        plt.figure()
-        ax = plt.gca()
+        pixels = int(width * self.dpi) if downsample else None
+        fig = new_figure()
+        ax = fig.add_subplot(111)
         labels = ['Backtest', 'Benchmark']
         labels_removed = []
 
@@ -176,43 +459,19 @@ class ReportCharts:
 
         for i, array in enumerate(values):
             if any(array[0]):
-                ax.plot(array[0], array[1], linewidth=0.5, color=colors[i], drawstyle='steps-post')
+                ax.plot(*downsample_points(array[0], array[1], pixels), linewidth=0.5, color=colors[i], drawstyle='steps-post')
             else:
                 # We have nothing for this graph. Wipe any mention of it
                 labels_removed.append(labels[i])
 
-            rectangles.append(plt.Rectangle((0, 0), 1, 1, fc=colors[i]))
+            rectangles.append(Rectangle((0, 0), 1, 1, fc=colors[i]))
 
         # Only get the labels we didn't remove (i.e. labels that have a graph, guaranteed)
         labels = [label for label in labels if label not in labels_removed]
 
         # Return if we don't have any valid labels
         if not any(labels):
-            fig = plt.figure()
-            fig.set_size_inches(width, height)
-
-            left, box_width = .25, .5
-            bottom, box_height = .25, .5
-            right = left + box_width
-            top = bottom + box_height
-
-            ax = fig.add_axes([0, 0, 1, 1])
-            ax.text(0.5 * (left + right), 0.5 * (top + bottom), 'Insufficient Data', color="#d5d5d5",
-                    horizontalalignment='center',
-                    verticalalignment='center',
-                    fontsize=20,
-                    transform=ax.transAxes)
-
-            ax.axis('off')
-
-            for _, spine in ax.spines.items():
-                spine.set_visible(False)
-
-            base64 = self.fig_to_base64(name, fig)
-            plt.cla()
-            plt.clf()
-            plt.close('all')
-            return base64
+            return self.insufficient_data_to_base64(name, width, height, 20)
 
         live_labels = []
         live_labels_removed = []
@@ -224,69 +483,43 @@ class ReportCharts:
 
             for i, array in enumerate(values):
                 if any(array[0]):
-                    ax.plot(array[0], array[1], linewidth=0.5, color=colors[i], drawstyle='steps-post')
-                    rectangles.append(plt.Rectangle((0, 0), 1, 1, fc=colors[i]))
+                    ax.plot(*downsample_points(array[0], array[1], pixels), linewidth=0.5, color=colors[i], drawstyle='steps-post')
+                    rectangles.append(Rectangle((0, 0), 1, 1, fc=colors[i]))
 
         ax.legend(rectangles, labels, handlelength=0.8, handleheight=0.8,
                   frameon=False, fontsize=8, ncol=len(labels))
         fig = ax.get_figure()
-        plt.xticks(rotation=0, ha='center', fontsize=8)
-        plt.yticks(fontsize=8)
+        setp(ax.get_xticklabels(), rotation=0, ha='center', fontsize=8)
+        setp(ax.get_yticklabels(), fontsize=8)
         ax.xaxis.set_major_formatter(DateFormatter("%b %Y"))
         ax.yaxis.set_major_formatter(ticker.PercentFormatter())
         ax.yaxis.set_major_locator(MaxNLocator(6))
-        plt.axhline(y=0, color='#d5d5d5', zorder=1)
-        plt.setp(ax.spines.values(), color='#d5d5d5')
+        ax.axhline(y=0, color='#d5d5d5', zorder=1)
+        setp(ax.spines.values(), color='#d5d5d5')
         ax.spines['right'].set_visible(False)
         ax.spines['top'].set_visible(False)
-        plt.setp([ax.get_xticklines(), ax.get_yticklines()], color='#d5d5d5')
-        plt.ylabel("")
-        plt.xlabel("")
+        setp([ax.get_xticklines(), ax.get_yticklines()], color='#d5d5d5')
+        ax.set_ylabel("")
+        ax.set_xlabel("")
         ax.yaxis.grid(True, color="#ececec")
         fig.set_size_inches(width, height)
         base64 = self.fig_to_base64(name, fig)
-        plt.cla()
-        plt.clf()
-        plt.close('all')
         return base64
 
+    @cached_chart
     def GetDailyReturns(self, returns = [[],[]], live_returns = [[],[]],
                             name = "daily-returns.png", width = 11.5, height = 2.5,
                             live_color = "#ff9914", backtest_color = "#71c3fc", gray = "#b3bcc0"):
         if len(returns[0]) == 0:
-            fig = plt.figure()
-            fig.set_size_inches(width, height)
-
-            left, box_width = .25, .5
-            bottom, box_height = .25, .5
-            right = left + box_width
-            top = bottom + box_height
-
-            ax = fig.add_axes([0, 0, 1, 1])
-            ax.text(0.5 * (left + right), 0.5 * (top + bottom), 'Insufficient Data', color="#d5d5d5",
-                    horizontalalignment='center',
-                    verticalalignment='center',
-                    fontsize=20,
-                    transform=ax.transAxes)
-
-            ax.axis('off')
-
-            for _, spine in ax.spines.items():
-                spine.set_visible(False)
-
-            base64 = self.fig_to_base64(name, fig)
-            plt.cla()
-            plt.clf()
-            plt.close('all')
-            return base64
+            return self.insufficient_data_to_base64(name, width, height, 20)
 
         returns[0] = list(returns[0])
         returns[1] = list(returns[1])
         live_returns[0] = list(live_returns[0])
         live_returns[1] = list(live_returns[1])
 
-        plt.figure()
-        ax = plt.gca()
+        fig = new_figure()
+        ax = fig.add_subplot(111)
 
         backtest_series = pd.Series(returns[1], index=returns[0])
         live_series = pd.Series(live_returns[1], index=live_returns[0])
@@ -308,7 +541,7 @@ class ReportCharts:
 
         # Need to handle this since we don't use a legend if it is only backtesting
         if len(live_returns[0]) > 0:
-            rectangles = [plt.Rectangle((0, 0), 1, 1, fc=backtest_color), plt.Rectangle((0, 0), 1, 1, fc=live_color)]
+            rectangles = [Rectangle((0, 0), 1, 1, fc=backtest_color), Rectangle((0, 0), 1, 1, fc=live_color)]
             ax.legend(rectangles, [label for label in ['Backtest', "Live"]], handlelength=0.8, handleheight=0.8,
                       frameon=False, fontsize=8)
 
@@ -320,19 +553,18 @@ class ReportCharts:
         ax.set_xlabel("")
         ax.yaxis.set_major_formatter(ticker.PercentFormatter())
         ax.xaxis.set_major_formatter(DateFormatter("%b %Y"))
-        plt.axhline(y = 0, color = '#d5d5d5')
-        plt.setp(ax.spines.values(), color='#d5d5d5')
-        plt.setp([ax.get_xticklines(), ax.get_yticklines()], color='#d5d5d5')
+        ax.axhline(y = 0, color = '#d5d5d5')
+        setp(ax.spines.values(), color='#d5d5d5')
+        setp([ax.get_xticklines(), ax.get_yticklines()], color='#d5d5d5')
         ax.spines['right'].set_visible(False)
         ax.spines['top'].set_visible(False)
         ax.set_axisbelow(True)
         ax.yaxis.grid(True, color = "#ececec")
         fig.set_size_inches(width, height)
         base64 = self.fig_to_base64(name, fig)
-        plt.cla()
-        plt.clf()
         return base64
 
+    @cached_chart
     def GetMonthlyReturns(self, returns = {}, live_returns = {}, width=7, height=5, name='monthly-returns.png'):
         '''
         Expects monthly returns in dictionary keyed by year containing a list of monthly returns (as percentage values, i.e. 1% is 1.0 in the list).
@@ -347,31 +579,7 @@ class ReportCharts:
 
         if len(returns) == 0:
             print("No monthly returns found")
-            fig = plt.figure()
-            fig.set_size_inches(width, height)
-
-            left, box_width = .25, .5
-            bottom, box_height = .25, .5
-            right = left + box_width
-            top = bottom + box_height
-
-            ax = fig.add_axes([0, 0, 1, 1])
-            ax.text(0.5 * (left + right), 0.5 * (top + bottom), 'Insufficient Data', color="#d5d5d5",
-                    horizontalalignment='center',
-                    verticalalignment='center',
-                    fontsize=30,
-                    transform=ax.transAxes)
-
-            ax.axis('off')
-
-            for _, spine in ax.spines.items():
-                spine.set_visible(False)
-
-            base64 = self.fig_to_base64(name, fig)
-            plt.cla()
-            plt.clf()
-            plt.close('all')
-            return base64
+            return self.insufficient_data_to_base64(name, width, height, 30)
 
         # Make data frame
         returns = pd.DataFrame(returns, index = months).transpose()
@@ -383,12 +591,13 @@ class ReportCharts:
                   c('#00FF00'), c('#00CC00')]
 
         abs_cmap = matplotlib.colors.LinearSegmentedColormap.from_list('monthly_returns', colors)
-        norm = plt.Normalize(-10, 10)
+        norm = mcolors.Normalize(-10, 10)
 
         if len(live_returns) > 0:
             live_returns = pd.DataFrame(live_returns, index=months).transpose()
 
-            fig, ax = plt.subplots(2, 1, gridspec_kw={'height_ratios': [6, 1]})
+            fig = new_figure()
+            ax = fig.subplots(2, 1, gridspec_kw={'height_ratios': [6, 1]})
             #ax[0].matshow(returns, aspect='auto', cmap=c_map, interpolation='none', vmin=-10, vmax=10)
             #ax[1].matshow(live_returns, aspect='auto', cmap=live_c_map, interpolation='none')
             ax[0].matshow(returns, aspect='auto', cmap=abs_cmap, norm=norm, interpolation='none')
@@ -424,27 +633,28 @@ class ReportCharts:
             ax[1].tick_params(axis='y', color='#d5d5d5')
 
         else:
-            ax = plt.imshow(returns, aspect='auto', cmap=abs_cmap, norm=norm, interpolation='none')
-            fig = ax.get_figure()
-            plt.xlabel('')
-            plt.ylabel('')
-            plt.gca().tick_params(axis='x', color='#d5d5d5')
-            plt.gca().tick_params(axis='y', color='#d5d5d5')
-            plt.yticks(range(len(returns.index.values)), returns.index.values, fontsize=8)
-            plt.xticks(range(12), ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"])
+            fig = new_figure()
+            ax = fig.add_subplot(111)
+            ax.imshow(returns, aspect='auto', cmap=abs_cmap, norm=norm, interpolation='none')
+            ax.set_xlabel('')
+            ax.set_ylabel('')
+            ax.tick_params(axis='x', color='#d5d5d5')
+            ax.tick_params(axis='y', color='#d5d5d5')
+            ax.set_yticks(range(len(returns.index.values)))
+            ax.set_yticklabels(returns.index.values, fontsize=8)
+            ax.set_xticks(range(12))
+            ax.set_xticklabels(["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"])
             for (j, i), label in np.ndenumerate(returns):
                 if np.isnan(label):
-                    plt.text(i, j, "", ha='center', va='center', fontsize=7)
+                    ax.text(i, j, "", ha='center', va='center', fontsize=7)
                 else:
-                    plt.text(i, j, str(round(label, 1)), ha='center', va='center', fontsize=7)
+                    ax.text(i, j, str(round(label, 1)), ha='center', va='center', fontsize=7)
 
         fig.set_size_inches(width, height)
         base64 = self.fig_to_base64(name, fig)
-        plt.cla()
-        plt.clf()
-        plt.close('all')
         return base64
 
+    @cached_chart
     def GetAnnualReturns(self, data = None, live_data = None, name = "annual-returns.png",width = 3.5*2, height = 2.5*2):
 
         live_color = "#ff9914"
@@ -456,38 +666,14 @@ class ReportCharts:
             live_data = [[], []]
 
         if len(data[0]) == 0:
-            fig = plt.figure()
-            fig.set_size_inches(width, height)
-
-            left, box_width = .25, .5
-            bottom, box_height = .25, .5
-            right = left + box_width
-            top = bottom + box_height
-
-            ax = fig.add_axes([0, 0, 1, 1])
-            ax.text(0.5 * (left + right), 0.5 * (top + bottom), 'Insufficient Data', color="#d5d5d5",
-                    horizontalalignment='center',
-                    verticalalignment='center',
-                    fontsize=30,
-                    transform=ax.transAxes)
-
-            ax.axis('off')
-
-            for _, spine in ax.spines.items():
-                spine.set_visible(False)
-
-            base64 = self.fig_to_base64(name, fig)
-            plt.cla()
-            plt.clf()
-            plt.close('all')
-            return base64
+            return self.insufficient_data_to_base64(name, width, height, 30)
 
         # Cast to list just in case
         time = list(data[0]) + list(live_data[0])
         returns = list(data[1]) + list(live_data[1])
 
-        plt.figure()
-        ax = plt.gca()
+        fig = new_figure()
+        ax = fig.add_subplot(111)
         # Prevent value speculation on the y-axis ticks by
         # converting to string before plotting.
         ax.barh([str(i) for i in time], returns, color = [backtest_color], zorder=1)
@@ -495,69 +681,47 @@ class ReportCharts:
         ax.xaxis.set_major_formatter(ticker.PercentFormatter())
 
         fig = ax.get_figure()
-        plt.xticks(rotation=0, ha='center', fontsize=8)
-        plt.yticks(fontsize=8)
-        plt.axvline(x=0, color='#d5d5d5', linewidth=0.5)
-        vline = plt.axvline(x=np.mean(returns), color="red", ls="dashed", label="mean", linewidth=1)
-        plt.legend([vline], ["mean"], loc='upper right', frameon=False, fontsize=8)
-        plt.setp(ax.spines.values(), color='#d5d5d5')
-        plt.setp([ax.get_xticklines(), ax.get_yticklines()], color='#d5d5d5')
+        setp(ax.get_xticklabels(), rotation=0, ha='center', fontsize=8)
+        setp(ax.get_yticklabels(), fontsize=8)
+        ax.axvline(x=0, color='#d5d5d5', linewidth=0.5)
+        vline = ax.axvline(x=np.mean(returns), color="red", ls="dashed", label="mean", linewidth=1)
+        ax.legend([vline], ["mean"], loc='upper right', frameon=False, fontsize=8)
+        setp(ax.spines.values(), color='#d5d5d5')
+        setp([ax.get_xticklines(), ax.get_yticklines()], color='#d5d5d5')
         ax.grid(color='#d5d5d5', axis='x', linewidth=1, zorder=0)
         ax.set_axisbelow(True)
         ax.spines['right'].set_visible(False)
         ax.spines['top'].set_visible(False)
-        plt.xlabel("")
-        plt.ylabel("")
+        ax.set_xlabel("")
+        ax.set_ylabel("")
         ax.xaxis.grid(True)
         fig.set_size_inches(width, height)
         base64 = self.fig_to_base64(name, fig)
-        plt.cla()
-        plt.clf()
-        plt.close('all')
         return base64
 
+    @cached_chart
     def GetDrawdown(self, data = [[],[]], live_data = [[],[]], worst = [{}], name = "drawdowns.png",
-                        width = 11.5, height = 2.5, gray = "#b3bcc0"):
+                        width = 11.5, height = 2.5, gray = "#b3bcc0", downsample = False):
+        '''
+        downsample: True to draw at most four points per pixel column, for long high resolution series
+        '''
 
         if len(data[0]) == 0:
-            fig = plt.figure()
-            fig.set_size_inches(width, height)
-
-            left, box_width = .25, .5
-            bottom, box_height = .25, .5
-            right = left + box_width
-            top = bottom + box_height
-
-            ax = fig.add_axes([0, 0, 1, 1])
-            ax.text(0.5 * (left + right), 0.5 * (top + bottom), 'Insufficient Data', color="#d5d5d5",
-                    horizontalalignment='center',
-                    verticalalignment='center',
-                    fontsize=20,
-                    transform=ax.transAxes)
-
-            ax.axis('off')
-
-            for _, spine in ax.spines.items():
-                spine.set_visible(False)
-
-            base64 = self.fig_to_base64(name, fig)
-            plt.cla()
-            plt.clf()
-            plt.close('all')
-            return base64
+            return self.insufficient_data_to_base64(name, width, height, 20)
 
         time = list(data[0]) + list(live_data[0])
         drawdown = list(data[1]) + list(live_data[1])
 
         colors = ["#FFCCCCCC", "#FFE5CCCC", "#FFFFCCCC", "#E5FFCCCC", "#CCFFCCCC"]
         labels = ["1st Worst", "2nd Worst", "3rd Worst", "4th Worst", "5th Worst"]
-        plt.figure()
-        ax = plt.gca()
+        fig = new_figure()
+        ax = fig.add_subplot(111)
         ax.xaxis.set_major_formatter(DateFormatter("%b %Y"))
 
         # Backtest
         #ax.plot(time, drawdown, color=gray, zorder=2)
-        ax.fill_between(time, drawdown, 0, color=gray, zorder=3, step='post')
+        pixels = int(width * self.dpi) if downsample else None
+        ax.fill_between(*downsample_points(time, drawdown, pixels), 0, color=gray, zorder=3, step='post')
 
         for index, values in enumerate(worst):
             start = values['Begin']
@@ -569,8 +733,8 @@ class ReportCharts:
                 sub_data = drawdown[time.index(start):time.index(end)]
                 worst_point = time[drawdown.index(min(sub_data))]
 
-            plt.axvspan(start, end, 0, 0.95, color = colors[index], zorder = 1)
-            plt.axvline(worst_point, 0, 0.95, ls = 'dashed', color = 'black', zorder = 4, linewidth = 0.5)
+            ax.axvspan(start, end, 0, 0.95, color = colors[index], zorder = 1)
+            ax.axvline(worst_point, 0, 0.95, ls = 'dashed', color = 'black', zorder = 4, linewidth = 0.5)
             ax.text(worst_point, min(drawdown) * 0.75, labels[index], rotation = 90, zorder = 4, va='bottom')
 
         # Live
@@ -580,96 +744,72 @@ class ReportCharts:
         # No need to draw the live mode stuff since we've already taken care of it.
         # We're just after the Live trading dotted plot in case it exists
 
-        plt.axvline(live_time[0], 0, 0.95, ls='dotted', color='red', zorder=4) if len(live_time) > 0 else None
-        plt.text(live_time[0], min(min(drawdown), min(live_drawdown)) * 0.75, "Live Trading", rotation=90, zorder=4, fontsize=7) if len(live_time) > 0 else None
+        ax.axvline(live_time[0], 0, 0.95, ls='dotted', color='red', zorder=4) if len(live_time) > 0 else None
+        ax.text(live_time[0], min(min(drawdown), min(live_drawdown)) * 0.75, "Live Trading", rotation=90, zorder=4, fontsize=7) if len(live_time) > 0 else None
 
         fig = ax.get_figure()
-        plt.xticks(rotation=0, ha='center', fontsize=8)
-        plt.yticks(ticks=[i for i in plt.yticks()[0] if i <= 0], labels=['{:.1f}%'.format(i * 100) for i in plt.yticks()[0] if i <= 0], fontsize=8)
-        plt.ylabel("")
-        plt.xlabel("")
-        plt.axhline(y=0, color='#d5d5d5', zorder=1)
-        plt.setp(ax.spines.values(), color='#d5d5d5')
-        plt.setp([ax.get_xticklines(), ax.get_yticklines()], color='#d5d5d5')
+        setp(ax.get_xticklabels(), rotation=0, ha='center', fontsize=8)
+        ticks = [i for i in ax.get_yticks() if i <= 0]
+        ax.set_yticks(ticks)
+        ax.set_yticklabels(['{:.1f}%'.format(i * 100) for i in ticks], fontsize=8)
+        ax.set_ylabel("")
+        ax.set_xlabel("")
+        ax.axhline(y=0, color='#d5d5d5', zorder=1)
+        setp(ax.spines.values(), color='#d5d5d5')
+        setp([ax.get_xticklines(), ax.get_yticklines()], color='#d5d5d5')
         ax.spines['right'].set_visible(False)
         ax.spines['top'].set_visible(False)
         ax.yaxis.grid(True, color="#ececec")
         fig.set_size_inches(width, height)
         base64 = self.fig_to_base64(name, fig)
-        plt.cla()
-        plt.clf()
-        plt.close('all')
         return base64
 
+    @cached_chart
     def GetCrisisEventsPlots(self, data = [[],[],[]], name = '', width = 7, height = 5,
                              backtest_color = "#71c3fc", gray = "#b3bcc0"):
         if len(data[0]) == 0:
-            fig = plt.figure()
+            fig = new_figure()
             fig.set_size_inches(width, height)
             base64 = self.fig_to_base64(f'{name}.png', fig)
-            plt.cla()
-            plt.clf()
-            plt.close('all')
             return base64
 
-        plt.figure()
-        ax = plt.gca()
+        fig = new_figure()
+        ax = fig.add_subplot(111)
         fig = ax.get_figure()
         ax.xaxis.set_major_formatter(DateFormatter("%Y-%m-%d"))
         colors = [backtest_color, gray]
         for j, values in enumerate(data[1:]):
             ax.plot(data[0][:min(len(data[0]),len(values))], values, color=colors[j], linewidth=0.5, zorder=2, drawstyle='steps-post')
         labels = ['Backtest', 'Benchmark']
-        rectangles = [plt.Rectangle((0, 0), 1, 1, fc=backtest_color), plt.Rectangle((0, 0), 1, 1, fc=gray)]
+        rectangles = [Rectangle((0, 0), 1, 1, fc=backtest_color), Rectangle((0, 0), 1, 1, fc=gray)]
         leg = ax.legend(rectangles, labels, handlelength=0.8, handleheight=0.8,
                         frameon=False, fontsize=8, ncol=len(labels))
         for line in leg.get_lines(): line.set_linewidth(3)
-        plt.axhline(y=0, color= gray, zorder=1)
-        plt.setp(ax.spines.values(), color='#d5d5d5')
+        ax.axhline(y=0, color= gray, zorder=1)
+        setp(ax.spines.values(), color='#d5d5d5')
         ax.tick_params(axis='x', labelsize=8, labelrotation=45)
-        plt.yticks(ticks=plt.yticks()[0], labels=['{0:g}%'.format(i * 100) for i in plt.yticks()[0]], fontsize=8)
-        plt.setp([ax.get_xticklines(), ax.get_yticklines()], color='#d5d5d5')
+        ticks = ax.get_yticks()
+        ax.set_yticks(ticks)
+        ax.set_yticklabels(['{0:g}%'.format(i * 100) for i in ticks], fontsize=8)
+        setp([ax.get_xticklines(), ax.get_yticklines()], color='#d5d5d5')
         ax.spines['right'].set_visible(False)
         ax.spines['top'].set_visible(False)
-        plt.xlabel("")
-        plt.ylabel("")
+        ax.set_xlabel("")
+        ax.set_ylabel("")
         ax.yaxis.grid(True, color="#ececec")
         fig.set_size_inches(width, height)
         base64 = self.fig_to_base64(f'{name}.png', fig)
-        plt.cla()
-        plt.clf()
-        plt.close('all')
         return base64
 
+    @cached_chart
     def GetRollingBeta(self, data = [[],[],[],[]], live_data = [[],[],[],[]], name = "rolling-portfolio-beta-to-equity.png",
-                           width = 11.5, height = 2.5):
+                           width = 11.5, height = 2.5, downsample = False):
+        '''
+        downsample: True to draw at most four points per pixel column of each line, for long high resolution series
+        '''
 
         if len(data[0]) == 0 and len(live_data[0]) == 0:
-            fig = plt.figure()
-            fig.set_size_inches(width, height)
-
-            left, box_width = .25, .5
-            bottom, box_height = .25, .5
-            right = left + box_width
-            top = bottom + box_height
-
-            ax = fig.add_axes([0, 0, 1, 1])
-            ax.text(0.5 * (left + right), 0.5 * (top + bottom), 'Insufficient Data', color="#d5d5d5",
-                    horizontalalignment='center',
-                    verticalalignment='center',
-                    fontsize=20,
-                    transform=ax.transAxes)
-
-            ax.axis('off')
-
-            for _, spine in ax.spines.items():
-                spine.set_visible(False)
-
-            base64 = self.fig_to_base64(name, fig)
-            plt.cla()
-            plt.clf()
-            plt.close('all')
-            return base64
+            return self.insufficient_data_to_base64(name, width, height, 20)
 
         # Data will come in the following format:
         # [six month rolling beta time, six month rolling beta, twelve month rolling beta time, twelve month rolling beta]
@@ -684,80 +824,55 @@ class ReportCharts:
 
         if len(backtest_six_month_beta) > 0:
             labels += ['6 mo.', '12 mo.']
-            rectangles += [plt.Rectangle((0, 0), 1, 1, fc="#71c3fc"), plt.Rectangle((0, 0), 1, 1, fc="#1d7dc1")]
+            rectangles += [Rectangle((0, 0), 1, 1, fc="#71c3fc"), Rectangle((0, 0), 1, 1, fc="#1d7dc1")]
         if len(live_six_month_beta) > 0:
             labels += ['Live 6 mo.', 'Live 12 mo.']
-            rectangles += [plt.Rectangle((0, 0), 1, 1, fc="#ff9914"), plt.Rectangle((0, 0), 1, 1, fc="#ffd700")]
+            rectangles += [Rectangle((0, 0), 1, 1, fc="#ff9914"), Rectangle((0, 0), 1, 1, fc="#ffd700")]
 
-        plt.figure()
-        ax = plt.gca()
+        fig = new_figure()
+        ax = fig.add_subplot(111)
         fig = ax.get_figure()
         ax.xaxis.set_major_formatter(DateFormatter("%b %Y"))
 
+        pixels = int(width * self.dpi) if downsample else None
         if len(backtest_six_month_beta_dates) > 0:
             # Backtest
-            ax.plot(backtest_six_month_beta_dates, backtest_six_month_beta, linewidth = 0.5, color = "#71c3fc")
-            ax.plot(backtest_twelve_month_beta_dates, backtest_twelve_month_beta, linewidth=0.5, color="#1d7dc1")
+            ax.plot(*downsample_points(backtest_six_month_beta_dates, backtest_six_month_beta, pixels), linewidth = 0.5, color = "#71c3fc")
+            ax.plot(*downsample_points(backtest_twelve_month_beta_dates, backtest_twelve_month_beta, pixels), linewidth=0.5, color="#1d7dc1")
 
         # Live
         if len(live_six_month_beta) > 0:
-            ax.plot(live_six_month_beta_dates, live_six_month_beta, linewidth=0.5, color="#ff9914")
-            ax.plot(live_twelve_month_beta_dates, live_twelve_month_beta, linewidth=0.5, color="#ffd700")
+            ax.plot(*downsample_points(live_six_month_beta_dates, live_six_month_beta, pixels), linewidth=0.5, color="#ff9914")
+            ax.plot(*downsample_points(live_twelve_month_beta_dates, live_twelve_month_beta, pixels), linewidth=0.5, color="#ffd700")
 
         leg = ax.legend(rectangles, labels, handlelength=0.8, handleheight=0.8,
                         frameon=False, fontsize=8, ncol=2)
         for line in leg.get_lines(): line.set_linewidth(3)
-        plt.axhline(y=0, color='#d5d5d5', zorder=1)
-        plt.setp(ax.spines.values(), color='#d5d5d5')
+        ax.axhline(y=0, color='#d5d5d5', zorder=1)
+        setp(ax.spines.values(), color='#d5d5d5')
         ax.tick_params(axis='both', labelsize=8, labelrotation=0)
-        plt.setp([ax.get_xticklines(), ax.get_yticklines()], color='#d5d5d5')
-        plt.xlabel("")
-        plt.ylabel("")
+        setp([ax.get_xticklines(), ax.get_yticklines()], color='#d5d5d5')
+        ax.set_xlabel("")
+        ax.set_ylabel("")
         ax.set_axisbelow(True)
         ax.spines['right'].set_visible(False)
         ax.spines['top'].set_visible(False)
         ax.yaxis.grid(True, color="#ececec")
         fig.set_size_inches(width, height)
         base64 = self.fig_to_base64(name, fig)
-        plt.cla()
-        plt.clf()
-        plt.close('all')
         return base64
 
+    @cached_chart
     def GetRollingSharpeRatio(self, data = [[],[]], live_data = [[],[]], name = "rolling-sharpe-ratio.png",
                                   width = 11.5, height = 2.5, live_color = "#ff9914", backtest_color = "#71c3fc"):
         if len(data[0]) == 0:
-            fig = plt.figure()
-            fig.set_size_inches(width, height)
-
-            left, box_width = .25, .5
-            bottom, box_height = .25, .5
-            right = left + box_width
-            top = bottom + box_height
-
-            ax = fig.add_axes([0, 0, 1, 1])
-            ax.text(0.5 * (left + right), 0.5 * (top + bottom), 'Insufficient Data', color="#d5d5d5",
-                    horizontalalignment='center',
-                    verticalalignment='center',
-                    fontsize=20,
-                    transform=ax.transAxes)
-
-            ax.axis('off')
-
-            for _, spine in ax.spines.items():
-                spine.set_visible(False)
-
-            base64 = self.fig_to_base64(name, fig)
-            plt.cla()
-            plt.clf()
-            plt.close('all')
-            return base64
+            return self.insufficient_data_to_base64(name, width, height, 20)
 
         labels = ['6 mo.']
-        rectangles = [plt.Rectangle((0, 0), 1, 1, fc=backtest_color)]
+        rectangles = [Rectangle((0, 0), 1, 1, fc=backtest_color)]
 
-        plt.figure()
-        ax = plt.gca()
+        fig = new_figure()
+        ax = fig.add_subplot(111)
         ax.xaxis.set_major_formatter(DateFormatter("%b %Y"))
 
         backtest_rolling_sharpe_dates, backtest_rolling_sharpe = (data[0], data[1])
@@ -766,7 +881,7 @@ class ReportCharts:
         # Check after the fact if we have any live values since we might not be far
         # enough into live trading to generate the live rolling sharpe graph
         if len(live_rolling_sharpe) > 0:
-            rectangles += [plt.Rectangle((0, 0,), 1, 1, fc=live_color)]
+            rectangles += [Rectangle((0, 0,), 1, 1, fc=live_color)]
             labels += ["Live 6 mo."]
 
         # Backtest
@@ -778,12 +893,12 @@ class ReportCharts:
         leg = ax.legend(rectangles, labels, handlelength=0.8, handleheight=0.8,
                         frameon=False, fontsize=8)
         for line in leg.get_lines(): line.set_linewidth(3)
-        plt.axhline(y=0, color='#d5d5d5', zorder=1)
-        plt.setp(ax.spines.values(), color='#d5d5d5')
+        ax.axhline(y=0, color='#d5d5d5', zorder=1)
+        setp(ax.spines.values(), color='#d5d5d5')
         ax.tick_params(axis='both', labelsize=8, labelrotation=0)
-        plt.setp([ax.get_xticklines(), ax.get_yticklines()], color='#d5d5d5')
-        plt.ylabel("")
-        plt.xlabel("")
+        setp([ax.get_xticklines(), ax.get_yticklines()], color='#d5d5d5')
+        ax.set_ylabel("")
+        ax.set_xlabel("")
         ax.set_axisbelow(True)
         ax.spines['right'].set_visible(False)
         ax.spines['top'].set_visible(False)
@@ -791,38 +906,13 @@ class ReportCharts:
         fig = ax.get_figure()
         fig.set_size_inches(width, height)
         base64 = self.fig_to_base64(name, fig)
-        plt.cla()
-        plt.clf()
-        plt.close('all')
         return base64
 
+    @cached_chart
     def GetAssetAllocation(self, data = [[],[]], live_data = [[],[]],
                               name="asset-allocation.png", width = 7, height = 5):
         if len(data[0]) == 0:
-            fig = plt.figure()
-            fig.set_size_inches(width, height)
-
-            left, box_width = .25, .5
-            bottom, box_height = .25, .5
-            right = left + box_width
-            top = bottom + box_height
-
-            ax = fig.add_axes([0, 0, 1, 1])
-            ax.text(0.5 * (left + right), 0.5 * (top + bottom), 'Insufficient Data', color="#d5d5d5",
-                    horizontalalignment='center',
-                    verticalalignment='center',
-                    fontsize=30,
-                    transform=ax.transAxes)
-
-            ax.axis('off')
-
-            for _, spine in ax.spines.items():
-                spine.set_visible(False)
-
-            base64 = self.fig_to_base64(name, fig)
-            plt.cla()
-            plt.clf()
-            plt.close('all')
+            base64 = self.insufficient_data_to_base64(name, width, height, 30)
             return {"Backtest Asset Allocation": base64}
 
         symbols = [data[0], live_data[0]]
@@ -847,119 +937,74 @@ class ReportCharts:
 
             labels = [f'{symbol}\n' + '{:.2f}%'.format(value * 100) for symbol, value in zip(symbols_to_use, to_label)]
 
-            fig = plt.figure()
-            plt.pie(to_label, colors = colors)
-            plt.legend(labels, frameon = False, fontsize = 8, loc = 'center left', bbox_to_anchor=(0, 0.5))
-            plt.axis('equal')
+            fig = new_figure()
+            ax = fig.add_subplot(111)
+            ax.pie(to_label, colors = colors)
+            ax.legend(labels, frameon = False, fontsize = 8, loc = 'center left', bbox_to_anchor=(0, 0.5))
+            ax.axis('equal')
             fig.set_size_inches(width, height)
             if i == 0:
                 pies["Backtest Asset Allocation"] = self.fig_to_base64(f"asset-allocation-backtest.png", fig)
             else:
                 pies["Live Asset Allocation"] = self.fig_to_base64(f"asset-allocation-live.png", fig)
-            plt.cla()
-            plt.clf()
-            plt.close('all')
 
         pies["filler"] = ''
 
         return pies
 
+    @cached_chart
     def GetLeverage(self, data = [[],[]], live_data = [[],[]], name = "leverage.png",width = 11.5,
-                        height = 2.5, backtest_color = "#71c3fc", live_color = "#ff9914",):
+                        height = 2.5, backtest_color = "#71c3fc", live_color = "#ff9914", downsample = False):
+        '''
+        downsample: True to draw at most four points per pixel column, for long high resolution series
+        '''
 
         if len(data[0]) == 0:
-            fig = plt.figure()
-            fig.set_size_inches(width, height)
-
-            left, box_width = .25, .5
-            bottom, box_height = .25, .5
-            right = left + box_width
-            top = bottom + box_height
-
-            ax = fig.add_axes([0, 0, 1, 1])
-            ax.text(0.5 * (left + right), 0.5 * (top + bottom), 'Insufficient Data', color="#d5d5d5",
-                    horizontalalignment='center',
-                    verticalalignment='center',
-                    fontsize=20,
-                    transform=ax.transAxes)
-
-            ax.axis('off')
-
-            for _, spine in ax.spines.items():
-                spine.set_visible(False)
-
-            base64 = self.fig_to_base64(name, fig)
-            plt.cla()
-            plt.clf()
-            plt.close('all')
-            return base64
+            return self.insufficient_data_to_base64(name, width, height, 20)
 
         labels = ['Backtest']
 
-        plt.figure()
-        ax = plt.gca()
+        fig = new_figure()
+        ax = fig.add_subplot(111)
         fig = ax.get_figure()
 
         # Backtest
-        ax.fill_between(data[0], 0, data[1], color = backtest_color, alpha = 0.75, step='post')
+        pixels = int(width * self.dpi) if downsample else None
+        backtest_time, backtest_leverage = downsample_points(data[0], data[1], pixels)
+        ax.fill_between(backtest_time, 0, backtest_leverage, color = backtest_color, alpha = 0.75, step='post')
 
         # Live
         if len(live_data[0]) != 0:
             labels.append('Live')
 
-        ax.fill_between(live_data[0], 0, live_data[1], color=live_color, alpha=0.75, step = 'post')
+        live_time, live_leverage = downsample_points(live_data[0], live_data[1], pixels)
+        ax.fill_between(live_time, 0, live_leverage, color=live_color, alpha=0.75, step = 'post')
 
-        rectangles = [plt.Rectangle((0, 0), 1, 1, fc=backtest_color), plt.Rectangle((0, 0), 1, 1, fc=live_color)]
+        rectangles = [Rectangle((0, 0), 1, 1, fc=backtest_color), Rectangle((0, 0), 1, 1, fc=live_color)]
         ax.legend(rectangles, [label for label in labels], handlelength=0.8, handleheight=0.8,
                   frameon=False, fontsize=8)
         ax.set_xticklabels(ax.get_xticklabels(), rotation=0, ha='center')
         ax.tick_params(axis='both', labelsize=8, labelrotation=0)
         ax.xaxis.set_major_formatter(DateFormatter("%b %Y"))
-        plt.axhline(y=0, color='#d5d5d5')
-        plt.setp(ax.spines.values(), color='#d5d5d5')
-        plt.setp([ax.get_xticklines(), ax.get_yticklines()], color='#d5d5d5')
-        plt.ylabel("")
-        plt.xlabel("")
+        ax.axhline(y=0, color='#d5d5d5')
+        setp(ax.spines.values(), color='#d5d5d5')
+        setp([ax.get_xticklines(), ax.get_yticklines()], color='#d5d5d5')
+        ax.set_ylabel("")
+        ax.set_xlabel("")
         ax.set_axisbelow(True)
         ax.spines['right'].set_visible(False)
         ax.spines['top'].set_visible(False)
         ax.yaxis.grid(True, color="#ececec")
         fig.set_size_inches(width, height)
         base64 = self.fig_to_base64(name, fig)
-        plt.cla()
-        plt.clf()
-        plt.close('all')
         return base64
 
+    @cached_chart
     def GetExposure(self, time = [], long_securities = [], short_securities = [], long_data = [[]], short_data = [[]],
                         live_time = [], live_long_securities = [], live_short_securities = [], live_long_data = [[]],
                         live_short_data = [[]], name = "exposure.png", width = 11.5, height = 2.5):
         if len(time) == 0:
-            fig = plt.figure()
-            fig.set_size_inches(width, height)
-
-            left, box_width = .25, .5
-            bottom, box_height = .25, .5
-            right = left + box_width
-            top = bottom + box_height
-
-            ax = fig.add_axes([0, 0, 1, 1])
-            ax.text(0.5 * (left + right), 0.5 * (top + bottom), 'Insufficient Data', color="#d5d5d5",
-                    horizontalalignment='center',
-                    verticalalignment='center',
-                    fontsize=20,
-                    transform=ax.transAxes)
-
-            ax.axis('off')
-
-            for _, spine in ax.spines.items():
-                spine.set_visible(False)
-
-            base64 = self.fig_to_base64(name, fig)
-            plt.cla()
-            plt.clf()
-            plt.close('all')
-            return base64
+            return self.insufficient_data_to_base64(name, width, height, 20)
 
         color_map = {'Equity': "#71c3fc", 'Option':'#A0522D', 'Commodity':'#4B0082',
                     'Forex':'#0000FF', 'Future':'#6B8E23', 'Cfd':'#FF8C00', 'Crypto':'#BDB76B'}
@@ -975,7 +1020,8 @@ class ReportCharts:
         labels = long_securities + short_securities
         live_labels = live_long_securities + live_short_securities
 
-        ax = plt.gca()
+        fig = new_figure()
+        ax = fig.add_subplot(111)
 
         # Create step plot for the stackplot by adding a value
         # right before the next data point with the same previous value
@@ -1088,27 +1134,24 @@ class ReportCharts:
 
         labels = list(set(labels))
         live_labels = list(set(live_labels))
-        rectangles = [plt.Rectangle((0, 0), 1, 1, fc=color_map[lab]) for lab in labels]
-        live_rectangles = [plt.Rectangle((0, 0), 1, 1, fc=live_color_map[lab]) for lab in live_labels]
+        rectangles = [Rectangle((0, 0), 1, 1, fc=color_map[lab]) for lab in labels]
+        live_rectangles = [Rectangle((0, 0), 1, 1, fc=live_color_map[lab]) for lab in live_labels]
         ax.legend(rectangles + live_rectangles, labels + [f'{lab} - Live' for lab in live_labels], handlelength=0.8,
                   handleheight=0.8, frameon=False, fontsize=8, ncol=len(labels), loc='upper right')
         fig = ax.get_figure()
-        plt.xticks(rotation = 0,ha = 'center', fontsize = 8)
-        plt.yticks(fontsize = 8)
-        plt.xlabel("")
+        setp(ax.get_xticklabels(), rotation = 0, ha = 'center', fontsize = 8)
+        setp(ax.get_yticklabels(), fontsize = 8)
+        ax.set_xlabel("")
         ax.axhline(y=0, color = 'black', linewidth = 0.5)
         ax.xaxis.set_major_formatter(DateFormatter("%b %Y"))
-        plt.setp(ax.spines.values(), color='#d5d5d5')
+        setp(ax.spines.values(), color='#d5d5d5')
         ax.spines['right'].set_visible(False)
         ax.spines['top'].set_visible(False)
-        plt.setp([ax.get_xticklines(), ax.get_yticklines()], color='#d5d5d5')
-        plt.ylabel("")
-        plt.xlabel("")
+        setp([ax.get_xticklines(), ax.get_yticklines()], color='#d5d5d5')
+        ax.set_ylabel("")
+        ax.set_xlabel("")
         ax.set_axisbelow(True)
         ax.yaxis.grid(True, color = "#ececec")
         fig.set_size_inches(width, height)
         base64 = self.fig_to_base64(name, fig)
-        plt.cla()
-        plt.clf()
-        plt.close('all')
         return base64
\ No newline at end of file
@@ -13,7 +13,11 @@
  * limitations under the License.
 */
 
+using System;
+using System.Linq;
+using System.Runtime.CompilerServices;
 using Python.Runtime;
+using QuantConnect.Configuration;
 using QuantConnect.Python;
 
 
@@ -21,12 +25,74 @@ namespace QuantConnect.Report.ReportElements
 {
     internal abstract class ChartReportElement : ReportElement
     {
-        internal static dynamic Charting;
+        private static readonly Lazy<dynamic> _charting = new Lazy<dynamic>(CreateCharting);
+        private static readonly Lazy<dynamic> _aggregatesModule = new Lazy<dynamic>(() => ImportModule("ReportAggregates"));
+        private static readonly ConditionalWeakTable<Result, PyObject> _aggregates = new ConditionalWeakTable<Result, PyObject>();
+
+        /// <summary>
+        /// Chart module instance shared by the charts of every report generated in this process
+        /// </summary>
+        internal static dynamic Charting => _charting.Value;
 
         /// <summary>
         /// Charting base class report element
         /// </summary>
         protected ChartReportElement()
+        {
+            // The chart module is imported by the first chart element only
+            _ = _charting.Value;
+        }
+
+        /// <summary>
+        /// Aggregates of the equity curve and benchmark of a result, computed by the ReportAggregates module.
+        /// The same instance is shared by the charts of the result, so they reuse its daily and monthly values.
+        /// Must be called while holding the GIL
+        /// </summary>
+        /// <param name="result">Backtest or live result, null for empty aggregates</param>
+        protected static dynamic Aggregates(Result result)
+        {
+            if (result == null)
+            {
+                return _aggregatesModule.Value.ReportAggregates();
+            }
+
+            return _aggregates.GetValue(result, CreateAggregates);
+        }
+
+        /// <summary>
+        /// Creates the aggregates of the equity curve and benchmark of a result
+        /// </summary>
+        private static PyObject CreateAggregates(Result result)
+        {
+            var equityPoints = ResultsUtil.EquityPoints(result);
+            var benchmarkPoints = ResultsUtil.BenchmarkPoints(result);
+
+            var equity = new PyList();
+            equity.Append(equityPoints.Keys.ToList().ToPython());
+            equity.Append(equityPoints.Values.ToList().ToPython());
+
+            var benchmark = new PyList();
+            benchmark.Append(benchmarkPoints.Keys.ToList().ToPython());
+            benchmark.Append(benchmarkPoints.Values.ToList().ToPython());
+
+            return _aggregatesModule.Value.ReportAggregates(equity, benchmark);
+        }
+
+        /// <summary>
+        /// Imports a Python module of the report
+        /// </summary>
+        private static dynamic ImportModule(string name)
+        {
+            using (Py.GIL())
+            {
+                return PythonEngine.ImportModule(name);
+            }
+        }
+
+        /// <summary>
+        /// Imports the chart module and creates the chart instance
+        /// </summary>
+        private static dynamic CreateCharting()
         {
             PythonInitializer.Initialize();
 
@@ -35,7 +101,14 @@ namespace QuantConnect.Report.ReportElements
                 dynamic module = PythonEngine.ImportModule("ReportCharts");
                 var classObj = module.ReportCharts;
 
-                Charting = classObj.Invoke();
+                // Chart images are PNG at 200 dpi unless configured otherwise
+                var imageFormat = Config.Get("report-image-format", "png");
+                var dpi = Config.GetInt("report-image-dpi", 200);
+
+                // Charts whose data did not change since a previous report are reused from the cache folder, if any
+                var cacheFolder = Config.Get("report-cache-folder");
+
+                return classObj.Invoke(false.ToPython(), imageFormat.ToPython(), dpi.ToPython(), cacheFolder.ToPython());
             }
         }
     }
@@ -13,9 +13,6 @@
  * limitations under the License.
 */
 
-using System;
-using System.Linq;
-using Deedle;
 using Python.Runtime;
 using QuantConnect.Packets;
 
@@ -46,31 +43,14 @@ namespace QuantConnect.Report.ReportElements
         /// </summary>
         public override string Render()
         {
-            var backtestReturns = ResultsUtil.EquityPoints(_backtest);
-            var liveReturns = ResultsUtil.EquityPoints(_live);
-
-            var backtestSeries = new Series<DateTime, double>(backtestReturns.Keys, backtestReturns.Values);
-            var liveSeries = new Series<DateTime, double>(liveReturns.Keys, liveReturns.Values);
-
-            // The following two operations are equivalent to the Pandas `DataFrame.resample(...)` method
-            var backtestResampled = backtestSeries.ResampleEquivalence(date => date.Date, s => s.LastValue()).PercentChange().DropMissing() * 100;
-            var liveResampled = liveSeries.ResampleEquivalence(date => date.Date, s => s.LastValue()).PercentChange().DropMissing() * 100;
-
             var base64 = "";
             using (Py.GIL())
             {
-                var backtestList = new PyList();
-                backtestList.Append(backtestResampled.Keys.ToList().ToPython());
-                backtestList.Append(backtestResampled.Values.ToList().ToPython());
-
-                var liveList = new PyList();
-                liveList.Append(liveResampled.Keys.ToList().ToPython());
-                liveList.Append(liveResampled.Values.ToList().ToPython());
-
-                base64 = Charting.GetDailyReturns(backtestList, liveList);
+                // Daily returns in percent, from the aggregates shared by the charts of each result
+                var backtestData = Aggregates(_backtest).ChartData("GetDailyReturns");
+                var liveData = Aggregates(_live).ChartData("GetDailyReturns");
 
-                backtestList.Dispose();
-                liveList.Dispose();
+                base64 = Charting.GetDailyReturns(backtestData, liveData);
             }
 
             return base64;
@@ -15,6 +15,9 @@
 
 using System;
 using System.Collections.Generic;
+using System.IO;
+using Newtonsoft.Json;
+using QuantConnect.Packets;
 
 namespace QuantConnect.Report
 {
@@ -81,5 +84,37 @@ namespace QuantConnect.Report
 
             return points;
         }
+
+        /// <summary>
+        /// Reads a backtest result from its json file
+        /// </summary>
+        /// <param name="file">Backtest result json file</param>
+        /// <returns>Backtest result object</returns>
+        public static BacktestResult ReadBacktestResult(string file)
+        {
+            var settings = new JsonSerializerSettings
+            {
+                Converters = new List<JsonConverter> { new NullResultValueTypeJsonConverter<BacktestResult>() },
+                FloatParseHandling = FloatParseHandling.Decimal
+            };
+
+            return JsonConvert.DeserializeObject<BacktestResult>(File.ReadAllText(file), settings);
+        }
+
+        /// <summary>
+        /// Reads a live result from its json file
+        /// </summary>
+        /// <param name="file">Live result json file</param>
+        /// <returns>Live result object</returns>
+        public static LiveResult ReadLiveResult(string file)
+        {
+            var settings = new JsonSerializerSettings
+            {
+                NullValueHandling = NullValueHandling.Ignore,
+                Converters = new List<JsonConverter> { new NullResultValueTypeJsonConverter<LiveResult>() }
+            };
+
+            return JsonConvert.DeserializeObject<LiveResult>(File.ReadAllText(file), settings);
+        }
     }
 }
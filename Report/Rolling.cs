@@ -14,7 +14,6 @@
 */
 
 using Deedle;
-using MathNet.Numerics.Statistics;
 using System;
 using System.Collections.Generic;
 using System.Linq;
@@ -47,14 +46,30 @@ namespace QuantConnect.Report
                 .FillMissing(Direction.Forward)
                 .DropSparseRows();
 
-            var correlation = returns
-                .Window(windowSize)
-                .SelectValues(x => Correlation.Pearson(x["strategy"].Values, x["benchmark"].Values));
+            var strategyReturns = returns.GetColumn<double>("strategy").Values.ToList();
+            var benchmarkReturnsValues = returns.GetColumn<double>("benchmark").Values.ToList();
+            var dates = returns.RowKeys.ToList();
 
-            var portfolioStandardDeviation = dailyReturnsSeries.Window(windowSize).SelectValues(s => s.StdDev());
-            var benchmarkStandardDeviation = benchmarkReturns.Window(windowSize).SelectValues(s => s.StdDev());
+            // Each window is the previous window with one more day and one less day
+            var moments = new RollingMoments();
+            var rollingBetaDates = new List<DateTime>();
+            var rollingBeta = new List<double>();
 
-            return (correlation * (portfolioStandardDeviation / benchmarkStandardDeviation))
+            for (var i = 0; i < dates.Count; i++)
+            {
+                moments.Add(strategyReturns[i], benchmarkReturnsValues[i]);
+                if (i >= windowSize)
+                {
+                    moments.Remove(strategyReturns[i - windowSize], benchmarkReturnsValues[i - windowSize]);
+                }
+                if (i >= windowSize - 1)
+                {
+                    rollingBetaDates.Add(dates[i]);
+                    rollingBeta.Add(moments.Beta);
+                }
+            }
+
+            return new Series<DateTime, double>(rollingBetaDates, rollingBeta)
                 .FillMissing(Direction.Forward)
                 .DropMissing();
         }
@@ -76,9 +91,16 @@ namespace QuantConnect.Report
             var dailyReturns = equityCurve.ResampleEquivalence(date => date.Date, s => s.LastValue())
                 .PercentChange();
 
+            var returns = dailyReturns.Observations.ToList();
             var rollingSharpeData = new List<KeyValuePair<DateTime, double>>();
             var firstDate = equityCurve.FirstKey();
 
+            // The returns between n months ago and each date are the returns of the previous date's window
+            // with the returns that entered and left it, the windows only move forward since dates are sorted
+            var moments = new RollingMoments();
+            var first = 0;
+            var last = 0;
+
             foreach (var date in equityCurve.Keys)
             {
                 var nMonthsAgo = date.AddMonths(-months);
@@ -87,11 +109,22 @@ namespace QuantConnect.Report
                     continue;
                 }
 
-                var algoPerformanceLookback = dailyReturns.Between(nMonthsAgo, date);
+                for (; last < returns.Count && returns[last].Key <= date; last++)
+                {
+                    moments.Add(returns[last].Value);
+                }
+                for (; first < last && returns[first].Key < nMonthsAgo; first++)
+                {
+                    moments.Remove(returns[first].Value);
+                }
+
+                // Same as Statistics.SharpeRatio of the returns of the window
+                var annualPerformance = Math.Pow(moments.MeanX + 1, 252) - 1;
+                var annualStandardDeviation = Math.Sqrt(moments.VarianceX * 252);
                 rollingSharpeData.Add(
                     new KeyValuePair<DateTime, double>(
                         date,
-                        Statistics.Statistics.SharpeRatio(algoPerformanceLookback.Values.ToList(), riskFreeRate)
+                        (annualPerformance - riskFreeRate) / annualStandardDeviation
                     )
                 );
             }
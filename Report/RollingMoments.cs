@@ -0,0 +1,146 @@
+﻿/*
+ * QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+ * Lean Algorithmic Trading Engine v2.0. Copyright 2014 QuantConnect Corporation.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+*/
+
+using System;
+
+namespace QuantConnect.Report
+{
+    /// <summary>
+    /// Means, sample variances and sample covariance of the pairs of values in a rolling window.
+    /// Pairs are added when they enter the window and removed when they leave it, each in constant time,
+    /// by updating the running means and the running sums of squared and cross deviations from the means.
+    /// The moments are NaN while the window holds a pair with a NaN or infinite value, like a window of a batch computation.
+    /// </summary>
+    public class RollingMoments
+    {
+        private double _meanX;
+        private double _meanY;
+        private double _squaresX;
+        private double _squaresY;
+        private double _products;
+        private int _count;
+        private int _nonFiniteCount;
+
+        /// <summary>
+        /// Number of pairs in the window
+        /// </summary>
+        public int Count => _count + _nonFiniteCount;
+
+        /// <summary>
+        /// Mean of the first values of the pairs
+        /// </summary>
+        public double MeanX => IsDefined(1) ? _meanX : double.NaN;
+
+        /// <summary>
+        /// Mean of the second values of the pairs
+        /// </summary>
+        public double MeanY => IsDefined(1) ? _meanY : double.NaN;
+
+        /// <summary>
+        /// Sample variance of the first values of the pairs
+        /// </summary>
+        public double VarianceX => IsDefined(2) ? Math.Max(_squaresX, 0) / (_count - 1) : double.NaN;
+
+        /// <summary>
+        /// Sample variance of the second values of the pairs
+        /// </summary>
+        public double VarianceY => IsDefined(2) ? Math.Max(_squaresY, 0) / (_count - 1) : double.NaN;
+
+        /// <summary>
+        /// Sample covariance of the first and second values of the pairs
+        /// </summary>
+        public double Covariance => IsDefined(2) ? _products / (_count - 1) : double.NaN;
+
+        /// <summary>
+        /// Beta of the first values to the second values, i.e. their covariance over the variance of the second values
+        /// </summary>
+        public double Beta => IsDefined(2) && _squaresY > 0 ? _products / _squaresY : double.NaN;
+
+        /// <summary>
+        /// Adds a pair to the window
+        /// </summary>
+        /// <param name="x">First value</param>
+        /// <param name="y">Second value, can be omitted when only the moments of the first values are used</param>
+        public void Add(double x, double y = 0)
+        {
+            if (!IsFinite(x, y))
+            {
+                _nonFiniteCount++;
+                return;
+            }
+
+            _count++;
+            var deltaX = x - _meanX;
+            var deltaY = y - _meanY;
+            _meanX += deltaX / _count;
+            _meanY += deltaY / _count;
+            _squaresX += deltaX * (x - _meanX);
+            _squaresY += deltaY * (y - _meanY);
+            _products += deltaX * (y - _meanY);
+        }
+
+        /// <summary>
+        /// Removes a pair that was added to the window
+        /// </summary>
+        /// <param name="x">First value</param>
+        /// <param name="y">Second value</param>
+        public void Remove(double x, double y = 0)
+        {
+            if (!IsFinite(x, y))
+            {
+                _nonFiniteCount--;
+                return;
+            }
+            if (_count <= 1)
+            {
+                _count = 0;
+                _meanX = _meanY = _squaresX = _squaresY = _products = 0;
+                return;
+            }
+
+            _count--;
+            var deltaX = x - _meanX;
+            var deltaY = y - _meanY;
+            _meanX -= deltaX / _count;
+            _meanY -= deltaY / _count;
+            _squaresX -= deltaX * (x - _meanX);
+            _squaresY -= deltaY * (y - _meanY);
+            _products -= deltaX * (y - _meanY);
+        }
+
+        /// <summary>
+        /// Removes every pair from the window
+        /// </summary>
+        public void Reset()
+        {
+            _count = 0;
+            _nonFiniteCount = 0;
+            _meanX = _meanY = _squaresX = _squaresY = _products = 0;
+        }
+
+        /// <summary>
+        /// Whether the window holds enough pairs for a moment and only finite ones
+        /// </summary>
+        private bool IsDefined(int minimumCount)
+        {
+            return _nonFiniteCount == 0 && _count >= minimumCount;
+        }
+
+        private static bool IsFinite(double x, double y)
+        {
+            return !double.IsNaN(x) && !double.IsInfinity(x) && !double.IsNaN(y) && !double.IsInfinity(y);
+        }
+    }
+}
@@ -0,0 +1,156 @@
+﻿/*
+ * QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+ * Lean Algorithmic Trading Engine v2.0. Copyright 2014 QuantConnect Corporation.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+*/
+
+using NUnit.Framework;
+using Python.Runtime;
+using QuantConnect.Logging;
+
+namespace QuantConnect.Tests.Algorithm.Framework.Portfolio
+{
+    [TestFixture]
+    public class BatchOptimizationTests
+    {
+        private const string Code = @"
+import numpy as np
+import pandas as pd
+from time import perf_counter
+from BatchOptimization import get_batch_covariance
+from CovarianceEstimators import LedoitWolfCovarianceEstimator
+from MaximumSharpeRatioPortfolioOptimizer import MaximumSharpeRatioPortfolioOptimizer
+from MinimumVariancePortfolioOptimizer import MinimumVariancePortfolioOptimizer
+from UnconstrainedMeanVariancePortfolioOptimizer import UnconstrainedMeanVariancePortfolioOptimizer
+
+def GetWindows(size, windows, periods, seed):
+    '''Rolling windows of the returns of three factors and of the noise of each asset'''
+    np.random.seed(seed)
+    factors = np.random.normal(0, 0.01, (periods + windows, 3))
+    loadings = np.random.normal(1, 0.5, (3, size))
+    returns = 0.0005 + factors.dot(loadings) / 3 + np.random.normal(0, 0.02, (periods + windows, size))
+    return np.stack([returns[i:i + periods] for i in range(windows)])
+
+def GetOptimizer(name):
+    return {
+        'MinimumVariance': lambda: MinimumVariancePortfolioOptimizer(0, 1, 0.0005, warm_start = True, precise = True),
+        'MaximumSharpeRatio': lambda: MaximumSharpeRatioPortfolioOptimizer(0, 1, warm_start = True),
+        'UnconstrainedMeanVariance': lambda: UnconstrainedMeanVariancePortfolioOptimizer(),
+        'LedoitWolf': lambda: UnconstrainedMeanVariancePortfolioOptimizer(LedoitWolfCovarianceEstimator()) }[name]()
+
+def OptimizeEachWindow(name, windows):
+    '''Weights of a new optimizer for each window, as before the batches'''
+    return np.array([GetOptimizer(name).Optimize(pd.DataFrame(window)) for window in windows])
+
+def GetVariances(windows, weights):
+    return np.array([w.dot(pd.DataFrame(window).cov().values).dot(w) for window, w in zip(windows, weights)])
+
+def GetCovarianceError():
+    '''Largest difference from the covariance of pandas, with a missing return in a window'''
+    windows = GetWindows(20, 10, 63, 0)
+    windows[3, 5, 2] = np.nan
+    covariances = get_batch_covariance(windows)
+    return max(np.abs(covariances[i] - pd.DataFrame(windows[i]).cov().values).max() for i in range(len(windows)))
+
+def GetBatchErrors(name):
+    '''Largest budget constraint violation of the batch, and largest relative difference from the weights of the
+    optimization of each window, or mean relative difference from their variance for optimizers with a solver,
+    whose warm starts stop within the precision goal of the previous weights'''
+    windows = GetWindows(20, 50, 63, 1)
+    weights = GetOptimizer(name).OptimizeBatch(windows)
+    expected = OptimizeEachWindow(name, windows)
+    if name in ['UnconstrainedMeanVariance', 'LedoitWolf']:
+        return 0, np.abs(weights - expected).max() / np.abs(expected).max()
+    return np.abs(weights.sum(axis = 1) - 1).max(), (GetVariances(windows, weights) / GetVariances(windows, expected) - 1).mean()
+
+def GetLabeledBatchError():
+    '''Largest difference between the weights of data frames of returns and of their array,
+    and whether the previous weights are labeled by the columns of the data frames'''
+    windows = GetWindows(20, 10, 63, 2)
+    frames = [pd.DataFrame(window, columns = [f'A{i}' for i in range(20)]) for window in windows]
+    optimizer = GetOptimizer('MinimumVariance')
+    weights = optimizer.OptimizeBatch(frames)
+    expected = GetOptimizer('MinimumVariance').OptimizeBatch(windows)
+    return np.abs(weights - expected).max(), list(optimizer.previous_weights.index) == list(frames[0].columns)
+
+def Benchmark(size, windows):
+    '''Time of the optimization of each window by a new optimizer and of the batch, in this process,
+    with more periods than assets'''
+    returns = GetWindows(size, windows, max(63, 2 * size), size)
+    results = []
+    for name in ['MinimumVariance', 'MaximumSharpeRatio', 'UnconstrainedMeanVariance', 'LedoitWolf']:
+        start = perf_counter()
+        expected = OptimizeEachWindow(name, returns)
+        each = perf_counter() - start
+        start = perf_counter()
+        weights = GetOptimizer(name).OptimizeBatch(returns)
+        batch = perf_counter() - start
+        results.append(f'{name:25s}: each window {each:8.3f}s, batch {batch:8.3f}s ({each / batch:5.2f}x), ' +
+                       f'largest weight difference {np.abs(weights - expected).max():8.1e}')
+    return results";
+
+        [Test]
+        public void BatchCovarianceMatchesPandas()
+        {
+            using (Py.GIL())
+            {
+                Assert.Less((double)GetModule().GetCovarianceError(), 1e-15);
+            }
+        }
+
+        [TestCase("MinimumVariance")]
+        [TestCase("MaximumSharpeRatio")]
+        [TestCase("UnconstrainedMeanVariance")]
+        [TestCase("LedoitWolf")]
+        public void BatchMatchesTheOptimizationOfEachWindow(string optimizer)
+        {
+            using (Py.GIL())
+            {
+                var errors = GetModule().GetBatchErrors(optimizer);
+
+                Assert.Less((double)errors[0], 1e-6);
+                Assert.Less((double)errors[1], 1e-3);
+            }
+        }
+
+        [Test]
+        public void BatchAcceptsDataFramesOfTheSameSecurities()
+        {
+            using (Py.GIL())
+            {
+                var error = GetModule().GetLabeledBatchError();
+
+                Assert.AreEqual(0, (double)error[0]);
+                Assert.IsTrue((bool)error[1]);
+            }
+        }
+
+        [TestCase(20, 250)]
+        [TestCase(100, 250)]
+        [Explicit("Performance test")]
+        public void BatchPerformance(int size, int windows)
+        {
+            using (Py.GIL())
+            {
+                foreach (var line in GetModule().Benchmark(size, windows))
+                {
+                    Log.Trace($"BatchOptimizationTests.BatchPerformance(): {size} assets, {windows} windows, {line}");
+                }
+            }
+        }
+
+        private static dynamic GetModule()
+        {
+            return PythonEngine.ModuleFromString(nameof(BatchOptimizationTests), Code);
+        }
+    }
+}
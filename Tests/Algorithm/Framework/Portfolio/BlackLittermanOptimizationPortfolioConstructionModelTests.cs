@@ -21,6 +21,7 @@ using QuantConnect.Algorithm.Framework.Portfolio;
 using QuantConnect.Data;
 using QuantConnect.Data.Market;
 using QuantConnect.Data.UniverseSelection;
+using QuantConnect.Logging;
 using QuantConnect.Securities;
 using System;
 using System.Linq;
@@ -272,6 +273,51 @@ namespace QuantConnect.Tests.Algorithm.Framework.Portfolio
             Assert.DoesNotThrow(() => algorithm.PortfolioConstruction.CreateTargets(algorithm, insights));
         }
 
+        [Test]
+        public void ViewsMatchTheInsightsOfEachAlphaModel()
+        {
+            using (Py.GIL())
+            {
+                Assert.AreEqual(0, (double)GetRebalanceModule().GetViewsError());
+            }
+        }
+
+        [Test]
+        public void MasterFormulaMatchesTheInverseOfTheViewsCovariance()
+        {
+            using (Py.GIL())
+            {
+                Assert.Less((double)GetRebalanceModule().GetMasterFormulaError(), 1e-10);
+            }
+        }
+
+        [Test]
+        public void PriorIsReusedUntilTheReturnsChange()
+        {
+            using (Py.GIL())
+            {
+                var prior = GetRebalanceModule().GetPriorCalculations();
+                var calculations = (int[])prior[0].AsManagedObject(typeof(int[]));
+
+                // The same insights, the same insights a day later, the insights of other assets
+                Assert.AreEqual(new[] { 1, 1, 2, 3 }, calculations);
+                Assert.IsTrue((bool)prior[1]);
+            }
+        }
+
+        [TestCase(200, 5)]
+        [Explicit("Performance test")]
+        public void RebalancePerformance(int size, int models)
+        {
+            using (Py.GIL())
+            {
+                foreach (var line in GetRebalanceModule().Benchmark(size, models))
+                {
+                    Log.Trace($"BlackLittermanOptimizationPortfolioConstructionModelTests.RebalancePerformance(): {size} assets, {models} alpha models, {line}");
+                }
+            }
+        }
+
         private Security GetSecurity(Symbol symbol, Resolution resolution)
         {
             var timezone = _algorithm.TimeZone;
@@ -412,6 +458,146 @@ class BLOPCM(BlackLittermanOptimizationPortfolioConstructionModel):
         pass";
         }
 
+        private static dynamic GetRebalanceModule()
+        {
+            return PythonEngine.ModuleFromString(nameof(GetRebalanceModule), @"import os, sys
+sys.path.append(os.getcwd())
+
+from clr import AddReference
+AddReference('QuantConnect.Common')
+from QuantConnect import *
+from QuantConnect.Algorithm.Framework.Alphas import Insight, InsightDirection, InsightType
+
+from Portfolio.BlackLittermanOptimizationPortfolioConstructionModel import BlackLittermanOptimizationPortfolioConstructionModel
+from Portfolio.UnconstrainedMeanVariancePortfolioOptimizer import UnconstrainedMeanVariancePortfolioOptimizer
+from datetime import datetime, timedelta
+from itertools import groupby
+from time import perf_counter
+import numpy as np
+import pandas as pd
+
+START = datetime(2020, 1, 1)
+
+def GetModel(size, models, periods, coverage):
+    '''Model with the returns of the periods of each asset, and the insights of the alpha models on a share of the assets'''
+    np.random.seed(size)
+    model = BlackLittermanOptimizationPortfolioConstructionModel(period = periods, optimizer = UnconstrainedMeanVariancePortfolioOptimizer())
+    symbols = [Symbol.Create(f'A{i}', SecurityType.Equity, Market.USA) for i in range(size)]
+    returns = np.random.normal(0.0005, 0.02, (periods, size))
+    for j, symbol in enumerate(symbols):
+        symbolData = model.BlackLittermanSymbolData(symbol, model.lookback, model.period)
+        for i in range(periods):
+            symbolData.Add(START + timedelta(i), float(returns[i, j]))
+        model.symbolDataBySymbol[symbol] = symbolData
+    return model, GetInsights(symbols, models, START + timedelta(periods), coverage)
+
+def GetInsights(symbols, models, time, coverage):
+    insights = []
+    for model in range(models):
+        for j in sorted(np.random.permutation(len(symbols))[:int(coverage * len(symbols))]):
+            magnitude = float(np.random.normal(0, 0.01))
+            direction = InsightDirection.Up if magnitude > 0 else InsightDirection.Down
+            insights.append(Insight(time, symbols[j], timedelta(1), InsightType.Price, direction, magnitude, None, f'Alpha {model}'))
+    return insights
+
+def GetViewsWithDictionaries(insights, symbols):
+    '''Views before the arrays: a dictionary of the insights of each alpha model'''
+    P = {}
+    Q = {}
+    for model, group in groupby(insights, lambda x: x.SourceModel):
+        group = list(group)
+        up_insights_sum = sum(np.abs(x.Magnitude) for x in group if x.Direction == InsightDirection.Up)
+        dn_insights_sum = sum(np.abs(x.Magnitude) for x in group if x.Direction == InsightDirection.Down)
+        q = up_insights_sum if up_insights_sum > dn_insights_sum else dn_insights_sum
+        if q == 0:
+            continue
+        Q[model] = q
+        P[model] = dict.fromkeys(symbols, 0)
+        for insight in group:
+            P[model][insight.Symbol] = insight.Direction * np.abs(insight.Magnitude) / q
+    return np.array([list(x.values()) for x in P.values()]), np.array([[x] for x in Q.values()])
+
+def ApplyMasterFormulaWithInverse(model, Pi, Sigma, P, Q):
+    '''Master formula before the Cholesky solves: the inverse of the covariance of the views'''
+    ts = model.tau * Sigma
+    omega = np.dot(np.dot(P, ts), P.T) * np.eye(Q.shape[0])
+    A = np.dot(np.dot(ts, P.T), np.linalg.inv(np.dot(np.dot(P, ts), P.T) + omega))
+    Pi = np.squeeze(np.asarray(np.expand_dims(Pi, axis=0).T + np.dot(A, (Q - np.expand_dims(np.dot(P, Pi.T), axis=1)))))
+    return Pi, (Sigma + ts - np.dot(np.dot(A, P), ts)) * model.delta
+
+def GetPrior(model, symbols):
+    '''Prior computed again from the windows of the symbol data'''
+    returns = pd.DataFrame({ symbol: pd.Series([x.Value for x in model.symbolDataBySymbol[symbol].window],
+                                               index = [x.EndTime for x in model.symbolDataBySymbol[symbol].window])
+                             for symbol in symbols })
+    return model.get_equilibrium_return(returns)
+
+def GetViewsError():
+    '''Largest difference between the views and those of the insights of each alpha model on half of the assets'''
+    model, insights = GetModel(50, 3, 100, 0.5)
+    P, Q = model.get_views(insights)
+    symbols = list(dict.fromkeys(x.Symbol for x in insights))
+    expectedP, expectedQ = GetViewsWithDictionaries(insights, symbols)
+    return max(np.abs(P - expectedP).max(), np.abs(Q - expectedQ).max())
+
+def GetMasterFormulaError():
+    '''Largest relative difference of the posterior mean and covariance from those of the inverse'''
+    model, insights = GetModel(50, 3, 100, 0.5)
+    P, Q = model.get_views(insights)
+    Pi, Sigma = GetPrior(model, list(dict.fromkeys(x.Symbol for x in insights)))
+    expected = ApplyMasterFormulaWithInverse(model, Pi, Sigma, P, Q)
+    actual = model.apply_blacklitterman_master_formula(Pi, Sigma, P, Q)
+    return max(np.abs(actual[0] - expected[0]).max() / np.abs(expected[0]).max(),
+               np.abs(actual[1].values - expected[1].values).max() / np.abs(expected[1].values).max())
+
+def GetPriorCalculations():
+    '''Number of calculations of the prior after each rebalance, and whether the targets of the same returns are the same'''
+    model, insights = GetModel(50, 3, 100, 0.5)
+    calculations = []
+    get_equilibrium_return = model.get_equilibrium_return
+    def count(returns):
+        calculations.append(returns.shape)
+        return get_equilibrium_return(returns)
+    model.get_equilibrium_return = count
+
+    symbol = insights[0].Symbol
+    counts = []
+    targets = []
+    for rebalance in range(4):
+        if rebalance == 2:
+            for insight in insights:
+                insight.GeneratedTimeUtc = START + timedelta(101)
+        if rebalance == 3:
+            insights = [x for x in insights if x.Symbol != symbol]
+        targets.append(list(model.DetermineTargetPercent(insights).values()))
+        counts.append(len(calculations))
+    return counts, targets[0] == targets[1]
+
+def Benchmark(size, models):
+    '''Best time of each step of a rebalance over a year of returns, with the insights of the alpha models on every asset'''
+    model, insights = GetModel(size, models, 252, 1)
+    symbols = list(dict.fromkeys(x.Symbol for x in insights))
+    results = []
+
+    def run(name, function, repeat = 5):
+        best = float('inf')
+        for _ in range(repeat):
+            start = perf_counter()
+            value = function()
+            best = min(best, perf_counter() - start)
+        results.append(f'{name:32s}: {best * 1000:9.3f} ms')
+        return value
+
+    run('Views, dictionaries', lambda: GetViewsWithDictionaries(insights, symbols))
+    P, Q = run('Views, arrays', lambda: model.get_views(insights))
+    Pi, Sigma = run('Prior, computed again', lambda: GetPrior(model, symbols))
+    run('Master formula, inverse', lambda: ApplyMasterFormulaWithInverse(model, Pi, Sigma, P, Q))
+    run('Master formula, Cholesky', lambda: model.apply_blacklitterman_master_formula(Pi, Sigma, P, Q))
+    run('Rebalance, new returns', lambda: model.DetermineTargetPercent(insights), 1)
+    run('Rebalance, same returns', lambda: model.DetermineTargetPercent(insights))
+    return results");
+        }
+
         private class NewSymbolPortfolioConstructionModel : BlackLittermanOptimizationPortfolioConstructionModel
         {
             private readonly Dictionary<Symbol, ReturnsSymbolData> _symbolDataDict = new Dictionary<Symbol, ReturnsSymbolData>();
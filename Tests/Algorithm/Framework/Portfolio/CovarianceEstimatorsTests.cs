@@ -0,0 +1,188 @@
+﻿/*
+ * QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+ * Lean Algorithmic Trading Engine v2.0. Copyright 2014 QuantConnect Corporation.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+*/
+
+using NUnit.Framework;
+using Python.Runtime;
+using QuantConnect.Logging;
+
+namespace QuantConnect.Tests.Algorithm.Framework.Portfolio
+{
+    [TestFixture]
+    public class CovarianceEstimatorsTests
+    {
+        private const string Code = @"
+import numpy as np
+import pandas as pd
+from time import perf_counter
+from CovarianceEstimators import *
+from MaximumSharpeRatioPortfolioOptimizer import MaximumSharpeRatioPortfolioOptimizer
+from MinimumVariancePortfolioOptimizer import MinimumVariancePortfolioOptimizer
+from UnconstrainedMeanVariancePortfolioOptimizer import UnconstrainedMeanVariancePortfolioOptimizer
+
+def GetReturns(size, periods, seed):
+    '''Returns of three factors and of the noise of each asset'''
+    np.random.seed(seed)
+    factors = np.random.normal(0, 0.01, (periods, 3))
+    loadings = np.random.normal(1, 0.5, (3, size))
+    return pd.DataFrame(0.0005 + factors.dot(loadings) / 3 + np.random.normal(0, 0.02, (periods, size)))
+
+def GetEstimator(name):
+    return {
+        'LedoitWolf': LedoitWolfCovarianceEstimator(),
+        'ExponentiallyWeighted': ExponentiallyWeightedCovarianceEstimator(10),
+        'Factor': FactorCovarianceEstimator(3) }[name]
+
+def GetLedoitWolfError():
+    from sklearn.covariance import ledoit_wolf
+    returns = GetReturns(100, 63, 0)
+    return np.abs(LedoitWolfCovarianceEstimator().Estimate(returns).values - ledoit_wolf(returns.values)[0]).max()
+
+def GetExponentiallyWeightedError():
+    returns = GetReturns(20, 63, 1)
+    expected = returns.ewm(halflife = 10).cov().iloc[-20:].values
+    return np.abs(ExponentiallyWeightedCovarianceEstimator(10).Estimate(returns).values - expected).max()
+
+def GetSolveError(name):
+    '''Relative error of solving the linear equations of the covariance, with more assets than periods'''
+    returns = GetReturns(200, 63, 2)
+    estimator = GetEstimator(name)
+    values = np.random.normal(0, 1, (200, 2))
+    expected = np.linalg.solve(estimator.Estimate(returns).values, values)
+    return np.abs(estimator.Solve(returns, values) - expected).max() / np.abs(expected).max()
+
+def GetWeights(optimizer, name):
+    '''Weights of an optimizer with an estimator, with more assets than periods'''
+    returns = GetReturns(200, 63, 3)
+    estimator = GetEstimator(name)
+    target = returns.mean().mean()
+    optimizer = {
+        'MinimumVariance': lambda: MinimumVariancePortfolioOptimizer(0, 1, target, covariance_estimator = estimator, precise = True),
+        'MaximumSharpeRatio': lambda: MaximumSharpeRatioPortfolioOptimizer(0, 1, covariance_estimator = estimator),
+        'UnconstrainedMeanVariance': lambda: UnconstrainedMeanVariancePortfolioOptimizer(estimator) }[optimizer]()
+    return list(optimizer.Optimize(returns))
+
+def GetEstimateCount(name):
+    '''Number of estimates of the covariance of a minimum variance optimization with active bounds'''
+    returns = GetReturns(200, 63, 4)
+    estimator = GetEstimator(name)
+    estimate, estimates = estimator.Estimate, []
+    estimator.Estimate = lambda historicalReturns: estimates.append(1) or estimate(historicalReturns)
+    optimizer = MinimumVariancePortfolioOptimizer(0, 1, returns.mean().mean(), covariance_estimator = estimator, precise = True)
+    optimizer.Optimize(returns)
+    closed_form = optimizer.get_closed_form_weights(lambda values: np.linalg.solve(estimate(returns).values, values), returns.mean().values)
+    return len(estimates), closed_form is None
+
+def Benchmark(size):
+    '''Time of the unconstrained and minimum variance weights of 63 periods of returns with each estimator'''
+    returns = GetReturns(size, 63, size)
+    target = returns.mean().mean()
+    results = []
+    for name in ['Sample', 'LedoitWolf', 'ExponentiallyWeighted', 'Factor']:
+        estimator = None if name == 'Sample' else GetEstimator(name)
+        for optimizer in [UnconstrainedMeanVariancePortfolioOptimizer(estimator),
+                          MinimumVariancePortfolioOptimizer(-10, 10, target, covariance_estimator = estimator, precise = True)]:
+            start = perf_counter()
+            try:
+                weights = optimizer.Optimize(returns)
+                outcome = f'sum of absolute weights {np.abs(weights).sum():10.3g}'
+            except np.linalg.LinAlgError as error:
+                outcome = f'{error}'
+            results.append(f'{type(optimizer).__name__:44s} {name:21s}: {perf_counter() - start:8.4f}s, {outcome}')
+    return results";
+
+        [Test]
+        public void LedoitWolfEstimateMatchesScikitLearn()
+        {
+            using (Py.GIL())
+            {
+                Assert.Less((double)GetModule().GetLedoitWolfError(), 1e-15);
+            }
+        }
+
+        [Test]
+        public void ExponentiallyWeightedEstimateMatchesPandas()
+        {
+            using (Py.GIL())
+            {
+                Assert.Less((double)GetModule().GetExponentiallyWeightedError(), 1e-15);
+            }
+        }
+
+        [TestCase("LedoitWolf")]
+        [TestCase("ExponentiallyWeighted")]
+        [TestCase("Factor")]
+        public void SolveMatchesTheEstimate(string estimator)
+        {
+            using (Py.GIL())
+            {
+                Assert.Less((double)GetModule().GetSolveError(estimator), 1e-9);
+            }
+        }
+
+        [TestCase("LedoitWolf")]
+        [TestCase("ExponentiallyWeighted")]
+        [TestCase("Factor")]
+        public void MinimumVarianceEstimatesTheCovarianceOnce(string estimator)
+        {
+            using (Py.GIL())
+            {
+                var result = GetModule().GetEstimateCount(estimator);
+
+                Assert.AreEqual(1, (int)result[0]);
+                Assert.IsTrue((bool)result[1]);
+            }
+        }
+
+        [TestCase("MinimumVariance", "LedoitWolf")]
+        [TestCase("MinimumVariance", "Factor")]
+        [TestCase("MaximumSharpeRatio", "LedoitWolf")]
+        [TestCase("MaximumSharpeRatio", "ExponentiallyWeighted")]
+        [TestCase("UnconstrainedMeanVariance", "LedoitWolf")]
+        [TestCase("UnconstrainedMeanVariance", "Factor")]
+        public void OptimizersAcceptCovarianceEstimators(string optimizer, string estimator)
+        {
+            using (Py.GIL())
+            {
+                var weights = (double[])GetModule().GetWeights(optimizer, estimator).AsManagedObject(typeof(double[]));
+
+                Assert.AreEqual(200, weights.Length);
+                foreach (var weight in weights)
+                {
+                    Assert.IsFalse(double.IsNaN(weight) || double.IsInfinity(weight));
+                }
+            }
+        }
+
+        [TestCase(100)]
+        [TestCase(500)]
+        [TestCase(2000)]
+        [Explicit("Performance test")]
+        public void EstimatorsPerformance(int size)
+        {
+            using (Py.GIL())
+            {
+                foreach (var line in GetModule().Benchmark(size))
+                {
+                    Log.Trace($"CovarianceEstimatorsTests.EstimatorsPerformance(): {size} assets, {line}");
+                }
+            }
+        }
+
+        private static dynamic GetModule()
+        {
+            return PythonEngine.ModuleFromString(nameof(CovarianceEstimatorsTests), Code);
+        }
+    }
+}
@@ -102,6 +102,149 @@ namespace QuantConnect.Tests.Algorithm.Framework.Portfolio
             }
         }
 
+        [Test]
+        public void ReturnsMatrixCovarianceMatchesThePandasCovariance()
+        {
+            var code = @"
+import numpy as np
+import pandas as pd
+from collections import deque
+from datetime import datetime, timedelta
+from ReturnsMatrix import ReturnsMatrix
+
+def GetCovarianceError():
+    np.random.seed(0)
+    period = 10
+    matrix = ReturnsMatrix(period)
+    returns = {}
+    for i in range(12):
+        matrix.AddSymbol(i)
+        returns[i] = deque(maxlen = period)
+
+    # 30 days of returns with missing returns, with the bars of the odd symbols ending later in the day,
+    # so that each symbol keeps its own last returns
+    for day in range(30):
+        for i in range(12):
+            time = datetime(2020, 1, 1) + timedelta(day, hours = 16 * (i % 2))
+            value = np.random.normal(0, 0.01)
+            if np.random.random() < 0.9 and matrix.Add(i, time, value):
+                returns[i].append((time, (1 + value) ** 252 - 1))
+        if day == 20:
+            matrix.RemoveSymbol(11)
+            del returns[11]
+
+    symbols = list(returns)
+    expected = pd.DataFrame({ str(i): pd.Series(dict(returns[i])) for i in symbols }).cov()
+    return float(np.nanmax(np.abs(matrix.Covariance(symbols).values - expected.values)))";
+
+            using (Py.GIL())
+            {
+                dynamic getCovarianceError = PythonEngine
+                    .ModuleFromString("GetCovarianceError", code)
+                    .GetAttr("GetCovarianceError");
+
+                double error = getCovarianceError();
+                Assert.Less(error, 1e-9);
+            }
+        }
+
+        [Test]
+        public void ReturnsMatrixKeepsTheLastReturnsOfEachSymbol()
+        {
+            var code = @"
+from datetime import datetime, timedelta
+from ReturnsMatrix import ReturnsMatrix
+
+def GetCounts():
+    # Three symbols whose bars end at different times of the day
+    matrix = ReturnsMatrix(63)
+    for i in range(3):
+        matrix.AddSymbol(i)
+    for day in range(100):
+        for i in range(3):
+            matrix.Add(i, datetime(2020, 1, 1) + timedelta(day, hours = 8 * i), 0.001 * (i + 1))
+    counts = [matrix.Count(i) for i in range(3)] + [int(matrix.Returns([i]).count().iloc[0]) for i in range(3)]
+
+    # A second return for the time of a return is not written
+    return counts, matrix.Add(0, datetime(2020, 1, 1) + timedelta(99), 0.5)";
+
+            using (Py.GIL())
+            {
+                dynamic getCounts = PythonEngine
+                    .ModuleFromString("GetCounts", code)
+                    .GetAttr("GetCounts");
+
+                var result = getCounts();
+                for (var i = 0; i < 6; i++)
+                {
+                    Assert.AreEqual(63, (int)result[0][i]);
+                }
+                Assert.IsFalse((bool)result[1]);
+            }
+        }
+
+        [Test]
+        public void SymbolDataKeepsTheFirstReturnOfARepeatedTime()
+        {
+            var code = @"
+from datetime import datetime
+from Portfolio.MeanVarianceOptimizationPortfolioConstructionModel import MeanVarianceOptimizationPortfolioConstructionModel
+
+def GetReturns():
+    # The insights of a symbol emitted at the same Algorithm.Time, whose magnitudes are added one after the other
+    symbolData = MeanVarianceOptimizationPortfolioConstructionModel.MeanVarianceSymbolData('SPY', 1, 63)
+    time = datetime(2020, 1, 2)
+    symbolData.Add(time, 0.01)
+    symbolData.Add(time, 0.5)
+    return symbolData.returnsMatrix.Count('SPY'), symbolData.Return.tolist(), symbolData.returnsMatrix.Latest('SPY')";
+
+            using (Py.GIL())
+            {
+                dynamic getReturns = PythonEngine
+                    .ModuleFromString("GetReturns", code)
+                    .GetAttr("GetReturns");
+
+                var result = getReturns();
+                var expected = Math.Pow(1.01, 252) - 1;
+                Assert.AreEqual(1, (int)result[0]);
+                Assert.AreEqual(1, (int)result[1].__len__());
+                Assert.AreEqual(expected, (double)result[1][0], 1e-9);
+                Assert.AreEqual(expected, (double)result[2], 1e-9);
+            }
+        }
+
+        [Test]
+        public void CovarianceIsOnlyGivenToOptimizersThatTakeIt()
+        {
+            var code = @"
+from Portfolio.MeanVarianceOptimizationPortfolioConstructionModel import MeanVarianceOptimizationPortfolioConstructionModel
+from Portfolio.MinimumVariancePortfolioOptimizer import MinimumVariancePortfolioOptimizer
+
+class ReturnsOnlyOptimizer:
+    def Optimize(self, historicalReturns):
+        return [1 / historicalReturns.shape[1]] * historicalReturns.shape[1]
+
+class KeywordsOptimizer:
+    def Optimize(self, historicalReturns, **kwargs):
+        return [1 / historicalReturns.shape[1]] * historicalReturns.shape[1]
+
+def AcceptsCovariance():
+    optimizers = [ReturnsOnlyOptimizer(), KeywordsOptimizer(), MinimumVariancePortfolioOptimizer()]
+    return [MeanVarianceOptimizationPortfolioConstructionModel.AcceptsCovariance(x) for x in optimizers]";
+
+            using (Py.GIL())
+            {
+                dynamic acceptsCovariance = PythonEngine
+                    .ModuleFromString("AcceptsCovariance", code)
+                    .GetAttr("AcceptsCovariance");
+
+                var result = acceptsCovariance();
+                Assert.IsFalse((bool)result[0]);
+                Assert.IsTrue((bool)result[1]);
+                Assert.IsTrue((bool)result[2]);
+            }
+        }
+
         protected void SetPortfolioConstruction(Language language, PortfolioBias bias)
         {
             var model = GetPortfolioConstructionModel(language, Resolution.Daily, bias);
@@ -0,0 +1,239 @@
+﻿/*
+ * QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+ * Lean Algorithmic Trading Engine v2.0. Copyright 2014 QuantConnect Corporation.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+*/
+
+using NUnit.Framework;
+using Python.Runtime;
+using QuantConnect.Logging;
+
+namespace QuantConnect.Tests.Algorithm.Framework.Portfolio
+{
+    [TestFixture]
+    public class MinimumVariancePortfolioOptimizerTests
+    {
+        private const string Code = @"
+import numpy as np
+import pandas as pd
+import warnings
+from time import perf_counter
+from scipy.optimize import minimize
+from MinimumVariancePortfolioOptimizer import MinimumVariancePortfolioOptimizer
+
+def GetReturns(size, seed, periods = None):
+    '''Returns of three factors and of the noise of each asset, with more periods than assets by default'''
+    np.random.seed(seed)
+    periods = periods or max(63, 2 * size)
+    factors = np.random.normal(0, 0.01, (periods, 3))
+    loadings = np.random.normal(1, 0.5, (3, size))
+    return pd.DataFrame(0.0005 + factors.dot(loadings) / 3 + np.random.normal(0, 0.02, (periods, size)))
+
+def GetViolation(returns, weights, minimum, maximum, target):
+    '''Largest violation of the budget, target and bounds constraints'''
+    return max(abs(weights.sum() - 1), abs(returns.mean().values.dot(weights) - target),
+               max(minimum - weights.min(), weights.max() - maximum, 0))
+
+def GetVariance(returns, weights):
+    return weights.dot(returns.cov().values).dot(weights)
+
+def OptimizeWithoutGradients(returns, minimum, maximum, target):
+    '''Optimization before the gradients, closed form solution and warm starts'''
+    covariance, expected = returns.cov(), returns.mean()
+    size = returns.columns.size
+    x0 = np.array(size * [1. / size])
+    constraints = [
+        {'type': 'eq', 'fun': lambda weights: np.sum(weights) - 1},
+        {'type': 'eq', 'fun': lambda weights: np.dot(np.matrix(expected), np.matrix(weights).T).item() - target}]
+    opt = minimize(lambda weights: np.dot(weights.T, np.dot(covariance, weights)), x0,
+                   bounds = [(minimum, maximum)] * size, constraints = constraints, method = 'SLSQP', options = {'ftol': 1e-04})
+    return opt['x'] if opt['success'] else x0
+
+def OptimizePrecisely(returns, minimum, maximum, target):
+    '''Optimization with a precision goal close to the machine precision'''
+    covariance, expected = returns.cov().values, returns.mean().values
+    size = returns.columns.size
+    x0 = np.array(size * [1. / size])
+    scale = x0.dot(covariance).dot(x0)
+    constraints = [
+        {'type': 'eq', 'fun': lambda weights: np.sum(weights) - 1, 'jac': lambda weights: np.ones(size)},
+        {'type': 'eq', 'fun': lambda weights: expected.dot(weights) - target, 'jac': lambda weights: expected}]
+    opt = minimize(lambda weights: weights.dot(covariance).dot(weights) / scale, x0,
+                   jac = lambda weights: 2 * covariance.dot(weights) / scale, bounds = [(minimum, maximum)] * size,
+                   constraints = constraints, method = 'SLSQP', options = {'ftol': 1e-12, 'maxiter': 1000})
+    return opt['x']
+
+def GetClosedFormResiduals():
+    '''Violation of the constraints and of the stationarity of the Lagrangian with inactive bounds'''
+    returns = GetReturns(50, 0)
+    target = returns.mean().mean()
+    weights = MinimumVariancePortfolioOptimizer(-10, 10, target, precise = True).Optimize(returns)
+    constraints = np.vstack([np.ones(50), returns.mean().values])
+    gradient = 2 * returns.cov().values.dot(weights)
+    multipliers = np.linalg.lstsq(constraints.T, gradient, rcond = None)[0]
+    return GetViolation(returns, weights, -10, 10, target), np.abs(gradient - constraints.T.dot(multipliers)).max()
+
+def GetBoundedSolution(solver, size, periods):
+    '''Violation of the constraints and excess variance over a precise solution with active bounds'''
+    returns = GetReturns(size, 1, periods)
+    target = returns.mean().mean()
+    weights = MinimumVariancePortfolioOptimizer(0, 1, target, solver, precise = True).Optimize(returns)
+    expected = OptimizePrecisely(returns, 0, 1, target)
+    return GetViolation(returns, weights, 0, 1, target), GetVariance(returns, weights) / GetVariance(returns, expected) - 1
+
+def GetDefaultDifference():
+    '''Largest difference between the weights of the default optimization and of the optimization before the gradients,
+    closed form solution and warm starts, with active and with inactive bounds'''
+    returns = GetReturns(20, 4)
+    target = returns.mean().mean()
+    return max(np.abs(MinimumVariancePortfolioOptimizer(minimum, maximum, target).Optimize(returns) -
+                      OptimizeWithoutGradients(returns, minimum, maximum, target)).max() for minimum, maximum in [(0, 1), (-10, 10)])
+
+def GetUnreachableTarget(solver):
+    '''Number of warnings and whether the weights are equal weights for a target above the largest expected return'''
+    returns = GetReturns(200, 3, 252)
+    with warnings.catch_warnings(record = True) as caught:
+        warnings.simplefilter('always')
+        weights = MinimumVariancePortfolioOptimizer(0, 1, 2 * returns.mean().max(), solver).Optimize(returns)
+    return len(caught), bool(np.allclose(weights, 1. / 200))
+
+def GetWarmStart():
+    '''Initial weights of the next optimization, with the same assets and with a new asset'''
+    returns = GetReturns(20, 2)
+    optimizer = MinimumVariancePortfolioOptimizer(0, 1, returns.mean().mean(), warm_start = True)
+    weights = optimizer.Optimize(returns)
+    x0 = np.full(21, 1. / 21)
+    same = optimizer.get_initial_weights(returns.columns, x0[:20])
+    added = optimizer.get_initial_weights(pd.Index(list(range(21))), x0)
+    return np.abs(same - weights).max(), np.abs(added[:20] - weights).max(), added[20]
+
+def Benchmark(size):
+    '''Time, excess variance over the best solution and constraints violation of each optimization'''
+    returns = GetReturns(size, size)
+    # The next rebalance: the window moves by a period
+    following = pd.concat([returns.iloc[1:], GetReturns(size, size + 1).iloc[:1]], ignore_index = True)
+    target = returns.mean().mean()
+    results = []
+
+    def run(name, minimum, maximum, optimize, data = returns):
+        start = perf_counter()
+        weights = optimize(data)
+        elapsed = perf_counter() - start
+        results.append([name, (id(data), minimum, maximum), elapsed, GetVariance(data, weights),
+                        GetViolation(data, weights, minimum, maximum, target)])
+
+    run('No gradients', 0, 1, lambda data: OptimizeWithoutGradients(data, 0, 1, target))
+    run('No gradients, next window', 0, 1, lambda data: OptimizeWithoutGradients(data, 0, 1, target), following)
+    optimizer = MinimumVariancePortfolioOptimizer(0, 1, target, warm_start = True, precise = True)
+    run('SLSQP', 0, 1, optimizer.Optimize)
+    run('SLSQP, warm start', 0, 1, optimizer.Optimize, following)
+    try:
+        optimizer = MinimumVariancePortfolioOptimizer(0, 1, target, 'cvxopt')
+        run('cvxopt', 0, 1, optimizer.Optimize)
+        run('cvxopt, next window', 0, 1, optimizer.Optimize, following)
+    except ImportError:
+        pass
+    run('No gradients', -10, 10, lambda data: OptimizeWithoutGradients(data, -10, 10, target))
+    run('Closed form', -10, 10, MinimumVariancePortfolioOptimizer(-10, 10, target, precise = True).Optimize)
+
+    best = {}
+    for name, key, elapsed, variance, violation in results:
+        best[key] = min(best.get(key, variance), variance)
+    return [f'{name:28s} bounds [{key[1]}, {key[2]}]: {elapsed:9.4f}s, ' +
+            f'excess variance {variance / best[key] - 1:9.2e}, constraints violation {violation:8.1e}'
+            for name, key, elapsed, variance, violation in results]";
+
+        [Test]
+        public void ClosedFormWeightsMinimizeTheVarianceWhenBoundsAreInactive()
+        {
+            using (Py.GIL())
+            {
+                var residuals = GetModule().GetClosedFormResiduals();
+
+                Assert.Less((double)residuals[0], 1e-9);
+                Assert.Less((double)residuals[1], 1e-9);
+            }
+        }
+
+        // The precision goal of SLSQP is relative to the variance of equal weights, which is further from the minimum with more assets
+        [TestCase("SLSQP", 50, 100, 1e-3)]
+        [TestCase("cvxopt", 50, 100, 1e-3)]
+        [TestCase("SLSQP", 200, 252, 2e-3)]
+        [TestCase("cvxopt", 200, 252, 2e-3)]
+        public void WeightsMinimizeTheVarianceWhenBoundsAreActive(string solver, int size, int periods, double excessVariance)
+        {
+            using (Py.GIL())
+            {
+                var solution = GetModule().GetBoundedSolution(solver, size, periods);
+
+                Assert.Less((double)solution[0], 1e-5);
+                Assert.Less((double)solution[1], excessVariance);
+            }
+        }
+
+        [TestCase("SLSQP")]
+        [TestCase("cvxopt")]
+        public void FailedOptimizationWarnsAndReturnsEqualWeights(string solver)
+        {
+            using (Py.GIL())
+            {
+                var result = GetModule().GetUnreachableTarget(solver);
+
+                Assert.AreEqual(1, (int)result[0]);
+                Assert.IsTrue((bool)result[1]);
+            }
+        }
+
+        [Test]
+        public void DefaultOptimizationIsTheOptimizationWithoutGradients()
+        {
+            using (Py.GIL())
+            {
+                Assert.AreEqual(0, (double)GetModule().GetDefaultDifference());
+            }
+        }
+
+        [Test]
+        public void SolverStartsFromThePreviousWeights()
+        {
+            using (Py.GIL())
+            {
+                var warmStart = GetModule().GetWarmStart();
+
+                Assert.AreEqual(0, (double)warmStart[0], 1e-15);
+                Assert.AreEqual(0, (double)warmStart[1], 1e-15);
+                Assert.AreEqual(0, (double)warmStart[2]);
+            }
+        }
+
+        [TestCase(10)]
+        [TestCase(100)]
+        [TestCase(500)]
+        [TestCase(1000)]
+        [Explicit("Performance test")]
+        public void OptimizationPerformance(int size)
+        {
+            using (Py.GIL())
+            {
+                foreach (var line in GetModule().Benchmark(size))
+                {
+                    Log.Trace($"MinimumVariancePortfolioOptimizerTests.OptimizationPerformance(): {size} assets, {line}");
+                }
+            }
+        }
+
+        private static dynamic GetModule()
+        {
+            return PythonEngine.ModuleFromString(nameof(MinimumVariancePortfolioOptimizerTests), Code);
+        }
+    }
+}
@@ -0,0 +1,190 @@
+﻿/*
+ * QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+ * Lean Algorithmic Trading Engine v2.0. Copyright 2014 QuantConnect Corporation.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+*/
+
+using Deedle;
+using NUnit.Framework;
+using QuantConnect.Logging;
+using QuantConnect.Report;
+using System;
+using System.Collections.Generic;
+using System.Diagnostics;
+using System.Linq;
+
+namespace QuantConnect.Tests.Report
+{
+    [TestFixture]
+    public class RollingTests
+    {
+        [Test]
+        public void RollingMomentsMatchTheMomentsOfEachWindow()
+        {
+            var random = new Random(0);
+            var x = Enumerable.Range(0, 500).Select(_ => random.NextDouble() / 50 - 0.01).ToList();
+            var y = x.Select(value => 0.5 * value + random.NextDouble() / 100).ToList();
+            var windowSize = 30;
+            var moments = new RollingMoments();
+
+            for (var i = 0; i < x.Count; i++)
+            {
+                moments.Add(x[i], y[i]);
+                if (i >= windowSize)
+                {
+                    moments.Remove(x[i - windowSize], y[i - windowSize]);
+                }
+                if (i < windowSize - 1)
+                {
+                    continue;
+                }
+
+                var windowX = x.Skip(i - windowSize + 1).Take(windowSize).ToList();
+                var windowY = y.Skip(i - windowSize + 1).Take(windowSize).ToList();
+                var meanX = windowX.Average();
+                var meanY = windowY.Average();
+                var varianceY = windowY.Sum(value => (value - meanY) * (value - meanY)) / (windowSize - 1);
+                var covariance = windowX.Zip(windowY, (a, b) => (a - meanX) * (b - meanY)).Sum() / (windowSize - 1);
+
+                Assert.AreEqual(windowSize, moments.Count);
+                Assert.AreEqual(meanX, moments.MeanX, 1e-15);
+                Assert.AreEqual(meanY, moments.MeanY, 1e-15);
+                Assert.AreEqual(varianceY, moments.VarianceY, 1e-15);
+                Assert.AreEqual(covariance, moments.Covariance, 1e-15);
+                Assert.AreEqual(covariance / varianceY, moments.Beta, 1e-9);
+            }
+        }
+
+        [Test]
+        public void RollingMomentsAreNaNWhileTheWindowHoldsNonFiniteValues()
+        {
+            var moments = new RollingMoments();
+            moments.Add(1, 2);
+            moments.Add(double.PositiveInfinity, 3);
+            moments.Add(3, 4);
+            moments.Add(5, 7);
+
+            Assert.AreEqual(4, moments.Count);
+            Assert.IsNaN(moments.MeanX);
+            Assert.IsNaN(moments.Covariance);
+
+            moments.Remove(1, 2);
+            moments.Remove(double.PositiveInfinity, 3);
+
+            Assert.AreEqual(2, moments.Count);
+            Assert.AreEqual(4, moments.MeanX, 1e-15);
+            Assert.AreEqual(2, moments.VarianceX, 1e-15);
+            Assert.AreEqual(2.0 / 3, moments.Beta, 1e-15);
+        }
+
+        [Test]
+        public void RollingBetaIsTheCovarianceOverTheBenchmarkVarianceOfEachWindow()
+        {
+            var equity = CreateSeries(new DateTime(2015, 1, 1), TimeSpan.FromDays(1), 400, 1);
+            var benchmark = CreateSeries(new DateTime(2015, 1, 1), TimeSpan.FromDays(1), 400, 2);
+            var beta = Rolling.Beta(equity, benchmark, 22);
+
+            var returns = equity.PercentChange().Values.ToList();
+            var benchmarkReturns = benchmark.CumulativeReturns().Values.ToList();
+
+            Assert.AreEqual(returns.Count - 21, beta.KeyCount);
+            for (var i = 21; i < returns.Count; i++)
+            {
+                var windowX = returns.Skip(i - 21).Take(22).ToList();
+                var windowY = benchmarkReturns.Skip(i - 21).Take(22).ToList();
+                var meanX = windowX.Average();
+                var meanY = windowY.Average();
+                var expected = windowX.Zip(windowY, (a, b) => (a - meanX) * (b - meanY)).Sum() /
+                    windowY.Sum(value => (value - meanY) * (value - meanY));
+
+                Assert.AreEqual(expected, beta.GetAt(i - 21), 1e-9);
+            }
+        }
+
+        [Test]
+        public void RollingBetaMatchesTheReportAggregates()
+        {
+            // The values of ReportAggregatesTests.py for the same equity and benchmark
+            var times = Enumerable.Range(0, 8).Select(day => new DateTime(2020, 1, 1).AddDays(day)).ToList();
+            var equity = new Series<DateTime, double>(times, new[] { 100, 101, 99, 102, 104, 103, 106, 105.0 });
+            var benchmark = new Series<DateTime, double>(times, new[] { 50, 50.5, 50, 51, 52, 51.5, 52.5, 53 });
+            var beta = Rolling.Beta(equity, benchmark, 4);
+
+            var expected = new[] { 0.9011070854984633, 0.7323529702679368, 0.2569277762024754, 0.10062637508679076 };
+            Assert.AreEqual(times.Skip(4).ToList(), beta.Keys.ToList());
+            for (var i = 0; i < expected.Length; i++)
+            {
+                Assert.AreEqual(expected[i], beta.GetAt(i), 1e-12);
+            }
+        }
+
+        [Test]
+        public void RollingSharpeIsTheSharpeRatioOfEachWindow()
+        {
+            var equity = CreateSeries(new DateTime(2015, 1, 1), TimeSpan.FromHours(6), 2000, 3);
+            var sharpe = Rolling.Sharpe(equity, 6);
+
+            var dailyReturns = equity.ResampleEquivalence(date => date.Date, s => s.LastValue()).PercentChange();
+            var expected = equity.Keys
+                .Where(date => date.AddMonths(-6) >= equity.FirstKey())
+                .Select(date => Statistics.Statistics.SharpeRatio(dailyReturns.Between(date.AddMonths(-6), date).Values.ToList(), 0))
+                .ToList();
+
+            Assert.AreEqual(expected.Count, sharpe.KeyCount);
+            for (var i = 0; i < expected.Count; i++)
+            {
+                Assert.AreEqual(expected[i], sharpe.GetAt(i), 1e-9);
+            }
+        }
+
+        [TestCase(10 * 365, 1, TestName = "10 years of daily equity")]
+        [TestCase(2 * 365 * 390, 390, TestName = "2 years of minute equity")]
+        [Explicit("Performance test")]
+        public void RollingStatisticsPerformance(int points, int pointsPerDay)
+        {
+            var step = TimeSpan.FromDays(1.0 / pointsPerDay);
+            var equity = CreateSeries(new DateTime(2010, 1, 1), step, points, 4);
+            var benchmark = CreateSeries(new DateTime(2010, 1, 1), step, points, 5);
+
+            var stopwatch = Stopwatch.StartNew();
+            var sixMonthsBeta = Rolling.Beta(equity, benchmark, 22 * 6);
+            var twelveMonthsBeta = Rolling.Beta(equity, benchmark, 252);
+            var betaTime = stopwatch.Elapsed;
+
+            stopwatch.Restart();
+            var sharpe = Rolling.Sharpe(equity, 6);
+            var sharpeTime = stopwatch.Elapsed;
+
+            Log.Trace($"RollingTests.RollingStatisticsPerformance(): {points} points, " +
+                $"rolling beta: {betaTime.TotalSeconds:F3}s, rolling sharpe: {sharpeTime.TotalSeconds:F3}s");
+            Assert.Greater(sixMonthsBeta.KeyCount, twelveMonthsBeta.KeyCount);
+            Assert.Greater(sharpe.KeyCount, 0);
+        }
+
+        private static Series<DateTime, double> CreateSeries(DateTime start, TimeSpan step, int points, int seed)
+        {
+            var random = new Random(seed);
+            var times = new List<DateTime>(points);
+            var values = new List<double>(points);
+            var value = 100000.0;
+
+            for (var i = 0; i < points; i++)
+            {
+                times.Add(start + TimeSpan.FromTicks(step.Ticks * i));
+                values.Add(value);
+                value *= 1 + (random.NextDouble() - 0.5) / 50;
+            }
+
+            return new Series<DateTime, double>(times, values);
+        }
+    }
+}